@@ -1,15 +1,16 @@
 import { useState, useEffect } from "react";
-import { useQuery } from "@tanstack/react-query";
+import { useQuery, useInfiniteQuery } from "@tanstack/react-query";
 import { LineChart } from "@/components/dashboard/line-chart";
 import { FilterBar } from "@/components/dashboard/filter-bar";
 import { DataTable, type Column } from "@/components/dashboard/data-table";
 import { EmptyState } from "@/components/dashboard/empty-state";
 import { ChartSkeleton, TableSkeleton } from "@/components/dashboard/loading-skeleton";
 import { Badge } from "@/components/ui/badge";
+import { Button } from "@/components/ui/button";
 import { Upload } from "lucide-react";
 import { useLocation } from "wouter";
 import { usePageTracking, useAnalytics } from "@/hooks/use-analytics";
-import type { SlaPerformanceData, PackageRecord, FilterOptions } from "@shared/schema";
+import type { LineChartData, SlaRecordsPage, PackageRecord, FilterOptions } from "@shared/schema";
 
 interface FilterValues {
   startDate?: string;
@@ -46,10 +47,38 @@ export default function SlaPerformance() {
   if (filters.seller) queryParams.set("seller", filters.seller);
   if (filters.costCenter) queryParams.set("costCenter", filters.costCenter);
 
-  const { data, isLoading, error, refetch } = useQuery<SlaPerformanceData>({
-    queryKey: ["/api/dashboard/sla-performance", queryParams.toString()]
+  // The trend renders on its own; records arrive a page at a time
+  const { data: slaTrend, isLoading, error, refetch } = useQuery<LineChartData[]>({
+    queryKey: ["/api/dashboard/sla-performance/trend", queryParams.toString()],
+    queryFn: async () => {
+      const res = await fetch(`/api/dashboard/sla-performance/trend?${queryParams}`, { credentials: "include" });
+      if (!res.ok) throw new Error(`${res.status}: ${res.statusText}`);
+      return res.json();
+    }
   });
 
+  const {
+    data: recordPages,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+    refetch: refetchRecords
+  } = useInfiniteQuery<SlaRecordsPage>({
+    queryKey: ["/api/dashboard/sla-performance/records", queryParams.toString()],
+    initialPageParam: undefined as string | undefined,
+    queryFn: async ({ pageParam }) => {
+      const params = new URLSearchParams(queryParams);
+      if (pageParam) params.set("cursor", pageParam as string);
+      const res = await fetch(`/api/dashboard/sla-performance/records?${params}`, { credentials: "include" });
+      if (!res.ok) throw new Error(`${res.status}: ${res.statusText}`);
+      return res.json();
+    },
+    getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined
+  });
+
+  const records = recordPages?.pages.flatMap((page) => page.records) ?? [];
+  const totalRecords = recordPages?.pages[0]?.totalRecords ?? 0;
+
   const columns: Column<PackageRecord>[] = [
     { key: "pedido", header: "Pedido", sortable: true },
     { key: "vendedor", header: "Vendedor", sortable: true },
@@ -103,7 +132,7 @@ export default function SlaPerformance() {
     );
   }
 
-  if (error || !data) {
+  if (error || !slaTrend) {
     return (
       <div className="p-8 space-y-6">
         <div className="space-y-1">
@@ -142,7 +171,10 @@ export default function SlaPerformance() {
           options={filterOptions}
           values={filters}
           onChange={setFilters}
-          onApply={() => refetch()}
+          onApply={() => {
+            refetch();
+            refetchRecords();
+          }}
           onReset={handleReset}
           testId="filter-bar-sla"
         />
@@ -150,7 +182,7 @@ export default function SlaPerformance() {
 
       <LineChart
         title="Evolução do SLA por Período"
-        data={data.slaTrend}
+        data={slaTrend}
         showTarget
         targetValue={95}
         targetLabel="Meta 95%"
@@ -161,13 +193,29 @@ export default function SlaPerformance() {
       <DataTable
         title="Tabela Analítica de SLA"
         columns={columns as Column<Record<string, unknown>>[]}
-        data={data.records as Record<string, unknown>[]}
+        data={records as Record<string, unknown>[]}
         searchable
         searchPlaceholder="Buscar por pedido, vendedor, zona..."
         pageSize={25}
         emptyMessage="Nenhum registro encontrado com os filtros selecionados"
         testId="table-sla-records"
       />
+
+      {hasNextPage && (
+        <div className="flex items-center justify-center gap-3">
+          <span className="text-sm text-muted-foreground">
+            {records.length.toLocaleString("pt-BR")} de {totalRecords.toLocaleString("pt-BR")} registros
+          </span>
+          <Button
+            variant="outline"
+            onClick={() => fetchNextPage()}
+            disabled={isFetchingNextPage}
+            data-testid="button-load-more-sla-records"
+          >
+            {isFetchingNextPage ? "Carregando..." : "Carregar mais"}
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
@@ -42,6 +42,17 @@ const REQUIRED_COLUMNS_GESTORA = [
   "Atraso"
 ];
 
+type UploadStatus = {
+  logmanager: UploadedFile | null;
+  gestora: UploadedFile | null;
+  processing: ProcessingStatusType;
+};
+
+function isStreamable(processing?: ProcessingStatusType): processing is ProcessingStatusType & { id: string } {
+  const status = processing?.status as string | undefined;
+  return !!processing?.id && (status === "processing" || status === "pending");
+}
+
 export default function UploadPage() {
   const { toast } = useToast();
   const analytics = useAnalytics();
@@ -49,13 +60,12 @@ export default function UploadPage() {
   const [logmanagerProgress, setLogmanagerProgress] = useState(0);
   const [gestoraProgress, setGestoraProgress] = useState(0);
 
-  const { data: uploadStatus } = useQuery<{
-    logmanager: UploadedFile | null;
-    gestora: UploadedFile | null;
-    processing: ProcessingStatusType;
-  }>({
+  const [streamFailed, setStreamFailed] = useState(false);
+
+  const { data: uploadStatus } = useQuery<UploadStatus>({
     queryKey: ["/api/upload/status"],
-    refetchInterval: 5000,
+    // While a job runs its progress is pushed over the event stream below
+    refetchInterval: (query) => (isStreamable(query.state.data?.processing) && !streamFailed ? false : 5000),
     // Use direct fetch for status to avoid proxy issues
     queryFn: async () => {
       const backendUrl = import.meta.env.VITE_API_BASE_URL || 'http://localhost:3000';
@@ -69,6 +79,31 @@ export default function UploadPage() {
     }
   });
 
+  const processing = uploadStatus?.processing;
+  const processingJobId = isStreamable(processing) ? processing.id : undefined;
+
+  useEffect(() => {
+    if (!processingJobId) return;
+    const backendUrl = import.meta.env.VITE_API_BASE_URL || 'http://localhost:3000';
+    const source = new EventSource(`${backendUrl}/process/events/${processingJobId}`, { withCredentials: true });
+    source.addEventListener("progress", (message) => {
+      const event = JSON.parse((message as MessageEvent).data);
+      queryClient.setQueryData<UploadStatus>(["/api/upload/status"], (current) =>
+        current && { ...current, processing: { ...current.processing, ...event } }
+      );
+      if (["completed", "failed", "cancelled"].includes(event.status)) {
+        source.close();
+        queryClient.invalidateQueries({ queryKey: ["/api/upload/status"] });
+      }
+    });
+    // The browser reconnects on its own; when it gives up, fall back to polling
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) setStreamFailed(true);
+    };
+    setStreamFailed(false);
+    return () => source.close();
+  }, [processingJobId]);
+
   const MAX_RETRIES = 3;
   const uploadMutation = useMutation({
     mutationFn: async ({
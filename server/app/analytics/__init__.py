@@ -1,2 +1,3 @@
 import pandas as pd
-from .analytics import AnalyticsEngine
\ No newline at end of file
+from .analytics import AnalyticsEngine
+from .cube import AggregateCube
\ No newline at end of file
@@ -1,12 +1,33 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
+from .cube import AggregateCube
+from ..config.settings import RANKING_TOP_N
 import pandas as pd
+import numpy as np
+
+# Ranking -> (dimension, metric, largest first). Largest-first rankings leave out groups where the metric is 0,
+# so "most delays" only lists groups that have delays
+RANKINGS = {
+    "sellers_most_delays": ("Vendedor", "delays", True),
+    "zones_most_delays": ("Zona", "delays", True),
+    "sellers_highest_volume": ("Vendedor", "volume", True),
+    "ceps_most_delays": ("CEP", "delays", True),
+    "cost_centers_most_delays": ("Centro de custo", "delays", True),
+}
+
+# Fields of every ranking entry, besides the dimension value and the ranked metric
+RANKING_FIELDS = ["volume", "delays", "sla_percentage"]
 
 class AnalyticsEngine:
     @staticmethod
-    def calculate_global_kpis(data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        df = pd.DataFrame(data)
+    def calculate_global_kpis(data: Union[pd.DataFrame, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Global KPIs of row-level data: the job DataFrame as is (a list of dicts still works)."""
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
         total = len(df)
-        on_time = len(df[df["sla_calculated"] == "Dentro do prazo"])
+        on_time = int((df["sla_calculated"] == "Dentro do prazo").sum())
+        return AnalyticsEngine.kpis_from_counts(total, on_time)
+
+    @staticmethod
+    def kpis_from_counts(total: int, on_time: int) -> Dict[str, Any]:
         sla_percentage = (on_time / total * 100) if total > 0 else 0
         return {
             "total_orders": total,
@@ -17,13 +38,23 @@ class AnalyticsEngine:
 
     @staticmethod
     def calculate_sla_by_group(data: List[Dict[str, Any]], group_by: str) -> List[Dict[str, Any]]:
-        df = pd.DataFrame(data)
-        grouped = df.groupby(group_by).agg(
-            total=('sla_calculated', 'count'),
-            on_time=('sla_calculated', lambda x: (x == "Dentro do prazo").sum())
-        ).reset_index()
-        grouped["sla_percentage"] = (grouped["on_time"] / grouped["total"] * 100).round(2)
-        return grouped.to_dict('records')
+        grouped = AnalyticsEngine.grouped_metrics(pd.DataFrame(data), group_by).round({"sla_percentage": 2})
+        return grouped[[group_by, "total", "on_time", "sla_percentage"]].to_dict('records')
+
+    @staticmethod
+    def grouped_metrics(df: pd.DataFrame, group_by: str) -> pd.DataFrame:
+        """Per-group metrics (see metrics_from_counts) of row-level data, in one vectorized groupby."""
+        counts = AggregateCube.measures(df).groupby(df[group_by], observed=True).sum().reset_index()
+        return AnalyticsEngine.metrics_from_counts(counts)
+
+    @staticmethod
+    def metrics_from_counts(counts: pd.DataFrame) -> pd.DataFrame:
+        """Add `outside_sla`, `average_delay` and `sla_percentage` to per-group cube measures (total, on_time, delays, delay_sum)."""
+        metrics = counts.copy()
+        metrics["outside_sla"] = metrics["total"] - metrics["on_time"]
+        metrics["average_delay"] = (metrics["delay_sum"] / metrics["total"]).fillna(0)
+        metrics["sla_percentage"] = (metrics["on_time"] / metrics["total"] * 100).fillna(0)
+        return metrics
 
     @staticmethod
     def calculate_delays(data: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -37,35 +68,66 @@ class AnalyticsEngine:
         }
 
     @staticmethod
-    def generate_rankings(data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        df = pd.DataFrame(data)
-        
-        # Sellers with most delays
-        seller_delays = df[df["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"])].groupby("Vendedor").size().reset_index(name="delays")
-        seller_volume = df.groupby("Vendedor").size().reset_index(name="volume")
-        seller_sla = AnalyticsEngine.calculate_sla_by_group(data, "Vendedor")
-        seller_rank = seller_delays.merge(seller_volume, on="Vendedor", how="left").merge(pd.DataFrame(seller_sla), left_on="Vendedor", right_on="Vendedor", how="left")
-        seller_rank["sla_percentage"] = seller_rank["sla_percentage"].fillna(0)
-        seller_rank["delays"] = seller_rank["delays"].fillna(0)
-        sellers_most_delays = seller_rank.nlargest(10, "delays")[["Vendedor", "volume", "delays", "sla_percentage"]].to_dict('records')
-        
-        # Zones with most delays
-        zone_delays = df[df["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"])].groupby("Zona").size().reset_index(name="delays")
-        zone_volume = df.groupby("Zona").size().reset_index(name="volume")
-        zone_sla = AnalyticsEngine.calculate_sla_by_group(data, "Zona")
-        zone_rank = zone_delays.merge(zone_volume, on="Zona", how="left").merge(pd.DataFrame(zone_sla), left_on="Zona", right_on="Zona", how="left")
-        zone_rank["sla_percentage"] = zone_rank["sla_percentage"].fillna(0)
-        zone_rank["delays"] = zone_rank["delays"].fillna(0)
-        zones_most_delays = zone_rank.nlargest(10, "delays")[["Zona", "volume", "delays", "sla_percentage"]].to_dict('records')
-        
-        # Sellers with highest volume
-        sellers_highest_volume = seller_volume.merge(seller_delays, on="Vendedor", how="left").merge(pd.DataFrame(seller_sla), left_on="Vendedor", right_on="Vendedor", how="left")
-        sellers_highest_volume["sla_percentage"] = sellers_highest_volume["sla_percentage"].fillna(0)
-        sellers_highest_volume["delays"] = sellers_highest_volume["delays"].fillna(0)
-        sellers_highest_volume = sellers_highest_volume.nlargest(10, "volume")[["Vendedor", "volume", "delays", "sla_percentage"]].to_dict('records')
-        
-        return {
-            "sellers_most_delays": sellers_most_delays,
-            "zones_most_delays": zones_most_delays,
-            "sellers_highest_volume": sellers_highest_volume
-        }
\ No newline at end of file
+    def generate_rankings(
+        data: Union[pd.DataFrame, List[Dict[str, Any]]],
+        top_n: Optional[int] = None,
+        rankings: Optional[Dict[str, Tuple[str, str, bool]]] = None,
+    ) -> Dict[str, Any]:
+        """Every ranking in `rankings` (default RANKINGS) from row-level data, measured once and grouped once per dimension."""
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        measures = AggregateCube.measures(df)
+        counts = {
+            dimension: measures.groupby(df[dimension], observed=True).sum().reset_index()
+            for dimension in AnalyticsEngine.ranking_dimensions(rankings)
+            if dimension in df.columns
+        }
+        return AnalyticsEngine.rankings_from_counts(counts, top_n, rankings)
+
+    @staticmethod
+    def ranking_dimensions(rankings: Optional[Dict[str, Tuple[str, str, bool]]] = None) -> List[str]:
+        return list(dict.fromkeys(dimension for dimension, _, _ in (rankings or RANKINGS).values()))
+
+    @staticmethod
+    def rankings_from_counts(
+        counts: Dict[str, pd.DataFrame],
+        top_n: Optional[int] = None,
+        rankings: Optional[Dict[str, Tuple[str, str, bool]]] = None,
+    ) -> Dict[str, Any]:
+        """Build the rankings from per-group measures by dimension (see grouped_metrics), e.g. straight from the aggregate cube.
+
+        Entries carry the dimension value, RANKING_FIELDS and the ranked metric; a dimension
+        missing from `counts` yields an empty ranking.
+        """
+        top_n = RANKING_TOP_N if top_n is None else top_n
+        metrics = {
+            dimension: AnalyticsEngine.metrics_from_counts(grouped).rename(columns={"total": "volume"}).round({"sla_percentage": 2})
+            for dimension, grouped in counts.items()
+        }
+        result: Dict[str, Any] = {}
+        for name, (dimension, metric, largest) in (rankings or RANKINGS).items():
+            if dimension not in metrics:
+                result[name] = []
+                continue
+            ranked = metrics[dimension]
+            if largest:
+                ranked = ranked[ranked[metric] != 0]
+            top = AnalyticsEngine.top_k(ranked[metric].to_numpy(), top_n, largest)
+            fields = [dimension, *dict.fromkeys([*RANKING_FIELDS, metric])]
+            result[name] = ranked.iloc[top][fields].to_dict('records')
+        return result
+
+    @staticmethod
+    def top_k(values: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+        """Positions of the k largest (or smallest) values, best first, via a partial sort; ties keep their order, like nlargest."""
+        keys = np.asarray(values, dtype=float)
+        if largest:
+            keys = -keys
+        if k <= 0:
+            return np.array([], dtype=np.intp)
+        if len(keys) > k:
+            # Only values up to the k-th best (and its ties) are sorted
+            kth = np.partition(keys, k - 1)[k - 1]
+            candidates = np.flatnonzero(keys <= kth)
+        else:
+            candidates = np.arange(len(keys))
+        return candidates[np.argsort(keys[candidates], kind="stable")][:k]
@@ -0,0 +1,137 @@
+from typing import List, Dict, Any, Optional, Callable
+import pandas as pd
+
+DELAY_CLASSES = ["Entregue com atraso", "Fora do prazo"]
+
+# Count measure -> SLA class it counts
+SLA_CLASS_MEASURES = {
+    "on_time": "Dentro do prazo",
+    "late_delivered": "Entregue com atraso",
+    "out_of_deadline": "Fora do prazo",
+    "not_delivered": "Não entregue",
+    "invalid": "Dados inválidos",
+}
+
+MEASURES = ["total", *SLA_CLASS_MEASURES, "delays", "delay_sum", "delay_sum_late"]
+
+
+class AggregateCube:
+    """Pre-aggregated SLA counts and delay sums, computed once per job.
+
+    Every grouping (a single dimension or a dimension x date pair) is a small
+    frame with the key columns followed by MEASURES. Null keys are kept so
+    consumers can reproduce the exact semantics of the row-level groupbys.
+    """
+
+    DIMENSIONS = ["Vendedor", "Zona", "CEP", "Centro de custo"]
+    DATES = ["data_pedido", "data_status_dia"]
+    CROSSED_DIMENSIONS = ["Vendedor", "Zona", "CEP"]
+    COLUMNS = DIMENSIONS + DATES + ["sla_calculated", "Atraso"]
+
+    @staticmethod
+    def grouping_name(keys: List[str]) -> str:
+        return "|".join(keys)
+
+    @classmethod
+    def groupings(cls) -> List[List[str]]:
+        single = [[col] for col in cls.DIMENSIONS + cls.DATES]
+        crossed = [[dim, date] for dim in cls.CROSSED_DIMENSIONS for date in cls.DATES]
+        return single + crossed
+
+    @staticmethod
+    def measures(df: pd.DataFrame) -> pd.DataFrame:
+        sla = df["sla_calculated"]
+        late = sla.isin(DELAY_CLASSES)
+        if "Atraso" in df.columns:
+            atraso = pd.to_numeric(df["Atraso"], errors="coerce").fillna(0)
+        else:
+            atraso = pd.Series(0.0, index=df.index)
+
+        measures = pd.DataFrame({"total": 1}, index=df.index)
+        for measure, sla_class in SLA_CLASS_MEASURES.items():
+            measures[measure] = (sla == sla_class).astype("int64")
+        measures["delays"] = late.astype("int64")
+        measures["delay_sum"] = atraso.astype(float)
+        measures["delay_sum_late"] = atraso.where(late, 0).astype(float)
+        return measures
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, names: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        measures = cls.measures(df)
+        cube: Dict[str, pd.DataFrame] = {}
+        for keys in cls.groupings():
+            name = cls.grouping_name(keys)
+            if names is not None and name not in names:
+                continue
+            if any(key not in df.columns for key in keys):
+                continue
+            cube[name] = measures.groupby([df[key] for key in keys], dropna=False, observed=True).sum().reset_index()
+        return cube
+
+    @classmethod
+    def totals(cls, df: pd.DataFrame) -> Dict[str, Any]:
+        measures = cls.measures(df)
+        totals = {measure: measures[measure].sum().item() for measure in MEASURES}
+        late = measures.loc[measures["delays"] == 1, "delay_sum_late"]
+        totals["delay_max_late"] = float(late.max()) if len(late) else 0.0
+        return totals
+
+    @classmethod
+    def apply_delta(cls, cube: Dict[str, pd.DataFrame], removed: pd.DataFrame, added: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Update a cube for rows removed from and added to its dataset, aggregating only those rows.
+
+        Every measure is a sum, so each grouping is the old one minus the removed
+        rows' groups plus the added rows' groups; groups left with no rows are dropped.
+        """
+        names = list(cube)
+        removed_cube = cls.build(removed, names) if len(removed) else {}
+        added_cube = cls.build(added, names) if len(added) else {}
+        updated: Dict[str, pd.DataFrame] = {}
+        for name, grouped in cube.items():
+            keys = name.split("|")
+            parts = [grouped]
+            if name in removed_cube:
+                negated = removed_cube[name].copy()
+                negated[MEASURES] = -negated[MEASURES]
+                parts.append(negated)
+            if name in added_cube:
+                parts.append(added_cube[name])
+            if len(parts) == 1:
+                updated[name] = grouped
+                continue
+            combined = pd.concat(parts, ignore_index=True).groupby(keys, dropna=False, observed=True)[MEASURES].sum().reset_index()
+            updated[name] = combined[combined["total"] != 0].reset_index(drop=True)
+        return updated
+
+    @classmethod
+    def update_totals(
+        cls,
+        totals: Dict[str, Any],
+        removed: pd.DataFrame,
+        added: pd.DataFrame,
+        reload: Callable[[], pd.DataFrame],
+    ) -> Dict[str, Any]:
+        """Incremental `totals`; `reload` returns the updated dataset and is only called when the maximum delay must be rescanned."""
+        removed_totals = cls.totals(removed) if len(removed) else None
+        added_totals = cls.totals(added) if len(added) else None
+        updated = dict(totals)
+        for measure in MEASURES:
+            updated[measure] = totals[measure] - (removed_totals[measure] if removed_totals else 0) + (added_totals[measure] if added_totals else 0)
+
+        if removed_totals and removed_totals["delays"] and removed_totals["delay_max_late"] >= totals["delay_max_late"]:
+            # The row holding the previous maximum may be gone: rescan the late rows
+            updated["delay_max_late"] = cls.totals(reload())["delay_max_late"]
+        elif added_totals and added_totals["delays"]:
+            base_max = totals["delay_max_late"] if totals["delays"] else added_totals["delay_max_late"]
+            updated["delay_max_late"] = max(base_max, added_totals["delay_max_late"])
+        return updated
+
+    @classmethod
+    def frame(cls, cube: Dict[str, pd.DataFrame], *keys: str, dropna: bool = True) -> pd.DataFrame:
+        """Return the grouping for `keys`; null keys are dropped like a default groupby."""
+        grouped = cube.get(cls.grouping_name(list(keys)))
+        if grouped is None:
+            return pd.DataFrame(columns=[*keys, *MEASURES])
+        if dropna:
+            grouped = grouped.dropna(subset=list(keys))
+        return grouped.reset_index(drop=True)
@@ -1,12 +1,55 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from ..models import ConsolidatedResponse, ConsolidatedRecord
-from ..repositories import DataRepository
-from typing import Optional
+from ..repositories import JobStore, JobIndex
+from ..repositories.job_index import DICTIONARY_COLUMNS
+from ..utils.export_writer import EXPORT_FORMATS, write_export
+from ..utils.column_json import json_values
+from ..config.settings import EXPORT_CHUNK_ROWS
+from typing import Dict, List, Optional
 import pandas as pd
+import asyncio
+import re
+import os
 
 router = APIRouter()
 
-data_repo = DataRepository()
+job_store = JobStore()
+job_index = JobIndex(job_store)
+
+# ConsolidatedRecord field -> job dataset column
+RECORD_COLUMNS = {
+    "pedido": "Pedido",
+    "data_pedido": "Data Pedido",
+    "status_dia": "Status do Dia",
+    "beep_dia": "Beep do Dia",
+    "cliente": "Cliente",
+    "conta": "Conta",
+    "zona": "Zona",
+    "responsabilidade": "Responsabilidade",
+    "bipagem": "Bipagem",
+    "criacao": "criacao",
+    "deveria_ser_entregue": "deveria_ser_entregue",
+    "pacote": "pacote",
+    "etiqueta": "etiqueta",
+    "pedido_marketplace": "pedido_marketplace",
+    "frete": "Frete",
+    "vendedor": "Vendedor",
+    "centro_custo": "Centro de custo",
+    "nome_comprador": "Nome Comprador",
+    "cep": "CEP",
+    "logradouro": "Logradouro",
+    "numero": "Número",
+    "bairro": "Bairro",
+    "cidade": "Cidade",
+    "complemento": "Complemento",
+    "data_status_dia": "data_status_dia",
+    "previsao_entrega": "PREVISÃO DE ENTREGA",
+    "entrega": "ENTREGA",
+    "sla": "SLA",
+    "prazo": "Prazo",
+    "atraso": "Atraso",
+}
 
 @router.get("/", response_model=ConsolidatedResponse)
 async def get_consolidated(
@@ -15,36 +58,82 @@ async def get_consolidated(
     page_size: int = Query(50, ge=1, le=1000),
     sort_by: Optional[str] = Query(None),
     filter_seller: Optional[str] = Query(None),
-    filter_zone: Optional[str] = Query(None)
+    filter_zone: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; takes precedence over page")
 ):
-    data_doc = await data_repo.get(f"{job_id}_data")
-    if not data_doc:
-        from fastapi import HTTPException
+    filters = parse_filters(filter_seller, filter_zone)
+    after = None
+    if cursor is not None:
+        if not cursor.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = int(cursor)
+
+    columns = await job_index.ensure(job_id, list(filters), sort_by)
+    if columns is None:
         raise HTTPException(status_code=503, detail="Data backend unavailable")
-    data = data_doc["data"]
-    
-    df = pd.DataFrame(data)
-    
-    # Filters
-    if filter_seller:
-        df = df[df["Vendedor"].str.contains(filter_seller, case=False, na=False)]
-    if filter_zone:
-        df = df[df["Zona"].str.contains(filter_zone, case=False, na=False)]
-    
-    # Sort
-    if sort_by and sort_by in df.columns:
-        df = df.sort_values(sort_by)
-    
-    # Pagination
-    start = (page - 1) * page_size
-    end = start + page_size
-    paginated = df.iloc[start:end]
-    
-    records = [ConsolidatedRecord(**row.to_dict()) for _, row in paginated.iterrows()]
-    
+    filters = {column: pattern for column, pattern in filters.items() if column in columns}
+    if sort_by not in columns:
+        sort_by = None
+
+    rows, total, next_cursor = await asyncio.to_thread(job_index.page, job_id, filters, sort_by, page_size, (page - 1) * page_size, after)
+
+    df = await job_store.read_rows(job_id, rows, [c for c in RECORD_COLUMNS.values() if c in columns])
+    if df is None:
+        raise HTTPException(status_code=503, detail="Data backend unavailable")
+
     return ConsolidatedResponse(
-        records=records,
-        total=len(df),
+        records=to_records(df),
+        total=total,
         page=page,
-        page_size=page_size
-    )
\ No newline at end of file
+        page_size=page_size,
+        next_cursor=str(next_cursor) if next_cursor is not None else None
+    )
+
+@router.get("/export")
+async def export_consolidated(
+    job_id: str = Query(...),
+    format: str = Query("csv", pattern="^(csv|xlsx|parquet)$"),
+    sort_by: Optional[str] = Query(None),
+    filter_seller: Optional[str] = Query(None),
+    filter_zone: Optional[str] = Query(None)
+):
+    """Stream the (filtered, sorted) job dataset as a file; rows are read and encoded chunk by chunk."""
+    filters = parse_filters(filter_seller, filter_zone)
+    columns = await job_index.ensure(job_id, list(filters), sort_by)
+    if columns is None:
+        raise HTTPException(status_code=503, detail="Data backend unavailable")
+    filters = {column: pattern for column, pattern in filters.items() if column in columns}
+    if sort_by not in columns:
+        sort_by = None
+
+    rows = await asyncio.to_thread(job_index.select, job_id, filters, sort_by)
+    # Jobs stored in Firestore before the columnar store have no file to stream from
+    frame = None if os.path.exists(job_store.data_path(job_id)) else await job_store.load(job_id)
+
+    media_type, extension = EXPORT_FORMATS[format]
+    # A sync iterator: Starlette runs it in a worker thread, off the event loop
+    content = write_export(format, job_store.iter_tables(job_id, rows, EXPORT_CHUNK_ROWS, frame), columns)
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="consolidated_{job_id}.{extension}"'},
+    )
+
+def parse_filters(filter_seller: Optional[str], filter_zone: Optional[str]) -> Dict[str, str]:
+    filters = {column: pattern for column, pattern in zip(DICTIONARY_COLUMNS, (filter_seller, filter_zone)) if pattern}
+    for pattern in filters.values():
+        try:
+            re.compile(pattern)
+        except re.error:
+            raise HTTPException(status_code=400, detail="Invalid filter pattern")
+    return filters
+
+def to_records(df: pd.DataFrame) -> List[ConsolidatedRecord]:
+    values: Dict[str, List[Optional[str]]] = {}
+    for field, column in RECORD_COLUMNS.items():
+        if column in df.columns:
+            values[field] = [None if v is None else str(v) for v in json_values(df[column])]
+        else:
+            values[field] = [None] * len(df)
+    fields = list(values)
+    return [ConsolidatedRecord(**dict(zip(fields, row))) for row in zip(*values.values())]
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from ..models import (
     OverviewData,
     SLAMetrics,
@@ -11,64 +12,135 @@ from ..models import (
     ZoneMetrics,
     CepMetrics,
     SlaPerformanceData,
+    SlaRecordsPage,
     PackageRecord,
+    LineChartData,
     HistoricalData,
     FilterOptions,
     RankingsData,
 )
-from ..repositories import DataRepository, ProcessRepository, SLARepository, RankingsRepository
-from ..analytics import AnalyticsEngine
-from typing import List, Dict, Any
+from ..repositories import JobStore, JobIndex, SLARepository, RankingsRepository, latest_job
+from ..analytics import AnalyticsEngine, AggregateCube
+from ..analytics.cube import MEASURES
+from ..config.settings import SLA_RECORDS_PAGE_SIZE, SLA_RECORDS_MAX_PAGE_SIZE
+from ..utils.column_json import column_records, json_values
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 import pandas as pd
+import numpy as np
+import asyncio
+import orjson
+import re
+import os
 
 router = APIRouter()
 
-data_repo = DataRepository()
-process_repo = ProcessRepository()
+job_store = JobStore()
+job_index = JobIndex(job_store)
 sla_repo = SLARepository()
 rankings_repo = RankingsRepository()
 
+# PackageRecord field -> job dataset column
+PACKAGE_COLUMNS = {
+    "pedido": "Pedido",
+    "pedidoMarketplace": "pedido_marketplace",
+    "dataPedido": "data_pedido",
+    "statusDoDia": "Status do Dia",
+    "beepDoDia": "Beep do Dia",
+    "cliente": "Cliente",
+    "conta": "Conta",
+    "zona": "Zona",
+    "responsabilidade": "Responsabilidade",
+    "bipagem": "Bipagem",
+    "criacao": "criacao",
+    "deveriaSerEntregue": "deveria_ser_entregue",
+    "pacote": "pacote",
+    "etiqueta": "etiqueta",
+    "frete": "Frete",
+    "vendedor": "Vendedor",
+    "centroDeCusto": "Centro de custo",
+    "statusDiaGestora": "status_dia",
+    "nomeComprador": "Nome Comprador",
+    "cep": "CEP",
+    "logradouro": "Logradouro",
+    "numero": "Número",
+    "bairro": "Bairro",
+    "cidade": "Cidade",
+    "complemento": "Complemento",
+    "dataStatusDia": "data_status_dia",
+    "previsaoEntrega": "PREVISÃO DE ENTREGA",
+    "entrega": "ENTREGA",
+}
+
+# Records per chunk of an NDJSON stream
+NDJSON_CHUNK_ROWS = 5000
+
+# Rankings shown on the overview, in OverviewData order
+OVERVIEW_RANKINGS = {
+    "topDelayedSellers": ("Vendedor", "delays", True),
+    "topCriticalZones": ("Zona", "delays", True),
+    "topProblematicCeps": ("CEP", "delays", True),
+}
+
 
 async def _get_latest_completed_job() -> str:
     """Return the job_id of the latest completed process or raise 404."""
-    processes = await process_repo.list_all()
-    if not processes:
-        raise HTTPException(status_code=404, detail="No processed data available")
-
-    latest_process = max(processes, key=lambda p: p.get("lastUpdated", ""))
-    if latest_process.get("status") != "completed":
+    pointer = await latest_job.current()
+    if not pointer:
         raise HTTPException(status_code=404, detail="No completed data available")
 
-    return latest_process["id"]
+    return pointer["job_id"]
 
 
-def _load_dataframe(data: List[Dict[str, Any]]) -> pd.DataFrame:
-    df = pd.DataFrame(data)
+async def _load_dataframe(job_id: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load only the requested columns of a job's dataset from the columnar store."""
+    df = await job_store.load(job_id, columns)
+    if df is None:
+        raise HTTPException(status_code=503, detail="Data backend unavailable")
     if df.empty:
         raise HTTPException(status_code=404, detail="No processed data available")
     return df
 
 
+async def _load_cube(job_id: str, groupings: List[List[str]]) -> Tuple[Dict[str, Any], Dict[str, pd.DataFrame]]:
+    """Load the job totals and the requested cube groupings precomputed during processing."""
+    names = [AggregateCube.grouping_name(keys) for keys in groupings]
+
+    manifest = await sla_repo.get(f"{job_id}_cube")
+    cube = await job_store.load_cube(manifest, names) if manifest else None
+    if cube is not None:
+        totals = manifest["totals"]
+    else:
+        # Jobs processed before the cube existed are aggregated from the stored rows
+        df = await _load_dataframe(job_id, AggregateCube.COLUMNS)
+        totals = AggregateCube.totals(df)
+        cube = AggregateCube.build(df, names)
+
+    if not totals.get("total"):
+        raise HTTPException(status_code=404, detail="No processed data available")
+    return totals, cube
+
+
+def _delayed_groups(cube: Dict[str, pd.DataFrame], key: str) -> pd.DataFrame:
+    """Groups with at least one delayed package, like grouping only the delayed rows."""
+    grouped = AggregateCube.frame(cube, key)
+    return grouped[grouped["delays"] > 0]
+
+
 @router.get("/overview", response_model=OverviewData)
 async def get_overview():
     job_id = await _get_latest_completed_job()
 
-    data_doc = await data_repo.get(f"{job_id}_data")
-    if not data_doc:
-        raise HTTPException(status_code=503, detail="Data backend unavailable")
-
-    data = data_doc["data"]
-    df = _load_dataframe(data)
+    totals, cube = await _load_cube(job_id, [["Vendedor"], ["Zona"], ["CEP"], ["data_pedido"]])
     
     # Calculate metrics
-    total_packages = len(df)
-    within_sla = len(df[df["sla_calculated"] == "Dentro do prazo"])
+    total_packages = int(totals["total"])
+    within_sla = int(totals["on_time"])
     outside_sla = total_packages - within_sla
     within_sla_percentage = (within_sla / total_packages * 100) if total_packages > 0 else 0
     outside_sla_percentage = 100 - within_sla_percentage
-    total_delays = len(df[df["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"])])
-    total_sellers = df["Vendedor"].nunique()
-    total_zones = df["Zona"].nunique()
+    total_delays = int(totals["delays"])
+    total_sellers = len(AggregateCube.frame(cube, "Vendedor"))
+    total_zones = len(AggregateCube.frame(cube, "Zona"))
     
     metrics = SLAMetrics(
         totalPackages=total_packages,
@@ -82,55 +154,25 @@ async def get_overview():
     )
     
     # SLA by period (assuming month)
-    df["period"] = pd.to_datetime(df["data_pedido"], errors='coerce').dt.to_period('M').astype(str)
-    sla_by_period = df.groupby("period").agg(
-        total=('sla_calculated', 'count'),
-        on_time=('sla_calculated', lambda x: (x == "Dentro do prazo").sum())
-    ).reset_index()
-    sla_by_period["value"] = (sla_by_period["on_time"] / sla_by_period["total"] * 100).round(1)
+    by_date = AggregateCube.frame(cube, "data_pedido", dropna=False)
+    by_date["period"] = pd.to_datetime(by_date["data_pedido"], errors='coerce').dt.to_period('M').astype(str)
+    sla_by_period = AnalyticsEngine.metrics_from_counts(by_date.groupby("period")[MEASURES].sum().reset_index())
+    sla_by_period["value"] = sla_by_period["sla_percentage"].round(1)
     sla_by_period_list = [
         BarChartData(label=row["period"], value=float(row["value"]))
         for _, row in sla_by_period.iterrows()
     ]
     
-    # Top delayed sellers
-    seller_delays = (
-        df[df["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"])]
-        .groupby("Vendedor")
-        .size()
-        .reset_index(name="delays")
-    )
-    top_delayed_sellers = seller_delays.nlargest(5, "delays")
-    top_delayed_sellers_list = [
-        RankingEntry(name=row["Vendedor"], value=int(row["delays"]))
-        for _, row in top_delayed_sellers.iterrows()
-    ]
-    
-    # Top critical zones
-    zone_delays = (
-        df[df["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"])]
-        .groupby("Zona")
-        .size()
-        .reset_index(name="delays")
+    # Top delayed sellers, critical zones and problematic CEPs
+    top = AnalyticsEngine.rankings_from_counts(
+        {dimension: AggregateCube.frame(cube, dimension) for dimension in AnalyticsEngine.ranking_dimensions(OVERVIEW_RANKINGS)},
+        top_n=5,
+        rankings=OVERVIEW_RANKINGS,
     )
-    top_critical_zones = zone_delays.nlargest(5, "delays")
-    top_critical_zones_list = [
-        RankingEntry(name=row["Zona"], value=int(row["delays"]))
-        for _, row in top_critical_zones.iterrows()
-    ]
-
-    # Top problematic CEPs
-    cep_delays = (
-        df[df["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"])]
-        .groupby("CEP")
-        .size()
-        .reset_index(name="delays")
+    top_delayed_sellers_list, top_critical_zones_list, top_problematic_ceps_list = (
+        [RankingEntry(name=str(entry[dimension]), value=int(entry["delays"])) for entry in top[name]]
+        for name, (dimension, _, _) in OVERVIEW_RANKINGS.items()
     )
-    top_problematic_ceps = cep_delays.nlargest(5, "delays")
-    top_problematic_ceps_list = [
-        RankingEntry(name=row["CEP"], value=int(row["delays"]))
-        for _, row in top_problematic_ceps.iterrows()
-    ]
     
     return OverviewData(
         metrics=metrics,
@@ -146,66 +188,27 @@ async def get_delays():
     """Aggregated delays view used by the frontend dashboard."""
     job_id = await _get_latest_completed_job()
 
-    data_doc = await data_repo.get(f"{job_id}_data")
-    if not data_doc:
-        raise HTTPException(status_code=503, detail="Data backend unavailable")
-
-    data = data_doc["data"]
-    df = _load_dataframe(data)
+    totals, cube = await _load_cube(job_id, [["data_status_dia"], ["Zona"], ["CEP"], ["Vendedor"]])
 
-    delayed = df[df["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"])]
-
-    total_delays = int(len(delayed))
-    average_delay = float(pd.to_numeric(delayed.get("Atraso"), errors="coerce").fillna(0).mean() or 0)
-    max_delay = int(pd.to_numeric(delayed.get("Atraso"), errors="coerce").fillna(0).max() or 0)
+    total_delays = int(totals["delays"])
+    average_delay = float(totals["delay_sum_late"] / total_delays) if total_delays else 0.0
+    max_delay = int(totals["delay_max_late"])
 
     # Delays by day
-    delays_by_day_df = (
-        delayed.groupby("data_status_dia")
-        .size()
-        .reset_index(name="delays")
-        .sort_values("data_status_dia")
-    )
-    delays_by_day = [
-        BarChartData(label=str(row["data_status_dia"]), value=int(row["delays"]))
-        for _, row in delays_by_day_df.iterrows()
-    ]
+    delays_by_day_df = _delayed_groups(cube, "data_status_dia")
+    delays_by_day = _bar_chart(delays_by_day_df["data_status_dia"], delays_by_day_df["delays"])
 
     # Delays by zone
-    delays_by_zone_df = (
-        delayed.groupby("Zona")
-        .size()
-        .reset_index(name="delays")
-        .sort_values("delays", ascending=False)
-    )
-    delays_by_zone = [
-        BarChartData(label=str(row["Zona"]), value=int(row["delays"]))
-        for _, row in delays_by_zone_df.iterrows()
-    ]
+    delays_by_zone_df = _delayed_groups(cube, "Zona").sort_values("delays", ascending=False)
+    delays_by_zone = _bar_chart(delays_by_zone_df["Zona"], delays_by_zone_df["delays"])
 
     # Delays by CEP
-    delays_by_cep_df = (
-        delayed.groupby("CEP")
-        .size()
-        .reset_index(name="delays")
-        .sort_values("delays", ascending=False)
-    )
-    delays_by_cep = [
-        BarChartData(label=str(row["CEP"]), value=int(row["delays"]))
-        for _, row in delays_by_cep_df.iterrows()
-    ]
+    delays_by_cep_df = _delayed_groups(cube, "CEP").sort_values("delays", ascending=False)
+    delays_by_cep = _bar_chart(delays_by_cep_df["CEP"], delays_by_cep_df["delays"])
 
     # Delays by seller
-    delays_by_seller_df = (
-        delayed.groupby("Vendedor")
-        .size()
-        .reset_index(name="delays")
-        .sort_values("delays", ascending=False)
-    )
-    delays_by_seller = [
-        BarChartData(label=str(row["Vendedor"]), value=int(row["delays"]))
-        for _, row in delays_by_seller_df.iterrows()
-    ]
+    delays_by_seller_df = _delayed_groups(cube, "Vendedor").sort_values("delays", ascending=False)
+    delays_by_seller = _bar_chart(delays_by_seller_df["Vendedor"], delays_by_seller_df["delays"])
 
     return DelaysData(
         metrics={
@@ -225,81 +228,31 @@ async def get_sellers():
     """Seller-level performance metrics and charts."""
     job_id = await _get_latest_completed_job()
 
-    data_doc = await data_repo.get(f"{job_id}_data")
-    if not data_doc:
-        raise HTTPException(status_code=503, detail="Data backend unavailable")
-
-    data = data_doc["data"]
-    df = _load_dataframe(data)
-
-    # Base aggregations by seller
-    grouped = df.groupby("Vendedor")
-
-    total_packages = grouped.size().rename("total_packages")
-    delays = grouped.apply(
-        lambda g: g["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"]).sum()
-    ).rename("total_delays")
-    within_sla = grouped.apply(lambda g: (g["sla_calculated"] == "Dentro do prazo").sum()).rename(
-        "within_sla"
-    )
-
-    outside_sla = (total_packages - within_sla).rename("outside_sla")
+    _, cube = await _load_cube(job_id, [["Vendedor"]])
+    return ORJSONResponse(_sellers_payload(cube))
 
-    avg_delay = grouped.apply(
-        lambda g: pd.to_numeric(g.get("Atraso"), errors="coerce").fillna(0).mean()
-    ).rename("average_delay")
-
-    sellers_df = (
-        pd.concat([total_packages, delays, within_sla, outside_sla, avg_delay], axis=1)
-        .reset_index()
-        .rename(columns={"Vendedor": "name"})
-    )
-
-    sellers_df["sla_percentage"] = (
-        sellers_df["within_sla"] / sellers_df["total_packages"] * 100
-    ).fillna(0)
 
+def _sellers_payload(cube: Dict[str, Any]) -> Dict[str, Any]:
+    """SellersData payload built column-wise from the cube (one model per seller is too slow for large jobs)."""
+    sellers_df = AnalyticsEngine.metrics_from_counts(AggregateCube.frame(cube, "Vendedor"))
     sellers_df = sellers_df.sort_values("sla_percentage", ascending=False)
-    sellers_df["rank"] = range(1, len(sellers_df) + 1)
-
-    seller_metrics: List[SellerMetrics] = []
-    for _, row in sellers_df.iterrows():
-        seller_metrics.append(
-            SellerMetrics(
-                id=str(row["name"]),
-                name=str(row["name"]),
-                totalPackages=int(row["total_packages"]),
-                totalDelays=int(row["total_delays"]),
-                withinSla=int(row["within_sla"]),
-                outsideSla=int(row["outside_sla"]),
-                slaPercentage=float(row["sla_percentage"]),
-                averageDelay=float(row["average_delay"] or 0),
-                rank=int(row["rank"]),
-            )
-        )
+
+    seller_metrics = column_records(SellerMetrics, {
+        "name": sellers_df["Vendedor"],
+        **_metric_columns(sellers_df, "Vendedor"),
+        "rank": np.arange(1, len(sellers_df) + 1),
+    }, len(sellers_df))
 
     # Charts
     top_for_charts = sellers_df.head(20)
+    top_names = top_for_charts["Vendedor"]
 
-    volume_chart = [
-        BarChartData(label=str(row["name"]), value=int(row["total_packages"]))
-        for _, row in top_for_charts.iterrows()
-    ]
-    delays_chart = [
-        BarChartData(label=str(row["name"]), value=int(row["total_delays"]))
-        for _, row in top_for_charts.iterrows()
-    ]
-    sla_chart = [
-        BarChartData(label=str(row["name"]), value=float(row["sla_percentage"]))
-        for _, row in top_for_charts.iterrows()
-    ]
-
-    return SellersData(
-        sellers=seller_metrics,
-        volumeChart=volume_chart,
-        delaysChart=delays_chart,
-        slaChart=sla_chart,
-    )
+    return {
+        "sellers": seller_metrics,
+        "volumeChart": _bar_chart(top_names, top_for_charts["total"]),
+        "delaysChart": _bar_chart(top_names, top_for_charts["delays"]),
+        "slaChart": _bar_chart(top_names, top_for_charts["sla_percentage"]),
+    }
 
 
 @router.get("/zones", response_model=ZonesData)
@@ -307,105 +260,47 @@ async def get_zones():
     """Zone and CEP level performance metrics."""
     job_id = await _get_latest_completed_job()
 
-    data_doc = await data_repo.get(f"{job_id}_data")
-    if not data_doc:
-        raise HTTPException(status_code=503, detail="Data backend unavailable")
+    _, cube = await _load_cube(job_id, [["Zona"], ["CEP"]])
+    return ORJSONResponse(_zones_payload(cube))
 
-    data = data_doc["data"]
-    df = _load_dataframe(data)
 
+def _zones_payload(cube: Dict[str, Any]) -> Dict[str, Any]:
+    """ZonesData payload built column-wise from the cube; there is one entry per CEP."""
     # Zone metrics
-    zone_group = df.groupby("Zona")
-
-    zone_total = zone_group.size().rename("total_packages")
-    zone_delays = zone_group.apply(
-        lambda g: g["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"]).sum()
-    ).rename("total_delays")
-    zone_within = zone_group.apply(
-        lambda g: (g["sla_calculated"] == "Dentro do prazo").sum()
-    ).rename("within_sla")
-    zone_outside = (zone_total - zone_within).rename("outside_sla")
-    zone_avg_delay = zone_group.apply(
-        lambda g: pd.to_numeric(g.get("Atraso"), errors="coerce").fillna(0).mean()
-    ).rename("average_delay")
-
-    zone_df = (
-        pd.concat([zone_total, zone_delays, zone_within, zone_outside, zone_avg_delay], axis=1)
-        .reset_index()
-        .rename(columns={"Zona": "zone"})
-    )
-    zone_df["sla_percentage"] = (
-        zone_df["within_sla"] / zone_df["total_packages"] * 100
-    ).fillna(0)
-
-    zones: List[ZoneMetrics] = []
-    for _, row in zone_df.iterrows():
-        zones.append(
-            ZoneMetrics(
-                id=str(row["zone"]),
-                zone=str(row["zone"]),
-                totalPackages=int(row["total_packages"]),
-                totalDelays=int(row["total_delays"]),
-                withinSla=int(row["within_sla"]),
-                outsideSla=int(row["outside_sla"]),
-                slaPercentage=float(row["sla_percentage"]),
-                averageDelay=float(row["average_delay"] or 0),
-            )
-        )
+    zone_df = AnalyticsEngine.metrics_from_counts(AggregateCube.frame(cube, "Zona"))
+    zones = column_records(ZoneMetrics, {"zone": zone_df["Zona"], **_metric_columns(zone_df, "Zona")}, len(zone_df))
 
     # CEP metrics
-    cep_group = df.groupby("CEP")
-
-    cep_total = cep_group.size().rename("total_packages")
-    cep_delays = cep_group.apply(
-        lambda g: g["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"]).sum()
-    ).rename("total_delays")
-    cep_within = cep_group.apply(
-        lambda g: (g["sla_calculated"] == "Dentro do prazo").sum()
-    ).rename("within_sla")
-    cep_outside = (cep_total - cep_within).rename("outside_sla")
-    cep_avg_delay = cep_group.apply(
-        lambda g: pd.to_numeric(g.get("Atraso"), errors="coerce").fillna(0).mean()
-    ).rename("average_delay")
-
-    cep_df = (
-        pd.concat([cep_total, cep_delays, cep_within, cep_outside, cep_avg_delay], axis=1)
-        .reset_index()
-        .rename(columns={"CEP": "cep"})
-    )
-    cep_df["sla_percentage"] = (cep_df["within_sla"] / cep_df["total_packages"] * 100).fillna(0)
-
-    ceps: List[CepMetrics] = []
-    for _, row in cep_df.iterrows():
-        ceps.append(
-            CepMetrics(
-                id=str(row["cep"]),
-                cep=str(row["cep"]),
-                totalPackages=int(row["total_packages"]),
-                totalDelays=int(row["total_delays"]),
-                withinSla=int(row["within_sla"]),
-                outsideSla=int(row["outside_sla"]),
-                slaPercentage=float(row["sla_percentage"]),
-                averageDelay=float(row["average_delay"] or 0),
-            )
-        )
+    cep_df = AnalyticsEngine.metrics_from_counts(AggregateCube.frame(cube, "CEP"))
+    ceps = column_records(CepMetrics, {"cep": cep_df["CEP"], **_metric_columns(cep_df, "CEP")}, len(cep_df))
 
     # Charts based on delays
-    zone_delays_chart = [
-        BarChartData(label=str(row["zone"]), value=int(row["total_delays"]))
-        for _, row in zone_df.sort_values("total_delays", ascending=False).iterrows()
-    ]
-    cep_delays_chart = [
-        BarChartData(label=str(row["cep"]), value=int(row["total_delays"]))
-        for _, row in cep_df.sort_values("total_delays", ascending=False).iterrows()
-    ]
+    zone_by_delays = zone_df.sort_values("delays", ascending=False)
+    cep_by_delays = cep_df.sort_values("delays", ascending=False)
+
+    return {
+        "zones": zones,
+        "ceps": ceps,
+        "zoneDelaysChart": _bar_chart(zone_by_delays["Zona"], zone_by_delays["delays"]),
+        "cepDelaysChart": _bar_chart(cep_by_delays["CEP"], cep_by_delays["delays"]),
+    }
+
+
+def _metric_columns(metrics: pd.DataFrame, key: str) -> Dict[str, Any]:
+    """Seller/zone/CEP metric fields from AnalyticsEngine.metrics_from_counts output."""
+    return {
+        "id": metrics[key],
+        "totalPackages": metrics["total"],
+        "totalDelays": metrics["delays"],
+        "withinSla": metrics["on_time"],
+        "outsideSla": metrics["outside_sla"],
+        "slaPercentage": metrics["sla_percentage"],
+        "averageDelay": metrics["average_delay"],
+    }
 
-    return ZonesData(
-        zones=zones,
-        ceps=ceps,
-        zoneDelaysChart=zone_delays_chart,
-        cepDelaysChart=cep_delays_chart,
-    )
+
+def _bar_chart(labels: pd.Series, values: pd.Series) -> List[Dict[str, Any]]:
+    return column_records(BarChartData, {"label": labels, "value": values}, len(labels))
 
 
 @router.get("/rankings", response_model=RankingsData)
@@ -455,93 +350,151 @@ async def get_sla_performance(
     zone: str | None = None,
     seller: str | None = None,
     costCenter: str | None = None,
+    limit: int = Query(SLA_RECORDS_PAGE_SIZE, ge=1, le=SLA_RECORDS_MAX_PAGE_SIZE),
+    cursor: str | None = None,
 ):
-    """Detailed SLA performance data with optional filters."""
+    """Detailed SLA performance data with optional filters; records come one page at a time (see nextCursor)."""
     job_id = await _get_latest_completed_job()
+    rows, df = await _sla_filter(job_id, startDate, endDate, zone, seller, costCenter)
+    page, next_cursor = _sla_page(rows, limit, cursor)
 
-    data_doc = await data_repo.get(f"{job_id}_data")
-    if not data_doc:
-        raise HTTPException(status_code=503, detail="Data backend unavailable")
+    return ORJSONResponse({
+        "slaTrend": _sla_trend(df.iloc[rows]),
+        "records": await _package_records(job_id, page),
+        "totalRecords": len(rows),
+        "nextCursor": next_cursor,
+    })
 
-    data = data_doc["data"]
-    df = _load_dataframe(data)
-
-    # Apply filters
-    if startDate:
-        df = df[df["data_pedido"] >= startDate]
-    if endDate:
-        df = df[df["data_pedido"] <= endDate]
-    if zone:
-        df = df[df["Zona"].str.contains(zone, case=False, na=False)]
-    if seller:
-        df = df[df["Vendedor"].str.contains(seller, case=False, na=False)]
-    if costCenter:
-        df = df[df.get("Centro de custo", "").astype(str).str.contains(costCenter, case=False, na=False)]
-
-    # Trend by date
-    trend_df = (
-        df.groupby("data_pedido")
-        .agg(
-            total=("sla_calculated", "count"),
-            on_time=("sla_calculated", lambda x: (x == "Dentro do prazo").sum()),
-        )
-        .reset_index()
-        .sort_values("data_pedido")
-    )
-    trend_df["value"] = (trend_df["on_time"] / trend_df["total"] * 100).round(2)
 
-    from ..models import LineChartData
+@router.get("/sla-performance/trend", response_model=List[LineChartData])
+async def get_sla_performance_trend(
+    startDate: str | None = None,
+    endDate: str | None = None,
+    zone: str | None = None,
+    seller: str | None = None,
+    costCenter: str | None = None,
+):
+    """SLA trend by order date alone, so charts do not wait for the records."""
+    job_id = await _get_latest_completed_job()
+    rows, df = await _sla_filter(job_id, startDate, endDate, zone, seller, costCenter)
+    return ORJSONResponse(_sla_trend(df.iloc[rows]))
 
-    sla_trend = [
-        LineChartData(date=str(row["data_pedido"]), value=float(row["value"]))
-        for _, row in trend_df.iterrows()
-    ]
 
-    # Records mapped to PackageRecord schema
-    records: List[PackageRecord] = []
-    for _, row in df.iterrows():
-        record = PackageRecord(
-            id=str(row.get("Pedido") or row.get("pedido_marketplace")),
-            dataPedido=row.get("data_pedido"),
-            pedido=str(row.get("Pedido") or ""),
-            statusDoDia=row.get("Status do Dia"),
-            beepDoDia=row.get("Beep do Dia"),
-            cliente=row.get("Cliente"),
-            conta=row.get("Conta"),
-            zona=row.get("Zona"),
-            responsabilidade=row.get("Responsabilidade"),
-            bipagem=row.get("Bipagem"),
-            criacao=row.get("criacao"),
-            deveriaSerEntregue=row.get("deveria_ser_entregue"),
-            pacote=row.get("pacote"),
-            etiqueta=row.get("etiqueta"),
-            pedidoMarketplace=str(row.get("pedido_marketplace") or ""),
-            frete=row.get("Frete"),
-            vendedor=row.get("Vendedor"),
-            centroDeCusto=row.get("Centro de custo"),
-            statusDiaGestora=row.get("status_dia"),
-            nomeComprador=row.get("Nome Comprador"),
-            cep=row.get("CEP"),
-            logradouro=row.get("Logradouro"),
-            numero=row.get("Número"),
-            bairro=row.get("Bairro"),
-            cidade=row.get("Cidade"),
-            complemento=row.get("Complemento"),
-            dataStatusDia=row.get("data_status_dia"),
-            previsaoEntrega=row.get("PREVISÃO DE ENTREGA"),
-            entrega=row.get("ENTREGA"),
-            sla=None,
-            prazo=None,
-            atraso=None,
-            source="merged",
-        )
-        records.append(record)
+@router.get("/sla-performance/records", response_model=SlaRecordsPage)
+async def get_sla_performance_records(
+    startDate: str | None = None,
+    endDate: str | None = None,
+    zone: str | None = None,
+    seller: str | None = None,
+    costCenter: str | None = None,
+    limit: int = Query(SLA_RECORDS_PAGE_SIZE, ge=1, le=SLA_RECORDS_MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
+    """Filtered SLA records: one page as JSON, or every record from `cursor` on as NDJSON (one PackageRecord per line)."""
+    job_id = await _get_latest_completed_job()
+    rows, _ = await _sla_filter(job_id, startDate, endDate, zone, seller, costCenter)
+
+    if format == "ndjson":
+        remaining, _ = _sla_page(rows, len(rows), cursor)
+        # Jobs stored in Firestore before the columnar store have no file to stream from
+        frame = None if os.path.exists(job_store.data_path(job_id)) else await job_store.load(job_id)
+        tables = job_store.iter_tables(job_id, remaining, NDJSON_CHUNK_ROWS, frame, list(PACKAGE_COLUMNS.values()))
+        return StreamingResponse(_ndjson_records(tables), media_type="application/x-ndjson")
+
+    page, next_cursor = _sla_page(rows, limit, cursor)
+    return ORJSONResponse({"records": await _package_records(job_id, page), "totalRecords": len(rows), "nextCursor": next_cursor})
+
+
+async def _sla_filter(
+    job_id: str,
+    startDate: Optional[str],
+    endDate: Optional[str],
+    zone: Optional[str],
+    seller: Optional[str],
+    costCenter: Optional[str],
+) -> Tuple[np.ndarray, pd.DataFrame]:
+    """Ids of the rows matching the SLA performance filters, with the (unfiltered) date, cost center and SLA columns."""
+    dictionary_filters = {column: pattern for column, pattern in (("Zona", zone), ("Vendedor", seller)) if pattern}
+    columns = await job_index.ensure(job_id, list(dictionary_filters))
+    if columns is None:
+        raise HTTPException(status_code=503, detail="Data backend unavailable")
+    df = await _load_dataframe(job_id, [c for c in ("data_pedido", "Centro de custo", "sla_calculated") if c in columns])
+    start = _date_bound(df["data_pedido"], startDate) if startDate else None
+    end = _date_bound(df["data_pedido"], endDate) if endDate else None
+
+    def select() -> np.ndarray:
+        mask = np.ones(len(df), dtype=bool)
+        if start is not None:
+            mask &= (df["data_pedido"] >= start).to_numpy()
+        if end is not None:
+            mask &= (df["data_pedido"] <= end).to_numpy()
+        if costCenter and "Centro de custo" in df.columns:
+            mask &= df["Centro de custo"].astype(str).str.contains(costCenter, case=False, na=False).to_numpy()
+        rows = np.flatnonzero(mask)
+        # Zone and seller match the job's distinct values, not every row
+        for column, pattern in dictionary_filters.items():
+            if column in columns:
+                rows = np.intersect1d(rows, job_index.match(job_id, column, pattern), assume_unique=True)
+        return rows
+
+    try:
+        return await asyncio.to_thread(select), df
+    except re.error:
+        raise HTTPException(status_code=400, detail="Invalid filter pattern")
+
+
+def _date_bound(dates: pd.Series, value: str) -> Any:
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        # Jobs stored before dates were typed compare as text
+        return value
+    try:
+        return pd.Timestamp(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date")
+
+
+def _sla_page(rows: np.ndarray, limit: int, cursor: Optional[str]) -> Tuple[np.ndarray, Optional[str]]:
+    """Rows after `cursor` (the last row id of the previous page) and the cursor of the following page."""
+    start = 0
+    if cursor is not None:
+        if not cursor.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        start = int(np.searchsorted(rows, int(cursor), side="right"))
+    page = rows[start:start + limit]
+    next_cursor = str(int(page[-1])) if start + limit < len(rows) and len(page) else None
+    return page, next_cursor
+
+
+def _sla_trend(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    trend_df = AnalyticsEngine.grouped_metrics(df, "data_pedido").sort_values("data_pedido")
+    trend_df["value"] = trend_df["sla_percentage"].round(2)
+    return column_records(LineChartData, {"date": trend_df["data_pedido"], "value": trend_df["value"]}, len(trend_df))
+
+
+async def _package_records(job_id: str, rows: np.ndarray) -> List[Dict[str, Any]]:
+    df = await job_store.read_rows(job_id, rows, list(PACKAGE_COLUMNS.values()))
+    if df is None:
+        raise HTTPException(status_code=503, detail="Data backend unavailable")
+    return _to_package_records(df)
+
+
+def _ndjson_records(tables: Iterator[Any]) -> Iterator[bytes]:
+    for table in tables:
+        yield b"".join(orjson.dumps(record) + b"\n" for record in _to_package_records(table.to_pandas()))
 
-    return SlaPerformanceData(
-        slaTrend=sla_trend,
-        records=records,
-        totalRecords=len(records),
+
+def _to_package_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Map job rows to PackageRecord payloads column by column instead of row by row."""
+    columns = {field: df[column] if column in df.columns else None for field, column in PACKAGE_COLUMNS.items()}
+    pedidos, marketplace = (json_values(df[column]) if column in df.columns else [None] * len(df) for column in ("Pedido", "pedido_marketplace"))
+    columns.update(
+        id=[str(pedido or pedido_marketplace) for pedido, pedido_marketplace in zip(pedidos, marketplace)],
+        pedido=[str(pedido or "") for pedido in pedidos],
+        pedidoMarketplace=[str(pedido_marketplace or "") for pedido_marketplace in marketplace],
+        source="merged",
     )
+    return column_records(PackageRecord, columns, len(df))
 
 
 @router.get("/historical", response_model=HistoricalData)
@@ -550,14 +503,12 @@ async def get_historical(comparisonMode: str = "week"):
     Simple historical comparison between the last two completed processes.
     This is enough to drive the frontend Historical page.
     """
-    processes = await process_repo.list_all()
-    completed = [p for p in processes if p.get("status") == "completed"]
-    if not completed:
+    pointer = await latest_job.current()
+    if not pointer:
         raise HTTPException(status_code=404, detail="No completed data available")
 
-    completed = sorted(completed, key=lambda p: p.get("lastUpdated", ""))
-    current = completed[-1]
-    previous = completed[-2] if len(completed) > 1 else current
+    current_id = pointer["job_id"]
+    previous_id = pointer.get("previous_job_id") or current_id
 
     async def _load_kpis(job_id: str) -> Dict[str, Any]:
         kpis = await sla_repo.get(f"{job_id}_kpis")
@@ -565,49 +516,21 @@ async def get_historical(comparisonMode: str = "week"):
             raise HTTPException(status_code=503, detail="Data backend unavailable")
         return kpis
 
-    current_kpis = await _load_kpis(current["id"])
-    previous_kpis = await _load_kpis(previous["id"])
+    current_kpis = await _load_kpis(current_id)
+    previous_kpis = await _load_kpis(previous_id)
 
     # Build SLA evolution and delay trend from current job
-    data_doc = await data_repo.get(f"{current['id']}_data")
-    if not data_doc:
-        raise HTTPException(status_code=503, detail="Data backend unavailable")
-
-    df = _load_dataframe(data_doc["data"])
+    _, cube = await _load_cube(current_id, [["data_pedido"], ["data_status_dia"], ["Vendedor"]])
 
     # SLA evolution
-    sla_evolution_df = (
-        df.groupby("data_pedido")
-        .agg(
-            total=("sla_calculated", "count"),
-            on_time=("sla_calculated", lambda x: (x == "Dentro do prazo").sum()),
-        )
-        .reset_index()
-        .sort_values("data_pedido")
-    )
-    sla_evolution_df["value"] = (sla_evolution_df["on_time"] / sla_evolution_df["total"] * 100).round(
-        2
-    )
+    sla_evolution_df = AnalyticsEngine.metrics_from_counts(AggregateCube.frame(cube, "data_pedido"))
+    sla_evolution_df["value"] = sla_evolution_df["sla_percentage"].round(2)
 
-    from ..models import LineChartData
-
-    sla_evolution = [
-        LineChartData(date=str(row["data_pedido"]), value=float(row["value"]))
-        for _, row in sla_evolution_df.iterrows()
-    ]
+    sla_evolution = column_records(LineChartData, {"date": sla_evolution_df["data_pedido"], "value": sla_evolution_df["value"]}, len(sla_evolution_df))
 
     # Delay trend
-    delayed = df[df["sla_calculated"].isin(["Entregue com atraso", "Fora do prazo"])]
-    delay_trend_df = (
-        delayed.groupby("data_status_dia")
-        .size()
-        .reset_index(name="value")
-        .sort_values("data_status_dia")
-    )
-    delay_trend = [
-        LineChartData(date=str(row["data_status_dia"]), value=float(row["value"]))
-        for _, row in delay_trend_df.iterrows()
-    ]
+    delay_trend_df = _delayed_groups(cube, "data_status_dia")
+    delay_trend = column_records(LineChartData, {"date": delay_trend_df["data_status_dia"], "value": delay_trend_df["delays"]}, len(delay_trend_df))
 
     # Period comparison mapped to shared schema
     from ..models import SLAMetrics as BackendSlaMetrics
@@ -635,19 +558,16 @@ async def get_historical(comparisonMode: str = "week"):
     percentage_change = current_metrics.withinSlaPercentage - previous_metrics.withinSlaPercentage
 
     # Seller performance (very simplified: latest SLA per seller)
-    seller_group = df.groupby("Vendedor")
     seller_perf = []
-    for seller, g in seller_group:
-        total = len(g)
-        on_time = (g["sla_calculated"] == "Dentro do prazo").sum()
-        sla_pct = (on_time / total * 100) if total > 0 else 0
+    seller_metrics = AnalyticsEngine.metrics_from_counts(AggregateCube.frame(cube, "Vendedor"))
+    for seller, sla_pct in zip(seller_metrics["Vendedor"], seller_metrics["sla_percentage"]):
         seller_perf.append(
             {
                 "seller": str(seller),
                 "periods": [
                     {
                         "period": "current",
-                        "slaPercentage": sla_pct,
+                        "slaPercentage": float(sla_pct),
                     }
                 ],
             }
@@ -675,17 +595,13 @@ async def get_filters():
     """
     job_id = await _get_latest_completed_job()
 
-    data_doc = await data_repo.get(f"{job_id}_data")
-    if not data_doc:
-        raise HTTPException(status_code=503, detail="Data backend unavailable")
-
-    df = _load_dataframe(data_doc["data"])
+    _, cube = await _load_cube(job_id, [["Zona"], ["Vendedor"], ["Centro de custo"], ["data_pedido"]])
 
-    zones = sorted(set(df.get("Zona", []).dropna().astype(str)))
-    sellers = sorted(set(df.get("Vendedor", []).dropna().astype(str)))
-    cost_centers = sorted(set(df.get("Centro de custo", []).dropna().astype(str)))
+    zones = sorted(set(AggregateCube.frame(cube, "Zona")["Zona"].astype(str)))
+    sellers = sorted(set(AggregateCube.frame(cube, "Vendedor")["Vendedor"].astype(str)))
+    cost_centers = sorted(set(AggregateCube.frame(cube, "Centro de custo")["Centro de custo"].astype(str)))
 
-    date_series = pd.to_datetime(df.get("data_pedido"), errors="coerce")
+    date_series = pd.to_datetime(AggregateCube.frame(cube, "data_pedido")["data_pedido"], errors="coerce")
     if date_series.notna().any():
         min_date = date_series.min().strftime("%Y-%m-%d")
         max_date = date_series.max().strftime("%Y-%m-%d")
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException
-from ..models import ProcessStartRequest, ProcessStatusResponse, LogsResponse
-from ..repositories import ProcessRepository, LogsRepository, UploadRepository, DataRepository, SLARepository, RankingsRepository
-from ..services import DataProcessingService
-from ..analytics import AnalyticsEngine
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from ..models import ProcessStartRequest, ProcessAppendRequest, ProcessStatusResponse, LogsResponse
+from ..repositories import ProcessRepository, LogsRepository, UploadRepository, JobStore, SLARepository, RankingsRepository, frame_cache, latest_job
+from ..pipelines import job_executor, event_bus, TERMINAL_STATUSES
+from ..pipelines.tasks import STAGES, normalize_input, merge_inputs, merge_delta, classify_dataset, classify_append, persist_dataset, build_analytics, update_analytics
+from ..config.settings import PROGRESS_STREAM_KEEPALIVE_SECONDS
+from typing import Dict, Any, AsyncIterator, Optional
+import asyncio
+import json
 import uuid
+import os
 from datetime import datetime
 
 router = APIRouter()
@@ -11,12 +17,15 @@ router = APIRouter()
 process_repo = ProcessRepository()
 logs_repo = LogsRepository()
 upload_repo = UploadRepository()
-data_repo = DataRepository()
+job_store = JobStore()
 sla_repo = SLARepository()
 rankings_repo = RankingsRepository()
 
+# Progress reported once each stage has completed
+STAGE_PROGRESS = {"normalize": 30, "merge": 50, "classify": 60, "persist": 70}
+
 @router.post("/start", response_model=ProcessStatusResponse)
-async def start_process(request: ProcessStartRequest, background_tasks: BackgroundTasks):
+async def start_process(request: ProcessStartRequest):
     job_id = str(uuid.uuid4())
     
     # Check if files exist
@@ -26,12 +35,54 @@ async def start_process(request: ProcessStartRequest, background_tasks: Backgrou
         # Could be missing files or backend unavailable; surface as 503 for backend issues
         raise HTTPException(status_code=503, detail="Data backend unavailable or files not found")
     
-    await process_repo.create(job_id, {"status": "pending", "progress": 0, "mother_id": request.mother_file_id, "loose_id": request.loose_file_id})
+    # The same pair of files was already processed: serve those results again. The latest-job pointer
+    # is left alone; nothing new was computed, and dashboards showing a newer job keep showing it
+    existing_id = await find_completed_job(mother, loose)
+    if existing_id:
+        return ProcessStatusResponse(job_id=existing_id, status="completed", progress=100, message="Files already processed; reusing results")
+    
+    await process_repo.create(job_id, {"status": "pending", "progress": 0, "mother_id": request.mother_file_id, "loose_id": request.loose_file_id, "mother_hash": mother.get("sha256"), "loose_hash": loose.get("sha256"), "lastUpdated": datetime.utcnow().isoformat()})
     
-    background_tasks.add_task(process_data, job_id)
+    await job_executor.submit(job_id)
     
     return ProcessStatusResponse(job_id=job_id, status="pending", progress=0, message="Processing started")
 
+@router.post("/append", response_model=ProcessStatusResponse)
+async def append_process(request: ProcessAppendRequest):
+    """Upsert a new Gestora extract into a completed job; aggregates are updated from the changed rows only."""
+    base = await process_repo.get(request.base_job_id)
+    if not base:
+        raise HTTPException(status_code=404, detail="Base process not found")
+    if base.get("status") != "completed":
+        raise HTTPException(status_code=409, detail="Base process is not completed")
+    
+    mother_id = request.mother_file_id or base.get("mother_id")
+    mother = await upload_repo.get(mother_id)
+    loose = await upload_repo.get(request.loose_file_id)
+    if not mother or not loose:
+        raise HTTPException(status_code=503, detail="Data backend unavailable or files not found")
+    
+    job_id = str(uuid.uuid4())
+    await process_repo.create(job_id, {"status": "pending", "progress": 0, "mode": "append", "base_job_id": request.base_job_id, "mother_id": mother_id, "loose_id": request.loose_file_id, "lastUpdated": datetime.utcnow().isoformat()})
+    
+    await job_executor.submit(job_id)
+    
+    return ProcessStatusResponse(job_id=job_id, status="pending", progress=0, message="Append processing started")
+
+@router.post("/cancel/{job_id}", response_model=ProcessStatusResponse)
+async def cancel_process(job_id: str):
+    process = await process_repo.get(job_id)
+    if not process:
+        raise HTTPException(status_code=404, detail="Process not found")
+    if process["status"] in ("completed", "failed", "cancelled"):
+        raise HTTPException(status_code=409, detail=f"Process already {process['status']}")
+    
+    await job_executor.cancel(job_id)
+    await process_repo.update(job_id, {"status": "cancelled", "message": "Processing cancelled"})
+    event_bus.publish(job_id, "cancelled", process.get("progress", 0), message="Processing cancelled")
+    
+    return ProcessStatusResponse(job_id=job_id, status="cancelled", progress=process.get("progress", 0), message="Processing cancelled")
+
 @router.get("/status/{job_id}", response_model=ProcessStatusResponse)
 async def get_status(job_id: str):
     process = await process_repo.get(job_id)
@@ -45,21 +96,84 @@ async def get_status(job_id: str):
         message=process.get("message")
     )
 
+@router.get("/events/{job_id}")
+async def stream_progress(job_id: str):
+    """Server-Sent Events stream of a job's progress; ends once the job completes, fails or is cancelled."""
+    process = await process_repo.get(job_id)
+    if not process:
+        raise HTTPException(status_code=404, detail="Process not found")
+    
+    return StreamingResponse(
+        _progress_events(job_id, process),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _progress_events(job_id: str, process: Dict[str, Any]) -> AsyncIterator[str]:
+    queue = event_bus.subscribe(job_id)
+    try:
+        event = event_bus.last(job_id) or _stored_progress(job_id, process)
+        while True:
+            yield f"event: progress\ndata: {json.dumps(event, default=str)}\n\n"
+            if event["status"] in TERMINAL_STATUSES:
+                return
+            try:
+                event = await asyncio.wait_for(queue.get(), PROGRESS_STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Doubles as keep-alive, and covers jobs run by another API process (they publish to their own bus)
+                process = await process_repo.get(job_id)
+                if not process:
+                    return
+                event = event_bus.last(job_id) or _stored_progress(job_id, process)
+    finally:
+        event_bus.unsubscribe(job_id, queue)
+
+def _stored_progress(job_id: str, process: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_id": job_id,
+        "status": process.get("status", "pending"),
+        "progress": process.get("progress", 0),
+        "message": process.get("message"),
+        "lastUpdated": process.get("lastUpdated"),
+    }
+
 @router.get("/logs/{job_id}", response_model=LogsResponse)
 async def get_logs(job_id: str):
     logs = await logs_repo.query("job_id", "==", job_id)
     return LogsResponse(job_id=job_id, logs=logs)
 
+async def find_completed_job(mother: Dict[str, Any], loose: Dict[str, Any]) -> Optional[str]:
+    """Return a completed job that processed exactly these two files (by content hash), if its data is still stored."""
+    if not mother.get("sha256") or not loose.get("sha256"):
+        return None
+    for process in await process_repo.query("mother_hash", "==", mother["sha256"]):
+        if process.get("loose_hash") == loose["sha256"] and process.get("status") == "completed" and os.path.exists(job_store.data_path(process["id"])):
+            return process["id"]
+    return None
+
 async def process_data(job_id: str):
     try:
-        await process_repo.update(job_id, {"status": "processing", "progress": 10})
+        job = await job_executor.job(job_id)
+        if job and job["attempts"] > job["max_attempts"]:
+            # The server kept dying while running this job; stop reclaiming it
+            await job_executor.fail(job_id, "Processing interrupted too many times", retry=False)
+            await process_repo.update(job_id, {"status": "failed", "message": "Processing interrupted too many times"})
+            event_bus.publish(job_id, "failed", message="Processing interrupted too many times")
+            return
+        done = STAGES.index(job["stage"]) + 1 if job and job.get("stage") else 0
+        progress = STAGE_PROGRESS.get(STAGES[done - 1], 10) if done else 10
+        
+        await process_repo.update(job_id, {"status": "processing", "progress": progress})
+        event_bus.publish(job_id, "processing", progress)
         
         process = await process_repo.get(job_id)
         if not process:
             # If the process cannot be retrieved, abort processing
             await process_repo.update(job_id, {"status": "failed", "message": "Process data not available"})
+            event_bus.publish(job_id, "failed", message="Process data not available")
             return
 
+        append = process.get("mode") == "append"
         mother_id = process.get("mother_id")
         loose_id = process.get("loose_id")
         
@@ -68,30 +182,71 @@ async def process_data(job_id: str):
         if not mother_data or not loose_data:
             # Backend or files missing; mark process failed
             await process_repo.update(job_id, {"status": "failed", "message": "Input files not found or data backend unavailable"})
+            event_bus.publish(job_id, "failed", message="Input files not found or data backend unavailable")
             return
         
-        # Load and normalize
-        service = DataProcessingService()
-        merged_data = await service.process_files(mother_data["file_path"], loose_data["file_path"])
-        
-        await process_repo.update(job_id, {"progress": 50})
-        
-        # Calculate SLA
-        for record in merged_data:
-            record["sla_calculated"] = service.calculate_sla(record)
+        normalized = 0
         
-        # Save data
-        await data_repo.create(f"{job_id}_data", {"data": merged_data})
+        async def normalize(kind: str, upload: Dict[str, Any]) -> None:
+            nonlocal normalized
+            rows = await job_executor.run_cpu(normalize_input, job_id, kind, upload["file_path"], upload.get("sha256"))
+            normalized += 1
+            event_bus.publish(job_id, "processing", 10 + 10 * normalized, currentStep=f"normalize:{kind}", rows=rows)
         
-        # Calculate analytics
-        kpis = AnalyticsEngine.calculate_global_kpis(merged_data)
-        await sla_repo.create(f"{job_id}_kpis", kpis)
+        # Each stage runs in a worker process and checkpoints its output, so a restarted job resumes after the last completed stage
+        for stage in STAGES[done:]:
+            event_bus.publish(job_id, "processing", currentStep=stage)
+            rows = None
+            if stage == "normalize":
+                # Both files are independent until the merge: read and normalize them in parallel workers
+                results = await asyncio.gather(normalize("mother", mother_data), normalize("loose", loose_data), return_exceptions=True)
+                for result in results:
+                    if isinstance(result, BaseException):
+                        raise result
+            elif stage == "merge":
+                rows = await job_executor.run_cpu(merge_delta if append else merge_inputs, job_id)
+            elif stage == "classify":
+                if append:
+                    rows = await job_executor.run_cpu(classify_append, job_id, process["base_job_id"])
+                else:
+                    rows = await job_executor.run_cpu(classify_dataset, job_id)
+            elif stage == "persist":
+                # Save data to the columnar job store (manifest goes to the data collection)
+                data_manifest = await job_executor.run_cpu(persist_dataset, job_id)
+                await job_store.save_manifest(job_id, data_manifest)
+                rows = data_manifest["rows"]
+            elif stage == "analytics":
+                # KPIs, rankings and the dashboard cube; append jobs update the base job's instead of recomputing
+                base_cube = await sla_repo.get(f"{process['base_job_id']}_cube") if append else None
+                analytics = await job_executor.run_cpu(update_analytics, job_id, base_cube) if base_cube else None
+                if analytics is None:
+                    analytics = await job_executor.run_cpu(build_analytics, job_id)
+                await sla_repo.create_many({f"{job_id}_kpis": analytics["kpis"], f"{job_id}_cube": analytics["cube_manifest"]})
+                await rankings_repo.create(f"{job_id}_rankings", analytics["rankings"])
+            
+            await job_executor.checkpoint(job_id, stage)
+            if stage in STAGE_PROGRESS:
+                await process_repo.update(job_id, {"progress": STAGE_PROGRESS[stage]})
+                event_bus.publish(job_id, "processing", STAGE_PROGRESS[stage], currentStep=stage, rows=rows)
         
-        rankings = AnalyticsEngine.generate_rankings(merged_data)
-        await rankings_repo.create(f"{job_id}_rankings", rankings)
+        await asyncio.to_thread(job_store.clear_stages, job_id)
+        # Completing the job and pointing dashboards at it is one atomic write
+        await latest_job.publish(job_id, {"status": "completed", "progress": 100, "message": "Processing completed"})
+        event_bus.publish(job_id, "completed", 100, message="Processing completed")
         
-        await process_repo.update(job_id, {"status": "completed", "progress": 100, "message": "Processing completed"})
+        # Dashboards switch to the new job; release frames cached for previous ones
+        frame_cache.invalidate()
         
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
-        await process_repo.update(job_id, {"status": "failed", "message": str(e)})
+        # Data errors (ValueError) are final; anything else is retried while attempts remain
+        retrying = await job_executor.fail(job_id, str(e), retry=not isinstance(e, ValueError))
+        if retrying:
+            await process_repo.update(job_id, {"status": "pending", "message": f"Retrying after error: {e}"})
+            event_bus.publish(job_id, "pending", message=f"Retrying after error: {e}")
+        else:
+            await asyncio.to_thread(job_store.clear_stages, job_id)
+            await process_repo.update(job_id, {"status": "failed", "message": str(e)})
+            event_bus.publish(job_id, "failed", message=str(e))
         await logs_repo.create(str(uuid.uuid4()), {"job_id": job_id, "level": "error", "message": str(e), "timestamp": datetime.utcnow()})
\ No newline at end of file
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form
 from ..repositories import UploadRepository
+from ..pipelines import job_executor
+from ..pipelines.tasks import transcode_upload
+from ..utils.upload_validator import validate_upload
 from ..models import UploadResponse
 import uuid
+import asyncio
+import hashlib
 import aiofiles
 import os
 from datetime import datetime
@@ -56,34 +61,39 @@ async def upload_mother_logic(file: UploadFile):
             raise HTTPException(status_code=400, detail="File must be Excel (.xlsx, .xls) or CSV (.csv)")
         
         job_id = str(uuid.uuid4())
-        file_path = f"uploads/{job_id}_mother{os.path.splitext(file.filename)[1]}"
         os.makedirs("uploads", exist_ok=True)
         
         # Save file in chunks to avoid loading large files into memory
         chunk_size = 1024 * 1024  # 1MB chunks
         temp_path = f"uploads/{job_id}_temp{os.path.splitext(file.filename)[1]}"
+        sha256 = hashlib.sha256()
         async with aiofiles.open(temp_path, 'wb') as f:
             while True:
                 chunk = await file.read(chunk_size)
                 if not chunk:
                     break
+                sha256.update(chunk)
                 await f.write(chunk)
         
-        # Validate that it's a valid file
+        # Validate that it's a valid file (header only, off the event loop)
         try:
-            import pandas as pd
-            if file.filename.lower().endswith('.csv'):
-                pd.read_csv(temp_path, nrows=1)  # Try to read first row
-            else:
-                pd.read_excel(temp_path, sheet_name=0, nrows=1)  # Try to read first row
+            validation = await asyncio.to_thread(validate_upload, temp_path, "mother")
         except Exception as e:
             os.remove(temp_path)
             raise HTTPException(status_code=400, detail=f"Arquivo inválido ou corrompido: {str(e)}")
         
-        # Move to final path
-        os.rename(temp_path, file_path)
+        # Identical files are stored once, under their content hash
+        file_hash = sha256.hexdigest()
+        file_path = f"uploads/{file_hash}_mother{os.path.splitext(file.filename)[1]}"
+        if os.path.exists(file_path):
+            os.remove(temp_path)
+        else:
+            os.rename(temp_path, file_path)
+        
+        await upload_repo.create(job_id, {"type": "mother", "file_path": file_path, "sha256": file_hash, "status": "uploaded", "uploadedAt": datetime.utcnow().isoformat(), **validation})
         
-        await upload_repo.create(job_id, {"type": "mother", "file_path": file_path, "status": "uploaded", "uploadedAt": datetime.utcnow().isoformat()})
+        # Parse the sheet into the columnar upload cache while the user uploads the other file
+        job_executor.run_background(transcode_upload, "mother", file_path, file_hash)
         
         return UploadResponse(job_id=job_id, message="Mother file uploaded successfully")
     except HTTPException:
@@ -106,34 +116,39 @@ async def upload_loose_logic(file: UploadFile):
             raise HTTPException(status_code=400, detail="File must be Excel (.xlsx, .xls) or CSV (.csv)")
         
         job_id = str(uuid.uuid4())
-        file_path = f"uploads/{job_id}_loose{os.path.splitext(file.filename)[1]}"
         os.makedirs("uploads", exist_ok=True)
         
         # Save file in chunks to avoid loading large files into memory
         chunk_size = 1024 * 1024  # 1MB chunks
         temp_path = f"uploads/{job_id}_temp{os.path.splitext(file.filename)[1]}"
+        sha256 = hashlib.sha256()
         async with aiofiles.open(temp_path, 'wb') as f:
             while True:
                 chunk = await file.read(chunk_size)
                 if not chunk:
                     break
+                sha256.update(chunk)
                 await f.write(chunk)
         
-        # Validate that it's a valid file
+        # Validate that it's a valid file (header only, off the event loop)
         try:
-            import pandas as pd
-            if file.filename.lower().endswith('.csv'):
-                pd.read_csv(temp_path, nrows=1)  # Try to read first row
-            else:
-                pd.read_excel(temp_path, sheet_name=0, nrows=1)  # Try to read first row
+            validation = await asyncio.to_thread(validate_upload, temp_path, "loose")
         except Exception as e:
             os.remove(temp_path)
             raise HTTPException(status_code=400, detail=f"Arquivo inválido ou corrompido: {str(e)}")
         
-        # Move to final path
-        os.rename(temp_path, file_path)
+        # Identical files are stored once, under their content hash
+        file_hash = sha256.hexdigest()
+        file_path = f"uploads/{file_hash}_loose{os.path.splitext(file.filename)[1]}"
+        if os.path.exists(file_path):
+            os.remove(temp_path)
+        else:
+            os.rename(temp_path, file_path)
         
-        await upload_repo.create(job_id, {"type": "loose", "file_path": file_path, "status": "uploaded", "uploadedAt": datetime.utcnow().isoformat()})
+        await upload_repo.create(job_id, {"type": "loose", "file_path": file_path, "sha256": file_hash, "status": "uploaded", "uploadedAt": datetime.utcnow().isoformat(), **validation})
+        
+        # Parse the sheet into the columnar upload cache while the user uploads the other file
+        job_executor.run_background(transcode_upload, "loose", file_path, file_hash)
         
         return UploadResponse(job_id=job_id, message="Loose file uploaded successfully")
     except HTTPException:
@@ -154,8 +169,7 @@ async def get_upload_status():
     # Get latest process
     from ..repositories import ProcessRepository
     process_repo = ProcessRepository()
-    processes = await process_repo.list_all()
-    processing = processes[-1] if processes else {"status": "idle", "lastUpdated": datetime.utcnow().isoformat()}
+    processing = await process_repo.latest("lastUpdated") or {"status": "idle", "lastUpdated": datetime.utcnow().isoformat()}
     
     # Ensure processing has all required fields
     if processing:
@@ -201,8 +215,9 @@ async def delete_upload(fileType: str):
         raise HTTPException(status_code=404, detail="File not found")
     
     latest = uploads[-1]
-    # Delete the file
-    if os.path.exists(latest["file_path"]):
+    # Delete the file, unless another upload of the same content still points to it
+    shared = [u for u in await upload_repo.query("file_path", "==", latest["file_path"]) if u["id"] != latest["id"]]
+    if not shared and os.path.exists(latest["file_path"]):
         os.remove(latest["file_path"])
     # Delete from repo
     await upload_repo.delete(latest["id"])
@@ -210,10 +225,10 @@ async def delete_upload(fileType: str):
     return {"message": "File deleted successfully"}
 
 @router.post("/process")
-async def start_processing(background_tasks: BackgroundTasks):
+async def start_processing():
     from ..repositories import ProcessRepository
     from ..models import ProcessStartRequest
-    from .process import process_data
+    from .process import find_completed_job
     process_repo = ProcessRepository()
     
     # Get latest mother and loose
@@ -225,11 +240,17 @@ async def start_processing(background_tasks: BackgroundTasks):
     mother = mother_uploads[-1]
     loose = loose_uploads[-1]
     
+    # The same pair of files was already processed: serve those results again. The latest-job pointer
+    # is left alone; nothing new was computed, and dashboards showing a newer job keep showing it
+    existing_id = await find_completed_job(mother, loose)
+    if existing_id:
+        return {"job_id": existing_id, "status": "completed", "message": "Files already processed; reusing results"}
+    
     # Create process entry
     job_id = str(uuid.uuid4())
-    await process_repo.create(job_id, {"status": "pending", "progress": 0, "mother_id": mother["id"], "loose_id": loose["id"], "lastUpdated": datetime.utcnow().isoformat()})
+    await process_repo.create(job_id, {"status": "pending", "progress": 0, "mother_id": mother["id"], "loose_id": loose["id"], "mother_hash": mother.get("sha256"), "loose_hash": loose.get("sha256"), "lastUpdated": datetime.utcnow().isoformat()})
     
-    # Start background task
-    background_tasks.add_task(process_data, job_id)
+    # Queue the job on the executor
+    await job_executor.submit(job_id)
     
     return {"job_id": job_id, "status": "pending", "message": "Processing started"}
\ No newline at end of file
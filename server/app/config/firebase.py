@@ -9,6 +9,11 @@ if os.path.exists(cred_path):
     cred = credentials.Certificate(cred_path)
     firebase_admin.initialize_app(cred)
     db = firestore.client()
+elif os.getenv("FIRESTORE_EMULATOR_HOST"):
+    # The emulator accepts any project id and needs no credentials; the client picks up the host from the environment
+    from google.cloud import firestore as cloud_firestore
+    from google.auth.credentials import AnonymousCredentials
+    db = cloud_firestore.Client(project=os.getenv("FIREBASE_PROJECT_ID", "demo-atlas"), credentials=AnonymousCredentials())
 else:
     # Do not warn at import time to avoid noisy startup logs; Firestore will raise only when used.
     db = None
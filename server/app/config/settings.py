@@ -0,0 +1,56 @@
+import os
+
+# Columnar job store: one Arrow IPC file per job, manifest kept in the "data" collection
+JOB_STORE_DIR = os.getenv("JOB_STORE_DIR", "storage/jobs")
+
+# In-process LRU cache of loaded job frames, bounded by an approximate byte budget
+FRAME_CACHE_MAX_BYTES = int(os.getenv("FRAME_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Rows per chunk when streaming .xlsx uploads through the normalizer
+EXCEL_CHUNK_ROWS = int(os.getenv("EXCEL_CHUNK_ROWS", "50000"))
+
+# Block size for the multithreaded pyarrow CSV reader (each block is parsed on its own thread)
+CSV_BLOCK_SIZE = int(os.getenv("CSV_BLOCK_SIZE", str(8 * 1024 * 1024)))
+
+# Job executor: worker processes for CPU-bound stages and how many jobs may run at once
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", str(os.cpu_count() or 1)))
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "2"))
+
+# Durable job queue (SQLite): lease length, retry policy and how often idle workers poll for work
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "storage/queue.sqlite3")
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "10"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+
+# Columnar copies of uploaded sheets (Arrow IPC), keyed by the upload's SHA-256
+UPLOAD_CACHE_DIR = os.getenv("UPLOAD_CACHE_DIR", "storage/uploads")
+
+# Firestore bulk operations: writes per batch (Firestore's limit is 500), records per shard document
+# and how many shard reads/writes may be in flight at once
+FIRESTORE_BATCH_SIZE = int(os.getenv("FIRESTORE_BATCH_SIZE", "500"))
+SHARD_SIZE = int(os.getenv("SHARD_SIZE", "1000"))
+SHARD_CONCURRENCY = int(os.getenv("SHARD_CONCURRENCY", "8"))
+
+# Metadata backend for the repositories: "firestore" (default) or "sqlite" (embedded, single node)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firestore").lower()
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "storage/metadata.sqlite3")
+
+# How long API processes may serve a cached "latest completed job" pointer
+LATEST_JOB_TTL_SECONDS = float(os.getenv("LATEST_JOB_TTL_SECONDS", "5"))
+
+# Seconds between keep-alive frames (and stored-status refreshes) on progress streams
+PROGRESS_STREAM_KEEPALIVE_SECONDS = float(os.getenv("PROGRESS_STREAM_KEEPALIVE_SECONDS", "15"))
+
+# Job columns given a presorted permutation when a job is persisted (others are indexed on first use)
+INDEX_SORT_COLUMNS = [c for c in os.getenv("INDEX_SORT_COLUMNS", "Pedido,Data Pedido,data_pedido,Vendedor,Zona,sla_calculated").split(",") if c]
+
+# SLA performance records per page (default and maximum)
+SLA_RECORDS_PAGE_SIZE = int(os.getenv("SLA_RECORDS_PAGE_SIZE", "1000"))
+SLA_RECORDS_MAX_PAGE_SIZE = int(os.getenv("SLA_RECORDS_MAX_PAGE_SIZE", "10000"))
+
+# Rows per chunk when streaming dataset exports
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "50000"))
+
+# Entries per ranking (top-k) stored with each job
+RANKING_TOP_N = int(os.getenv("RANKING_TOP_N", "10"))
@@ -4,6 +4,8 @@ from fastapi.middleware import Middleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from .api import router
+from .api.process import process_data
+from .pipelines import job_executor
 
 app = FastAPI(
     title="Flex Velozz | ATLAS Backend",
@@ -33,6 +35,14 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 app.include_router(router)
 
+@app.on_event("startup")
+async def start_job_executor():
+    await job_executor.start(process_data)
+
+@app.on_event("shutdown")
+async def stop_job_executor():
+    await job_executor.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "Flex Velozz | ATLAS Backend"}
@@ -41,9 +51,8 @@ async def root():
 async def get_system_status():
     from .repositories import ProcessRepository
     process_repo = ProcessRepository()
-    processes = await process_repo.list_all()
-    if processes:
-        latest = processes[-1]
+    latest = await process_repo.latest("lastUpdated")
+    if latest:
         return {
             "status": latest.get("status", "idle"),
             "lastUpdate": latest.get("lastUpdated"),
@@ -60,6 +69,7 @@ async def get_system_status():
 async def health():
     """Simple health check for readiness: checks Firestore configuration and returns status."""
     from .config.firebase import get_db
+    from .config.settings import STORAGE_BACKEND
     try:
         # get_db will raise RuntimeError if not configured
         get_db()
@@ -67,4 +77,4 @@ async def health():
     except RuntimeError:
         firebase_ok = False
 
-    return {"ok": True, "firebase_configured": firebase_ok}
\ No newline at end of file
+    return {"ok": True, "firebase_configured": firebase_ok, "storage_backend": STORAGE_BACKEND}
\ No newline at end of file
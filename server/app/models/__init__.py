@@ -12,6 +12,11 @@ class ProcessStartRequest(BaseModel):
     mother_file_id: str
     loose_file_id: str
 
+class ProcessAppendRequest(BaseModel):
+    base_job_id: str
+    loose_file_id: str
+    mother_file_id: Optional[str] = None
+
 class ProcessStatusResponse(BaseModel):
     job_id: str
     status: str  # pending, processing, completed, failed
@@ -123,6 +128,7 @@ class ConsolidatedResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 # History models
 class HistoryComparisonResponse(BaseModel):
@@ -297,6 +303,13 @@ class SlaPerformanceData(BaseModel):
     slaTrend: List[LineChartData]
     records: List[PackageRecord]
     totalRecords: int
+    nextCursor: Optional[str] = None
+
+
+class SlaRecordsPage(BaseModel):
+    records: List[PackageRecord]
+    totalRecords: int
+    nextCursor: Optional[str] = None
 
 
 class HistoricalPeriodComparison(BaseModel):
@@ -0,0 +1,3 @@
+from .job_queue import JobQueue
+from .executor import JobExecutor, job_executor
+from .events import EventBus, event_bus, TERMINAL_STATUSES
@@ -0,0 +1,61 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+from datetime import datetime
+import asyncio
+
+# Statuses after which a job publishes nothing more
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+class EventBus:
+    """In-process fan-out of job progress events to streaming subscribers.
+
+    `publish` never blocks the job: each subscriber gets a bounded queue and,
+    when it falls behind, loses its oldest events (every event is a full
+    progress snapshot, so only the newest matters). The last event of the
+    most recent `max_jobs` jobs is kept so late subscribers start from the
+    current state. Must be used from the event loop thread.
+    """
+
+    def __init__(self, max_queue: int = 100, max_jobs: int = 1000):
+        self.max_queue = max_queue
+        self.max_jobs = max_jobs
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._last: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def publish(self, job_id: str, status: str, progress: Optional[float] = None, **fields: Any) -> Dict[str, Any]:
+        previous = self._last.get(job_id, {})
+        event = {
+            "job_id": job_id,
+            "status": status,
+            "progress": progress if progress is not None else previous.get("progress", 0),
+            **fields,
+            "lastUpdated": datetime.utcnow().isoformat(),
+        }
+        self._last[job_id] = event
+        self._last.move_to_end(job_id)
+        while len(self._last) > self.max_jobs:
+            self._last.popitem(last=False)
+        for queue in self._subscribers.get(job_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+        return event
+
+    def last(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._last.get(job_id)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(self.max_queue)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[job_id]
+
+
+event_bus = EventBus()
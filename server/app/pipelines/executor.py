@@ -0,0 +1,166 @@
+from ..config.settings import PROCESS_POOL_WORKERS, MAX_CONCURRENT_JOBS, JOB_LEASE_SECONDS, JOB_POLL_SECONDS
+from .job_queue import JobQueue
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+import multiprocessing
+import asyncio
+import warnings
+import socket
+import uuid
+import os
+
+JobHandler = Callable[[str], Awaitable[None]]
+
+
+class JobExecutor:
+    """Runs processing jobs from the durable queue without blocking the API event loop.
+
+    Up to `max_concurrent_jobs` worker coroutines claim jobs from the JobQueue
+    and keep their leases alive while the handler runs. Handlers stay
+    coroutines in the API process (they own status updates and database
+    writes) and hand their CPU-bound steps to a process pool through run_cpu.
+    A handler that raises is retried by the queue; a handler can also settle
+    its job itself with `fail` (e.g. for errors retrying cannot fix).
+    """
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        max_workers: int = PROCESS_POOL_WORKERS,
+        max_concurrent_jobs: int = MAX_CONCURRENT_JOBS,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        poll_seconds: float = JOB_POLL_SECONDS,
+    ):
+        self.queue = queue or JobQueue()
+        self.max_workers = max_workers
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handler: Optional[JobHandler] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    async def start(self, handler: JobHandler) -> None:
+        """Start claiming jobs; queued jobs and jobs left behind by a previous run are picked up too."""
+        if self._workers:
+            return
+        self._handler = handler
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrent_jobs)]
+
+    async def shutdown(self) -> None:
+        running = list(self._running)
+        for task in [*self._workers, *self._running.values(), *self._background]:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # Interrupted jobs go straight back to the queue instead of waiting for their leases to expire
+        for job_id in running:
+            await self.queue.release(job_id, self.owner)
+        self._discard_pool(self._pool)
+
+    async def submit(self, job_id: str) -> None:
+        await self.queue.enqueue(job_id)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. A running CPU step is abandoned, not interrupted."""
+        cancelled = await self.queue.cancel(job_id)
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        return cancelled
+
+    async def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.queue.get(job_id)
+
+    async def checkpoint(self, job_id: str, stage: str) -> None:
+        await self.queue.checkpoint(job_id, self.owner, stage)
+
+    async def fail(self, job_id: str, error: str, retry: bool = True) -> bool:
+        return await self.queue.fail(job_id, self.owner, error, retry)
+
+    async def run_cpu(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pool is None:
+            # "spawn" keeps worker processes independent of the server's threads and sockets
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        pool = self._pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); the pool is unusable, so the next call (or the job's retry) gets a new one
+            self._discard_pool(pool)
+            raise
+
+    def _discard_pool(self, pool: Optional[ProcessPoolExecutor]) -> None:
+        if pool is None:
+            return
+        pool.shutdown(wait=False, cancel_futures=True)
+        # Another caller may already have replaced it
+        if self._pool is pool:
+            self._pool = None
+
+    def run_background(self, fn: Callable[..., Any], *args: Any) -> None:
+        """Fire-and-forget CPU work outside the job queue (e.g. upload housekeeping); failures are only logged."""
+        task = asyncio.create_task(self._run_background(fn, *args))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _run_background(self, fn: Callable[..., Any], *args: Any) -> None:
+        try:
+            await self.run_cpu(fn, *args)
+        except Exception as e:
+            warnings.warn(f"Background task {fn.__name__} failed: {e}")
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self.queue.claim(self.owner, self.lease_seconds)
+            except Exception as e:
+                warnings.warn(f"Job queue unavailable; retrying: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            await self._run(job["job_id"])
+
+    async def _run(self, job_id: str) -> None:
+        task = asyncio.create_task(self._handler(job_id))
+        self._running[job_id] = task
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, task))
+        try:
+            await task
+        except asyncio.CancelledError:
+            # Re-raise when the worker itself is being shut down; a cancelled job is already settled
+            if asyncio.current_task().cancelling() or not task.cancelled():
+                raise
+        except Exception as e:
+            warnings.warn(f"Job {job_id} failed outside its handler: {e}")
+            await self.queue.fail(job_id, self.owner, str(e))
+        else:
+            # No-op when the handler already settled the job itself
+            await self.queue.complete(job_id, self.owner)
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job_id, None)
+
+    async def _heartbeat(self, job_id: str, task: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await self.queue.renew(job_id, self.owner, self.lease_seconds):
+                # Cancelled elsewhere or reclaimed after an expired lease: stop working on it
+                task.cancel()
+                return
+
+
+job_executor = JobExecutor()
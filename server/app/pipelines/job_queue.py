@@ -0,0 +1,189 @@
+from ..config.settings import JOB_QUEUE_PATH, JOB_MAX_ATTEMPTS, JOB_RETRY_BACKOFF_SECONDS
+from typing import Dict, Any, Optional
+import sqlite3
+import asyncio
+import time
+import os
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    stage TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_available ON jobs (status, available_at);
+"""
+
+
+class JobQueue:
+    """Durable job queue stored in a local SQLite file.
+
+    Jobs move through queued -> running -> done | failed | cancelled. A running
+    job is leased by one worker until `lease_expires`; if that worker dies the
+    lease runs out and the job is claimed again, resuming from the last stage
+    recorded with `checkpoint`. Failed attempts are re-queued with a linear
+    backoff until `max_attempts` is reached.
+    """
+
+    def __init__(self, path: str = JOB_QUEUE_PATH, max_attempts: int = JOB_MAX_ATTEMPTS, retry_backoff: float = JOB_RETRY_BACKOFF_SECONDS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._initialized = True
+        return conn
+
+    def _run(self, sql: str, params: tuple = ()) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).rowcount
+        finally:
+            conn.close()
+
+    async def enqueue(self, job_id: str) -> None:
+        now = time.time()
+        await asyncio.to_thread(
+            self._run,
+            "INSERT OR IGNORE INTO jobs (job_id, status, max_attempts, available_at, created_at, updated_at) VALUES (?, 'queued', ?, ?, ?, ?)",
+            (job_id, self.max_attempts, now, now, now),
+        )
+
+    def _claim(self, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front so two workers cannot claim the same row
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute(
+                "SELECT job_id FROM jobs WHERE (status = 'queued' AND available_at <= ?) OR (status = 'running' AND lease_expires < ?) "
+                "ORDER BY available_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, lease_expires = ?, updated_at = ? WHERE job_id = ?",
+                (owner, now + lease_seconds, now, row["job_id"]),
+            )
+            job = dict(conn.execute("SELECT * FROM jobs WHERE job_id = ?", (row["job_id"],)).fetchone())
+            conn.execute("COMMIT")
+            return job
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    async def claim(self, owner: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._claim, owner, lease_seconds)
+
+    def _get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease; False means the job is no longer ours (cancelled or reclaimed)."""
+        now = time.time()
+        updated = await asyncio.to_thread(
+            self._run,
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+            (now + lease_seconds, now, job_id, owner),
+        )
+        return updated > 0
+
+    async def checkpoint(self, job_id: str, owner: str, stage: str) -> None:
+        await asyncio.to_thread(
+            self._run,
+            "UPDATE jobs SET stage = ?, updated_at = ? WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+            (stage, time.time(), job_id, owner),
+        )
+
+    async def complete(self, job_id: str, owner: str) -> None:
+        await asyncio.to_thread(
+            self._run,
+            "UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+            (time.time(), job_id, owner),
+        )
+
+    def _fail(self, job_id: str, owner: str, error: str, retry: bool) -> bool:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+                (job_id, owner),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return False
+            now = time.time()
+            retrying = retry and row["attempts"] < row["max_attempts"]
+            if retrying:
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', available_at = ?, lease_owner = NULL, lease_expires = NULL, error = ?, updated_at = ? WHERE job_id = ?",
+                    (now + self.retry_backoff * row["attempts"], error, now, job_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_expires = NULL, error = ?, updated_at = ? WHERE job_id = ?",
+                    (error, now, job_id),
+                )
+            conn.execute("COMMIT")
+            return retrying
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    async def fail(self, job_id: str, owner: str, error: str, retry: bool = True) -> bool:
+        """Record a failed attempt. Returns True when the job was re-queued for another attempt."""
+        return await asyncio.to_thread(self._fail, job_id, owner, error, retry)
+
+    async def release(self, job_id: str, owner: str) -> None:
+        """Hand a running job back to the queue without counting the interrupted attempt."""
+        now = time.time()
+        await asyncio.to_thread(
+            self._run,
+            "UPDATE jobs SET status = 'queued', attempts = attempts - 1, available_at = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE job_id = ? AND status = 'running' AND lease_owner = ?",
+            (now, now, job_id, owner),
+        )
+
+    async def cancel(self, job_id: str) -> bool:
+        updated = await asyncio.to_thread(
+            self._run,
+            "UPDATE jobs SET status = 'cancelled', lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE job_id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id),
+        )
+        return updated > 0
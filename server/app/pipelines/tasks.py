@@ -0,0 +1,140 @@
+"""CPU-bound processing stages executed inside the job executor's worker processes.
+
+Functions here are module-level so they can be pickled into the process pool.
+Each stage reads the previous stage's checkpoint from the job store, writes its
+own and returns only small, picklable results; all database writes stay in the
+API process.
+"""
+from ..services import DataProcessingService
+from ..utils.data_normalizer import DataNormalizer
+from ..repositories.job_store import JobStore
+from ..repositories.job_index import JobIndex, DICTIONARY_COLUMNS
+from ..config.settings import INDEX_SORT_COLUMNS
+from ..analytics import AnalyticsEngine, AggregateCube
+from typing import Dict, Any, Optional
+import pandas as pd
+
+# Stage names in execution order; the job queue records the last one completed
+STAGES = ["normalize", "merge", "classify", "persist", "analytics"]
+
+
+def transcode_upload(kind: str, path: str, file_hash: str) -> None:
+    """Build the columnar cache of a freshly uploaded file; re-uploads of cached content are skipped."""
+    service = DataProcessingService()
+    if not service.upload_cache.has(file_hash, kind):
+        service.transcode(kind, path, file_hash)
+
+
+def normalize_input(job_id: str, kind: str, path: str, file_hash: Optional[str] = None) -> Optional[int]:
+    """Read and normalize one upload ("mother" or "loose"); files are streamed through the normalizer, so reading is part of this stage.
+
+    Returns the normalized row count, or None when an interrupted attempt had already done it.
+    """
+    store = JobStore()
+    # A file normalized by an interrupted attempt is not read again
+    if store.has_stage(job_id, kind):
+        return None
+    service = DataProcessingService()
+    df = service.load_mother(path, file_hash) if kind == "mother" else service.load_loose(path, file_hash)
+    store.write_stage(job_id, kind, df)
+    return len(df)
+
+
+def merge_inputs(job_id: str) -> int:
+    store = JobStore()
+    merged_df = DataNormalizer.merge_data(store.read_stage(job_id, "mother"), store.read_stage(job_id, "loose"))
+    store.write_stage(job_id, "merged", merged_df)
+    return len(merged_df)
+
+
+def merge_delta(job_id: str) -> int:
+    """Append mode: merge only the orders the new Gestora rows refer to."""
+    store = JobStore()
+    mother_df = store.read_stage(job_id, "mother")
+    loose_df = store.read_stage(job_id, "loose")
+    mother_df = mother_df[mother_df["Pedido"].isin(loose_df["pedido_marketplace"])]
+    merged_df = DataNormalizer.merge_data(mother_df, loose_df)
+    store.write_stage(job_id, "merged", merged_df)
+    return len(merged_df)
+
+
+def classify_dataset(job_id: str) -> int:
+    store = JobStore()
+    merged_df = store.read_stage(job_id, "merged")
+    merged_df["sla_calculated"] = DataProcessingService().classify_sla(merged_df)
+    store.write_stage(job_id, "classified", merged_df)
+    return len(merged_df)
+
+
+def classify_append(job_id: str, base_job_id: str) -> int:
+    """Append mode: classify the new rows and upsert them into the base job's rows by (Pedido, pacote).
+
+    Rows of the base job with the same key are replaced, and so are the
+    unmatched (no package yet) rows of every order the new rows touch.
+    """
+    store = JobStore()
+    added = store.read_stage(job_id, "merged")
+    added["sla_calculated"] = DataProcessingService().classify_sla(added)
+
+    # Jobs stored before the normalizer typed its output have text dates and object columns
+    base = DataNormalizer.encode(store.read_data_file(base_job_id))
+    touched = base["Pedido"].isin(added["Pedido"])
+    replaced = touched & (base["pedido_marketplace"].isna() | _upsert_key(base).isin(_upsert_key(added)))
+
+    store.write_stage(job_id, "added", added)
+    store.write_stage(job_id, "removed", base[replaced])
+    classified = DataNormalizer.concat([base[~replaced], added])
+    store.write_stage(job_id, "classified", classified)
+    return len(classified)
+
+
+def _upsert_key(df: pd.DataFrame) -> pd.Series:
+    # Stored rows come back from Arrow, so 123 may read as 123.0; compare integral numbers by their int text
+    def text(value: Any) -> str:
+        return str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+    return df["Pedido"].map(text) + "\x1f" + df["pacote"].map(text)
+
+
+def persist_dataset(job_id: str) -> Dict[str, Any]:
+    """Write the classified rows to the columnar job store, index them and return the data manifest."""
+    store = JobStore()
+    manifest = store.write_data_file(job_id, store.read_stage(job_id, "classified"))
+    # Indexes are built from the stored columns, so they see exactly what readers will
+    indexed = [c for c in dict.fromkeys(DICTIONARY_COLUMNS + INDEX_SORT_COLUMNS) if c in manifest["columns"]]
+    JobIndex(store).build(job_id, store.read_data_file(job_id, indexed))
+    return manifest
+
+
+def build_analytics(job_id: str) -> Dict[str, Any]:
+    """Compute KPIs, rankings and the aggregate cube from the stored dataset."""
+    store = JobStore()
+    merged_df = store.read_data_file(job_id)
+    return {
+        "kpis": AnalyticsEngine.calculate_global_kpis(merged_df),
+        "rankings": AnalyticsEngine.generate_rankings(merged_df),
+        "cube_manifest": store.write_cube_files(job_id, AggregateCube.build(merged_df), AggregateCube.totals(merged_df)),
+    }
+
+
+def update_analytics(job_id: str, base_cube_manifest: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Append mode: update the base job's cube, KPIs and rankings from the removed and added rows only.
+
+    Returns None when the base cube files are gone; the caller then falls back to build_analytics.
+    """
+    store = JobStore()
+    base_cube = store.read_cube_files(base_cube_manifest)
+    if base_cube is None:
+        return None
+    removed = store.read_stage(job_id, "removed")
+    added = store.read_stage(job_id, "added")
+
+    cube = AggregateCube.apply_delta(base_cube, removed, added)
+    totals = AggregateCube.update_totals(
+        base_cube_manifest["totals"], removed, added,
+        lambda: store.read_data_file(job_id, ["sla_calculated", "Atraso"]),
+    )
+    return {
+        "kpis": AnalyticsEngine.kpis_from_counts(totals["total"], totals["on_time"]),
+        "rankings": AnalyticsEngine.rankings_from_counts({dimension: AggregateCube.frame(cube, dimension) for dimension in AnalyticsEngine.ranking_dimensions()}),
+        "cube_manifest": store.write_cube_files(job_id, cube, totals),
+    }
@@ -1,4 +1,10 @@
 from ..repositories.firestore import FirestoreRepository
+from ..repositories.sharded import ShardedRecords
+from ..repositories.job_store import JobStore
+from ..repositories.job_index import JobIndex
+from ..repositories.frame_cache import FrameCache, frame_cache
+from ..repositories.upload_cache import UploadCache, upload_cache
+from ..repositories.latest_job import LatestJobPointer, latest_job
 
 class UploadRepository(FirestoreRepository):
     def __init__(self):
@@ -22,4 +28,4 @@ class RankingsRepository(FirestoreRepository):
 
 class LogsRepository(FirestoreRepository):
     def __init__(self):
-        super().__init__("logs")
\ No newline at end of file
+        super().__init__("logs")
@@ -0,0 +1,40 @@
+from ..config.settings import STORAGE_BACKEND, SQLITE_DB_PATH
+from ..config.firebase import get_db
+from typing import Any, Callable, Optional
+import threading
+
+_sqlite_store: Optional[Any] = None
+_lock = threading.Lock()
+
+
+def get_backend() -> Any:
+    """Document client for the repositories, chosen by STORAGE_BACKEND.
+
+    "firestore" returns the global Firestore client; "sqlite" returns an
+    embedded SQLiteDocumentStore with the same document/query/batch surface,
+    so repositories work unchanged on a single node without credentials.
+    """
+    global _sqlite_store
+    if STORAGE_BACKEND == "sqlite":
+        if _sqlite_store is None:
+            with _lock:
+                if _sqlite_store is None:
+                    from .sqlite_backend import SQLiteDocumentStore
+                    _sqlite_store = SQLiteDocumentStore(SQLITE_DB_PATH)
+        return _sqlite_store
+    if STORAGE_BACKEND != "firestore":
+        raise RuntimeError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}'; use 'firestore' or 'sqlite'")
+    return get_db()
+
+
+def run_transaction(db: Any, fn: Callable[[Any], Any]) -> Any:
+    """Run `fn(transaction)` as a read-write transaction on `db` and return its result.
+
+    `fn` reads with `ref.get(transaction=transaction)` before writing through
+    `transaction.set/update/delete`. Firestore may run it more than once on
+    contention; the SQLite store runs it under its write lock.
+    """
+    if hasattr(db, "run_transaction"):
+        return db.run_transaction(fn)
+    from google.cloud import firestore
+    return firestore.transactional(fn)(db.transaction())
@@ -1,23 +1,35 @@
-from ..config.firebase import get_db
+from .backend import get_backend
+from ..config.settings import FIRESTORE_BATCH_SIZE
 from typing import Dict, Any, List, Optional
 import json
 import asyncio
 import warnings
 
 class FirestoreRepository:
-    def __init__(self, collection: str):
+    def __init__(self, collection: str, db: Any = None):
         self.collection = collection
+        # An explicit client (emulator or in-memory stand-in) wins over the global one
+        self._db = db
 
-    async def create(self, doc_id: str, data: Dict[str, Any]) -> Optional[None]:
+    def _client(self):
+        return self._db or get_backend()
+
+    def _collection(self):
+        return self._client().collection(self.collection)
+
+    async def create(self, doc_id: str, data: Dict[str, Any], strict: bool = False) -> Optional[None]:
+        """Write a document; errors are warned about and skipped unless `strict`, which raises them."""
         try:
-            await asyncio.to_thread(get_db().collection(self.collection).document(doc_id).set, data)
+            await asyncio.to_thread(self._collection().document(doc_id).set, data)
         except Exception as e:
+            if strict:
+                raise
             warnings.warn(f"Firestore error; create('{doc_id}') skipped: {e}")
             return None
 
     async def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
         try:
-            doc = await asyncio.to_thread(get_db().collection(self.collection).document(doc_id).get)
+            doc = await asyncio.to_thread(self._collection().document(doc_id).get)
             return doc.to_dict() if doc.exists else None
         except Exception as e:
             warnings.warn(f"Firestore error; get('{doc_id}') returning None: {e}")
@@ -25,21 +37,21 @@ class FirestoreRepository:
 
     async def update(self, doc_id: str, data: Dict[str, Any]) -> Optional[None]:
         try:
-            await asyncio.to_thread(get_db().collection(self.collection).document(doc_id).update, data)
+            await asyncio.to_thread(self._collection().document(doc_id).update, data)
         except Exception as e:
             warnings.warn(f"Firestore error; update('{doc_id}') skipped: {e}")
             return None
 
     async def delete(self, doc_id: str) -> Optional[None]:
         try:
-            await asyncio.to_thread(get_db().collection(self.collection).document(doc_id).delete)
+            await asyncio.to_thread(self._collection().document(doc_id).delete)
         except Exception as e:
             warnings.warn(f"Firestore error; delete('{doc_id}') skipped: {e}")
             return None
 
     async def list_all(self) -> List[Dict[str, Any]]:
         try:
-            docs = await asyncio.to_thread(lambda: list(get_db().collection(self.collection).stream()))
+            docs = await asyncio.to_thread(lambda: list(self._collection().stream()))
             return [{**doc.to_dict(), "id": doc.id} for doc in docs]
         except Exception as e:
             warnings.warn(f"Firestore error; list_all() returning empty list: {e}")
@@ -47,8 +59,61 @@ class FirestoreRepository:
 
     async def query(self, field: str, op: str, value: Any) -> List[Dict[str, Any]]:
         try:
-            docs = await asyncio.to_thread(lambda: list(get_db().collection(self.collection).where(field, op, value).stream()))
+            docs = await asyncio.to_thread(lambda: list(self._collection().where(field, op, value).stream()))
             return [{**doc.to_dict(), "id": doc.id} for doc in docs]
         except Exception as e:
             warnings.warn(f"Firestore error; query() returning empty list: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    async def latest(self, field: str) -> Optional[Dict[str, Any]]:
+        """Return the document with the highest `field` (one indexed read); documents without the field are ignored."""
+        try:
+            docs = await asyncio.to_thread(lambda: list(self._collection().order_by(field, direction="DESCENDING").limit(1).stream()))
+            return {**docs[0].to_dict(), "id": docs[0].id} if docs else None
+        except Exception as e:
+            warnings.warn(f"Firestore error; latest('{field}') returning None: {e}")
+            return None
+
+    async def create_many(self, docs: Dict[str, Dict[str, Any]]) -> Optional[None]:
+        """Write many documents with batched writes (FIRESTORE_BATCH_SIZE per commit)."""
+        def write():
+            db = self._client()
+            items = list(docs.items())
+            for start in range(0, len(items), FIRESTORE_BATCH_SIZE):
+                batch = db.batch()
+                for doc_id, data in items[start:start + FIRESTORE_BATCH_SIZE]:
+                    batch.set(self._collection().document(doc_id), data)
+                batch.commit()
+        try:
+            await asyncio.to_thread(write)
+        except Exception as e:
+            warnings.warn(f"Firestore error; create_many({len(docs)} docs) skipped: {e}")
+            return None
+
+    async def get_many(self, doc_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Fetch many documents in one get_all round trip; results follow `doc_ids`, None for missing ones."""
+        def read():
+            db = self._client()
+            refs = [self._collection().document(doc_id) for doc_id in doc_ids]
+            # get_all does not preserve the request order
+            found = {doc.id: doc.to_dict() for doc in db.get_all(refs) if doc.exists}
+            return [found.get(doc_id) for doc_id in doc_ids]
+        try:
+            return await asyncio.to_thread(read)
+        except Exception as e:
+            warnings.warn(f"Firestore error; get_many({len(doc_ids)} docs) returning None: {e}")
+            return [None] * len(doc_ids)
+
+    async def delete_many(self, doc_ids: List[str]) -> Optional[None]:
+        def delete():
+            db = self._client()
+            for start in range(0, len(doc_ids), FIRESTORE_BATCH_SIZE):
+                batch = db.batch()
+                for doc_id in doc_ids[start:start + FIRESTORE_BATCH_SIZE]:
+                    batch.delete(self._collection().document(doc_id))
+                batch.commit()
+        try:
+            await asyncio.to_thread(delete)
+        except Exception as e:
+            warnings.warn(f"Firestore error; delete_many({len(doc_ids)} docs) skipped: {e}")
+            return None
@@ -0,0 +1,68 @@
+from ..config.settings import FRAME_CACHE_MAX_BYTES
+from collections import OrderedDict
+from typing import List, Optional
+import pandas as pd
+import threading
+
+
+class CachedFrame:
+    __slots__ = ("frame", "columns", "path", "nbytes")
+
+    def __init__(self, frame: pd.DataFrame, columns: List[str], path: Optional[str]):
+        self.frame = frame
+        self.columns = columns  # full column list of the stored job, loaded or not
+        self.path = path
+        self.nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+
+
+class FrameCache:
+    """Process-wide LRU cache of job DataFrames bounded by a byte budget.
+
+    Completed jobs are immutable, so entries never go stale; they only leave
+    the cache through LRU eviction or an explicit invalidate().
+    """
+
+    def __init__(self, max_bytes: int = FRAME_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedFrame]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, job_id: str) -> Optional[CachedFrame]:
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is not None:
+                self._entries.move_to_end(job_id)
+            return entry
+
+    def put(self, job_id: str, frame: pd.DataFrame, columns: List[str], path: Optional[str] = None) -> None:
+        entry = CachedFrame(frame, columns, path)
+        with self._lock:
+            self._discard(job_id)
+            if entry.nbytes > self.max_bytes:
+                return
+            self._entries[job_id] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, job_id: Optional[str] = None) -> None:
+        """Drop one job, or every cached job when job_id is None."""
+        with self._lock:
+            if job_id is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                self._discard(job_id)
+
+    def _discard(self, job_id: str) -> None:
+        entry = self._entries.pop(job_id, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+
+frame_cache = FrameCache()
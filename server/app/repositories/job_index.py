@@ -0,0 +1,197 @@
+from ..config.settings import INDEX_SORT_COLUMNS
+from .job_store import JobStore
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import pyarrow as pa
+import pandas as pd
+import numpy as np
+import json
+import re
+import os
+
+# Columns the consolidated view filters on; each gets a dictionary with posting lists
+DICTIONARY_COLUMNS = ["Vendedor", "Zona"]
+
+
+class JobIndex:
+    """Per-job indexes that answer filtered, sorted pages without scanning the dataset.
+
+    Files live next to the job data in ``JOB_STORE_DIR/<job_id>/index/``:
+
+    - ``dict_<column>.arrow``: the distinct text values of a column, each with
+      the sorted row ids holding it (a posting list). A filter is matched
+      against the distinct values only and the matching lists are merged.
+    - ``sort_<column>.arrow``: the stable sort permutation of a column (nulls
+      last) and its inverse, the rank of every row in that order.
+    - ``meta.json``: the row count.
+
+    Jobs never change after they are persisted, so indexes never go stale.
+    Files are memory-mapped, so opening one does not read the job data.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None):
+        self.store = store or JobStore()
+
+    def index_dir(self, job_id: str) -> str:
+        return os.path.join(self.store.job_dir(job_id), "index")
+
+    def _path(self, job_id: str, kind: str, column: str) -> str:
+        filename = re.sub(r"\W+", "_", column)
+        return os.path.join(self.index_dir(job_id), f"{kind}_{filename}.arrow")
+
+    def has(self, job_id: str, kind: str, column: str) -> bool:
+        return os.path.exists(self._path(job_id, kind, column))
+
+    def has_meta(self, job_id: str) -> bool:
+        return os.path.exists(os.path.join(self.index_dir(job_id), "meta.json"))
+
+    def build(self, job_id: str, df: pd.DataFrame, sort_columns: List[str] = INDEX_SORT_COLUMNS) -> None:
+        """Write the meta file, every dictionary and the permutations of `sort_columns` present in `df`."""
+        self.write_meta(job_id, len(df))
+        for column in DICTIONARY_COLUMNS:
+            if column in df.columns:
+                self.write_dictionary(job_id, column, df[column])
+        for column in sort_columns:
+            if column in df.columns:
+                self.write_sort(job_id, column, df[column])
+
+    async def ensure(self, job_id: str, dictionary_columns: List[str], sort_by: Optional[str] = None) -> Optional[List[str]]:
+        """Build whatever indexes a request needs and the job lacks (jobs persisted before indexing, or unusual sort columns).
+
+        Returns the job's columns, or None when the job data is unavailable.
+        """
+        columns = await self.store.columns(job_id)
+        if columns is None:
+            return None
+
+        missing_dicts = [c for c in dictionary_columns if c in columns and not self.has(job_id, "dict", c)]
+        missing_sort = sort_by if sort_by in columns and not self.has(job_id, "sort", sort_by) else None
+        if self.has_meta(job_id) and not missing_dicts and not missing_sort:
+            return columns
+
+        needed = list(dict.fromkeys([*missing_dicts, *([missing_sort] if missing_sort else []), columns[0]]))
+        data = await self.store.load(job_id, needed)
+        if data is None:
+            return None
+
+        def build():
+            self.write_meta(job_id, len(data))
+            for column in missing_dicts:
+                self.write_dictionary(job_id, column, data[column])
+            if missing_sort:
+                self.write_sort(job_id, missing_sort, data[missing_sort])
+        await asyncio.to_thread(build)
+        return columns
+
+    def write_meta(self, job_id: str, rows: int) -> None:
+        path = os.path.join(self.index_dir(job_id), "meta.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump({"rows": int(rows)}, f)
+        os.replace(tmp_path, path)
+
+    def write_dictionary(self, job_id: str, column: str, values: pd.Series) -> None:
+        values = values.astype(object) if isinstance(values.dtype, pd.CategoricalDtype) else values
+        # Only text can match a text filter; anything else gets no posting list
+        text = values.where(values.map(lambda v: isinstance(v, str)))
+        codes, uniques = pd.factorize(text, use_na_sentinel=True)
+        order = np.argsort(codes, kind="stable")
+        order = order[codes[order] >= 0]
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+        rows = pa.ListArray.from_arrays(pa.array(offsets), pa.array(order.astype(np.int32)))
+        self._write(self._path(job_id, "dict", column), pa.table({"value": pa.array(list(uniques), pa.string()), "rows": rows}))
+
+    def write_sort(self, job_id: str, column: str, values: pd.Series) -> None:
+        values = values.reset_index(drop=True)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Categoricals sort by category order; rows are ordered by value
+            values = values.astype(object)
+        try:
+            ordered = values.sort_values(kind="stable", na_position="last")
+        except TypeError:
+            # Mixed types do not compare; order them by their text instead
+            ordered = values.where(values.isna(), values.astype(str)).sort_values(kind="stable", na_position="last")
+        perm = ordered.index.to_numpy(dtype=np.int32)
+        rank = np.empty_like(perm)
+        rank[perm] = np.arange(len(perm), dtype=np.int32)
+        self._write(self._path(job_id, "sort", column), pa.table({"perm": perm, "rank": rank}))
+
+    def row_count(self, job_id: str) -> int:
+        with open(os.path.join(self.index_dir(job_id), "meta.json")) as f:
+            return json.load(f)["rows"]
+
+    def match(self, job_id: str, column: str, pattern: str) -> np.ndarray:
+        """Sorted row ids whose value contains `pattern` (case-insensitive regex, like str.contains)."""
+        table = self._read(self._path(job_id, "dict", column))
+        matched = np.flatnonzero(table.column("value").to_pandas().str.contains(pattern, case=False, na=False).to_numpy(dtype=bool))
+        postings = table.column("rows").combine_chunks()
+        offsets = postings.offsets.to_numpy()
+        rows = postings.values.to_numpy()
+        if len(matched) == 1:
+            return rows[offsets[matched[0]]:offsets[matched[0] + 1]]
+        return np.sort(np.concatenate([rows[offsets[code]:offsets[code + 1]] for code in matched] or [np.empty(0, np.int32)]))
+
+    def permutation(self, job_id: str, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        table = self._read(self._path(job_id, "sort", column))
+        return table.column("perm").to_numpy(), table.column("rank").to_numpy()
+
+    def page(
+        self,
+        job_id: str,
+        filters: Dict[str, str],
+        sort_by: Optional[str],
+        limit: int,
+        offset: int = 0,
+        after: Optional[int] = None,
+    ) -> Tuple[np.ndarray, int, Optional[int]]:
+        """Row ids of one page, the filtered total and the cursor of the next page (None on the last page).
+
+        Rows are addressed by their position in the requested order (their rank
+        when sorted, their row id otherwise); `after` is the position of the last
+        row of the previous page and takes precedence over `offset`.
+        """
+        matches = self._matches(job_id, filters)
+        perm, rank = self.permutation(job_id, sort_by) if sort_by else (None, None)
+        if matches is None:
+            total = self.row_count(job_id)
+            start = after + 1 if after is not None else offset
+            positions = np.arange(min(start, total), min(start + limit, total))
+        else:
+            keys = np.sort(rank[matches]) if rank is not None else matches
+            total = len(keys)
+            start = int(np.searchsorted(keys, after, side="right")) if after is not None else offset
+            positions = keys[start:start + limit]
+
+        rows = perm[positions] if perm is not None else positions
+        has_more = start + limit < total
+        return rows, total, int(positions[-1]) if has_more and len(positions) else None
+
+    def select(self, job_id: str, filters: Dict[str, str], sort_by: Optional[str]) -> Optional[np.ndarray]:
+        """Every row id matching `filters`, in `sort_by` order; None when that is simply all rows in stored order."""
+        matches = self._matches(job_id, filters)
+        if not sort_by:
+            return matches
+        perm, rank = self.permutation(job_id, sort_by)
+        return perm if matches is None else perm[np.sort(rank[matches])]
+
+    def _matches(self, job_id: str, filters: Dict[str, str]) -> Optional[np.ndarray]:
+        matches: Optional[np.ndarray] = None
+        for column, pattern in filters.items():
+            rows = self.match(job_id, column, pattern)
+            matches = rows if matches is None else np.intersect1d(matches, rows, assume_unique=True)
+        return matches
+
+    @staticmethod
+    def _write(path: str, table: pa.Table) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path: str) -> pa.Table:
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
@@ -0,0 +1,259 @@
+from ..config.settings import JOB_STORE_DIR
+from .firestore import FirestoreRepository
+from .frame_cache import FrameCache, frame_cache
+from .sharded import ShardedRecords
+from typing import Dict, Any, Iterator, List, Optional
+from datetime import datetime
+import pyarrow as pa
+import pandas as pd
+import numpy as np
+import asyncio
+import shutil
+import os
+import re
+
+# Inferred object dtypes that pyarrow can convert as-is; anything else is stored as text
+_ARROW_SAFE_KINDS = {"string", "empty", "integer", "floating", "boolean", "datetime", "datetime64", "date", "bytes"}
+
+
+class JobStore:
+    """Columnar storage for merged job datasets.
+
+    Each job is written once as an uncompressed Arrow IPC file under
+    ``JOB_STORE_DIR/<job_id>/data.arrow`` and described by a small manifest
+    document (``<job_id>_data``) in the data collection. Reads are memory-mapped
+    and only materialize the requested columns; materialized columns are kept
+    in the shared frame cache so later requests for the same job skip the read.
+    """
+
+    def __init__(
+        self,
+        base_dir: str = JOB_STORE_DIR,
+        manifest_repo: Optional[FirestoreRepository] = None,
+        cache: Optional[FrameCache] = None,
+    ):
+        self.base_dir = base_dir
+        self.manifests = manifest_repo or FirestoreRepository("data")
+        self.cache = cache or frame_cache
+
+    def job_dir(self, job_id: str) -> str:
+        return os.path.join(self.base_dir, job_id)
+
+    def data_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir(job_id), "data.arrow")
+
+    def stage_path(self, job_id: str, stage: str) -> str:
+        return os.path.join(self.job_dir(job_id), "stages", f"{stage}.pkl")
+
+    def write_stage(self, job_id: str, stage: str, df: pd.DataFrame) -> None:
+        """Checkpoint an intermediate frame. Pickle keeps mixed object columns exactly as they are."""
+        path = self.stage_path(job_id, stage)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+    def read_stage(self, job_id: str, stage: str) -> pd.DataFrame:
+        return pd.read_pickle(self.stage_path(job_id, stage))
+
+    def has_stage(self, job_id: str, stage: str) -> bool:
+        return os.path.exists(self.stage_path(job_id, stage))
+
+    def clear_stages(self, job_id: str) -> None:
+        shutil.rmtree(os.path.join(self.job_dir(job_id), "stages"), ignore_errors=True)
+
+    def write_data_file(self, job_id: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """Write the job dataset and return its manifest (no database access, safe in worker processes)."""
+        path = self.data_path(job_id)
+        self._write_table(path, df)
+        return {
+            "format": "arrow",
+            "path": path,
+            "columns": [str(c) for c in df.columns],
+            "rows": int(len(df)),
+            "createdAt": datetime.utcnow().isoformat(),
+        }
+
+    def read_data_file(self, job_id: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return self._read_table(self.data_path(job_id), columns)
+
+    async def save_manifest(self, job_id: str, manifest: Dict[str, Any]) -> None:
+        await self.manifests.create(f"{job_id}_data", manifest)
+
+    async def write(self, job_id: str, df: pd.DataFrame) -> Dict[str, Any]:
+        manifest = await asyncio.to_thread(self.write_data_file, job_id, df)
+        await self.save_manifest(job_id, manifest)
+        return manifest
+
+    async def load(self, job_id: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        entry = self.cache.get(job_id)
+        if entry is not None:
+            frame, schema, path = entry.frame, entry.columns, entry.path
+        else:
+            manifest = await self.manifests.get(f"{job_id}_data")
+            if not manifest:
+                return None
+
+            # Jobs processed before the columnar store kept every record in Firestore, inline or sharded
+            if "data" in manifest or manifest.get("sharded"):
+                records = manifest["data"] if "data" in manifest else await ShardedRecords(self.manifests).read_shards(f"{job_id}_data", manifest["shards"], manifest.get("generation"))
+                if records is None:
+                    return None
+                frame = pd.DataFrame(records)
+                self.cache.put(job_id, frame, list(frame.columns))
+                return self._project(frame, columns)
+
+            path = manifest.get("path") or self.data_path(job_id)
+            if not os.path.exists(path):
+                return None
+            frame = pd.DataFrame()
+            schema = manifest.get("columns") or await asyncio.to_thread(self._read_schema, path)
+
+        wanted = schema if columns is None else [c for c in columns if c in schema]
+        missing = [c for c in wanted if c not in frame.columns]
+        if missing:
+            loaded = await asyncio.to_thread(self._read_table, path, missing)
+            frame = pd.concat([frame, loaded], axis=1) if len(frame.columns) else loaded
+            self.cache.put(job_id, frame, schema, path)
+        return self._project(frame, wanted)
+
+    async def columns(self, job_id: str) -> Optional[List[str]]:
+        """Column names of a job's dataset without loading it; None when the job has no data."""
+        entry = self.cache.get(job_id)
+        if entry is not None:
+            return entry.columns
+        manifest = await self.manifests.get(f"{job_id}_data")
+        if not manifest:
+            return None
+        if "data" in manifest or manifest.get("sharded"):
+            df = await self.load(job_id)
+            return None if df is None else list(df.columns)
+        path = manifest.get("path") or self.data_path(job_id)
+        if not os.path.exists(path):
+            return None
+        return manifest.get("columns") or await asyncio.to_thread(self._read_schema, path)
+
+    async def read_rows(self, job_id: str, rows: np.ndarray, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Materialize only the given row positions, in that order."""
+        entry = self.cache.get(job_id)
+        wanted = columns if columns is not None else (entry.columns if entry is not None else None)
+        if entry is not None and all(c in entry.frame.columns for c in wanted):
+            return self._project(entry.frame, wanted).take(rows).reset_index(drop=True)
+        path = self.data_path(job_id)
+        if not os.path.exists(path):
+            # Legacy jobs stored in Firestore: no file to take from
+            df = await self.load(job_id, columns)
+            return None if df is None else df.take(rows).reset_index(drop=True)
+        return await asyncio.to_thread(self._take_rows, path, rows, columns)
+
+    @staticmethod
+    def _project(frame: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+        # Callers get their own frame so filtering or adding columns never touches the cache
+        if columns is None or list(frame.columns) == list(columns):
+            return frame.copy(deep=False)
+        return frame[[c for c in columns if c in frame.columns]]
+
+    def write_cube_files(self, job_id: str, cube: Dict[str, pd.DataFrame], totals: Dict[str, Any]) -> Dict[str, Any]:
+        """Write each cube grouping next to the job data and return the cube manifest."""
+        groupings = {}
+        for name, table in cube.items():
+            filename = re.sub(r"\W+", "_", name) + ".arrow"
+            path = os.path.join(self.job_dir(job_id), "cube", filename)
+            self._write_table(path, table)
+            groupings[name] = {"path": path, "rows": int(len(table))}
+        return {
+            "format": "arrow",
+            "groupings": groupings,
+            "totals": totals,
+            "createdAt": datetime.utcnow().isoformat(),
+        }
+
+    async def write_cube(self, job_id: str, cube: Dict[str, pd.DataFrame], totals: Dict[str, Any]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.write_cube_files, job_id, cube, totals)
+
+    def read_cube_files(self, manifest: Dict[str, Any]) -> Optional[Dict[str, pd.DataFrame]]:
+        """Read every grouping of a cube manifest; None when any file is missing."""
+        cube = {}
+        for name, grouping in manifest.get("groupings", {}).items():
+            if not os.path.exists(grouping["path"]):
+                return None
+            cube[name] = self._read_table(grouping["path"])
+        return cube
+
+    async def load_cube(self, manifest: Dict[str, Any], names: List[str]) -> Optional[Dict[str, pd.DataFrame]]:
+        cube = {}
+        groupings = manifest.get("groupings", {})
+        for name in names:
+            # Groupings over columns the job does not have are simply absent
+            if name not in groupings:
+                continue
+            path = groupings[name]["path"]
+            if not os.path.exists(path):
+                return None
+            cube[name] = await asyncio.to_thread(self._read_table, path)
+        return cube
+
+    def iter_tables(
+        self,
+        job_id: str,
+        rows: Optional[np.ndarray] = None,
+        chunk_rows: int = 50000,
+        frame: Optional[pd.DataFrame] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[pa.Table]:
+        """Yield a job's dataset (or the given row positions, in order) as Arrow tables of at most `chunk_rows` rows.
+
+        Reads are memory-mapped, so only the chunk being consumed is resident.
+        Pass `frame` for legacy jobs without a data file (see `load`).
+        """
+        table = self._to_arrow(frame) if frame is not None else pa.ipc.open_file(pa.memory_map(self.data_path(job_id), "r")).read_all()
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        total = table.num_rows if rows is None else len(rows)
+        for start in range(0, total, chunk_rows):
+            if rows is None:
+                yield table.slice(start, chunk_rows)
+            else:
+                yield table.take(pa.array(rows[start:start + chunk_rows]))
+
+    @staticmethod
+    def _to_arrow(df: pd.DataFrame) -> pa.Table:
+        df = df.copy(deep=False)
+        for col in df.columns:
+            # Arrow dictionaries need one value type; other categoricals are stored like object columns
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and pd.api.types.infer_dtype(df[col].cat.categories) not in _ARROW_SAFE_KINDS:
+                df[col] = df[col].astype(object)
+        for col in df.columns[df.dtypes == object]:
+            if pd.api.types.infer_dtype(df[col], skipna=True) not in _ARROW_SAFE_KINDS:
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    @staticmethod
+    def _write_table(path: str, df: pd.DataFrame) -> None:
+        table = JobStore._to_arrow(df)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_schema(path: str) -> List[str]:
+        return pa.ipc.open_file(pa.memory_map(path, "r")).schema.names
+
+    @staticmethod
+    def _take_rows(path: str, rows: np.ndarray, columns: Optional[List[str]]) -> pd.DataFrame:
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        return table.take(pa.array(rows)).to_pandas()
+
+    @staticmethod
+    def _read_table(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        # The mapped file stays open for as long as the table buffers reference it
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        return table.to_pandas()
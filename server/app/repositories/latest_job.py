@@ -0,0 +1,101 @@
+from ..config.settings import LATEST_JOB_TTL_SECONDS
+from .firestore import FirestoreRepository
+from .backend import run_transaction
+from typing import Dict, Any, Optional
+from datetime import datetime
+import asyncio
+import warnings
+import time
+
+POINTER_ID = "latest_completed"
+
+
+class LatestJobPointer(FirestoreRepository):
+    """Pointer to the latest completed job, so readers do not scan the processes collection.
+
+    `system/latest_completed` holds {"job_id", "previous_job_id", "lastUpdated"}.
+    `publish` completes a job and moves the pointer in one transaction, and only
+    when the job is newer than the job the pointer names, so two jobs finishing
+    at once cannot move it backwards or record the wrong previous job. Reads
+    are cached per process for `ttl` seconds, including "no completed job";
+    publishing refreshes the cache.
+    """
+
+    def __init__(self, ttl: float = LATEST_JOB_TTL_SECONDS, db: Any = None):
+        super().__init__("system", db)
+        self.ttl = ttl
+        self._cached: Optional[Dict[str, Any]] = None
+        self._expires = 0.0
+
+    async def current(self) -> Optional[Dict[str, Any]]:
+        if time.monotonic() < self._expires:
+            return self._cached
+        pointer = await self.get(POINTER_ID)
+        if pointer is None:
+            pointer = await self._backfill()
+        self._remember(pointer)
+        return pointer
+
+    async def publish(self, job_id: str, updates: Dict[str, Any]) -> Optional[None]:
+        """Apply `updates` to process `job_id` and, unless a newer job is already published, make it the latest completed job."""
+        now = datetime.utcnow().isoformat()
+        # Creates the pointer from the job history first, if it has never been written
+        await self.current()
+
+        def write(transaction) -> Dict[str, Any]:
+            db = self._client()
+            pointer_ref = self._collection().document(POINTER_ID)
+            snapshot = pointer_ref.get(transaction=transaction)
+            previous = snapshot.to_dict() if snapshot.exists else None
+            transaction.update(db.collection("processes").document(job_id), {**updates, "lastUpdated": now})
+            if previous and (previous.get("lastUpdated") or "") >= now:
+                return previous
+            if previous and previous.get("job_id") == job_id:
+                previous_job_id = previous.get("previous_job_id")
+            else:
+                previous_job_id = previous.get("job_id") if previous else None
+            pointer = {"job_id": job_id, "previous_job_id": previous_job_id, "lastUpdated": now}
+            transaction.set(pointer_ref, pointer)
+            return pointer
+        try:
+            pointer = await asyncio.to_thread(run_transaction, self._client(), write)
+        except Exception as e:
+            warnings.warn(f"Firestore error; publish('{job_id}') skipped: {e}")
+            return None
+        self._remember(pointer)
+
+    def invalidate(self) -> None:
+        self._expires = 0.0
+
+    def _remember(self, pointer: Optional[Dict[str, Any]]) -> None:
+        self._cached = pointer
+        self._expires = time.monotonic() + self.ttl
+
+    async def _backfill(self) -> Optional[Dict[str, Any]]:
+        # Job history from before the pointer existed: scan and store the pointer (the caller caches a miss)
+        processes = await FirestoreRepository("processes", self._db).list_all()
+        completed = sorted((p for p in processes if p.get("status") == "completed"), key=lambda p: p.get("lastUpdated") or "")
+        if not completed:
+            return None
+        pointer = {
+            "job_id": completed[-1]["id"],
+            "previous_job_id": completed[-2]["id"] if len(completed) > 1 else None,
+            "lastUpdated": completed[-1].get("lastUpdated"),
+        }
+
+        def create(transaction) -> Dict[str, Any]:
+            # A job published meanwhile wins over the scan
+            ref = self._collection().document(POINTER_ID)
+            snapshot = ref.get(transaction=transaction)
+            if snapshot.exists:
+                return snapshot.to_dict()
+            transaction.set(ref, pointer)
+            return pointer
+        try:
+            return await asyncio.to_thread(run_transaction, self._client(), create)
+        except Exception as e:
+            warnings.warn(f"Firestore error; latest job pointer not stored: {e}")
+            return pointer
+
+
+latest_job = LatestJobPointer()
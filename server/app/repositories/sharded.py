@@ -0,0 +1,108 @@
+from ..config.settings import SHARD_SIZE, SHARD_CONCURRENCY
+from .firestore import FirestoreRepository
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import asyncio
+import uuid
+
+
+class ShardedRecords:
+    """Stores a record list too large for one Firestore document (1 MiB limit) as fixed-size shards.
+
+    `<doc_id>` holds a small head document ({"sharded": True, "shards",
+    "generation", "count", ...}) and the records live in shard documents of at
+    most `shard_size` records each. Shards are written and read in parallel, at
+    most `max_concurrency` requests at a time.
+
+    Every write puts its shards under a new generation and switches the head
+    to it only once they are all stored; the previous generation's shards are
+    deleted after that. Shard and head writes raise on failure, leaving the
+    previous list in place. A reader therefore gets either the old list or the
+    new one, and read() retries once when the shards it was reading were replaced.
+    """
+
+    def __init__(self, repo: FirestoreRepository, shard_size: int = SHARD_SIZE, max_concurrency: int = SHARD_CONCURRENCY):
+        self.repo = repo
+        self.shard_size = shard_size
+        self.max_concurrency = max_concurrency
+
+    @staticmethod
+    def shard_id(doc_id: str, index: int, generation: Optional[str] = None) -> str:
+        # No generation: the ids of lists written before generations existed
+        if not generation:
+            return f"{doc_id}__shard_{index}"
+        return f"{doc_id}__g{generation}__shard_{index}"
+
+    async def write(self, doc_id: str, records: List[Dict[str, Any]], **fields: Any) -> Dict[str, Any]:
+        """Write `records` in shards; extra `fields` are stored on the head document.
+
+        Raises if a shard or the head cannot be written; the previous list then stays readable.
+        """
+        shards = [records[start:start + self.shard_size] for start in range(0, len(records), self.shard_size)]
+        previous = await self.repo.get(doc_id)
+        previous = previous if previous and previous.get("sharded") else None
+        # Unique, so a failed read of the previous head can never make two writes share shard ids
+        generation = uuid.uuid4().hex[:12]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def write_shard(index: int, chunk: List[Dict[str, Any]]) -> None:
+            async with semaphore:
+                await self.repo.create(self.shard_id(doc_id, index, generation), {"index": index, "records": chunk}, strict=True)
+
+        head = {
+            **fields, "sharded": True, "shards": len(shards), "generation": generation, "count": len(records),
+            "shardSize": self.shard_size, "updatedAt": datetime.utcnow().isoformat(),
+        }
+        try:
+            # Let every shard write settle before cleaning up, so none lands after the cleanup
+            results = await asyncio.gather(*(write_shard(index, chunk) for index, chunk in enumerate(shards)), return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                raise errors[0]
+            await self.repo.create(doc_id, head, strict=True)
+        except Exception:
+            current = await self.repo.get(doc_id)
+            if not current or current.get("generation") != generation:
+                # The head still points at the previous generation; drop what was written of this one
+                await self.repo.delete_many(self._shard_ids(doc_id, head))
+            raise
+        if previous:
+            await self.repo.delete_many(self._shard_ids(doc_id, previous))
+        return head
+
+    async def read(self, doc_id: str) -> Optional[List[Dict[str, Any]]]:
+        head = await self.repo.get(doc_id)
+        if not head or not head.get("sharded"):
+            return None
+        records = await self.read_shards(doc_id, head["shards"], head.get("generation"))
+        if records is None:
+            # A shard is gone: the list may have been rewritten, and its old shards deleted, while we read
+            current = await self.repo.get(doc_id)
+            if current and current.get("sharded") and current.get("generation") != head.get("generation"):
+                records = await self.read_shards(doc_id, current["shards"], current.get("generation"))
+        return records
+
+    async def read_shards(self, doc_id: str, shards: int, generation: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        ids = [self.shard_id(doc_id, index, generation) for index in range(shards)]
+        # Each request fetches a group of shards with get_all; groups run concurrently
+        group_size = max(1, -(-len(ids) // self.max_concurrency))
+        groups = [ids[start:start + group_size] for start in range(0, len(ids), group_size)]
+        results = await asyncio.gather(*(self.repo.get_many(group) for group in groups))
+
+        records: List[Dict[str, Any]] = []
+        for docs in results:
+            for doc in docs:
+                if doc is None:
+                    return None
+                records.extend(doc["records"])
+        return records
+
+    async def delete(self, doc_id: str) -> None:
+        head = await self.repo.get(doc_id)
+        # Head first, so readers stop resolving to shards that are about to go
+        await self.repo.delete(doc_id)
+        if head and head.get("sharded"):
+            await self.repo.delete_many(self._shard_ids(doc_id, head))
+
+    def _shard_ids(self, doc_id: str, head: Dict[str, Any]) -> List[str]:
+        return [self.shard_id(doc_id, index, head.get("generation")) for index in range(head["shards"])]
@@ -0,0 +1,287 @@
+from ..config.settings import SQLITE_DB_PATH
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import date, datetime
+import threading
+import sqlite3
+import json
+import copy
+import math
+import re
+import os
+
+# Document fields with an expression index; queries on them do not scan the collection
+INDEXED_FIELDS = ["type", "status", "job_id", "lastUpdated"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+);
+"""
+
+_OPERATORS = {"==": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+_FIELD_PATTERN = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+
+
+def _encode(data: Dict[str, Any]) -> str:
+    # JSON has no NaN/Infinity (json_extract rejects them as malformed), so non-finite floats are stored as null
+    return json.dumps(_json_ready(data), ensure_ascii=False, allow_nan=False)
+
+
+def _json_ready(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _json_ready(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_ready(item) for item in value]
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _apply_update(current: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply update() fields to a document in place; dotted keys address nested fields, as in Firestore."""
+    for key, value in data.items():
+        target = current
+        *parents, leaf = key.split(".")
+        for part in parents:
+            target = target.setdefault(part, {})
+        target[leaf] = copy.deepcopy(value)
+    return current
+
+
+def _field_expr(field: str) -> str:
+    # Field paths are inlined (not bound) so the expression matches the indexes
+    if not _FIELD_PATTERN.match(field):
+        raise ValueError(f"Unsupported field path: {field}")
+    return f"json_extract(data, '$.{field}')"
+
+
+class SQLiteDocumentStore:
+    """Embedded document store exposing the subset of the Firestore client the repositories use.
+
+    Documents are JSON rows keyed by (collection, id) in a single SQLite file in
+    WAL mode, with expression indexes on INDEXED_FIELDS. Each thread keeps its
+    own connection, which suits the asyncio.to_thread calls of the repositories.
+    Datetimes are stored as ISO strings and come back as strings.
+    """
+
+    def __init__(self, path: str = SQLITE_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._init_lock:
+                if not self._initialized:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(_SCHEMA)
+                    for field in INDEXED_FIELDS:
+                        conn.execute(f"CREATE INDEX IF NOT EXISTS documents_{field} ON documents (collection, {_field_expr(field)})")
+                    self._initialized = True
+            self._local.conn = conn
+        return conn
+
+    def collection(self, name: str) -> "SQLiteCollection":
+        return SQLiteCollection(self, name)
+
+    def batch(self) -> "SQLiteBatch":
+        return SQLiteBatch(self)
+
+    def run_transaction(self, fn: Callable[["SQLiteBatch"], Any]) -> Any:
+        """Run `fn(transaction)` atomically, like a Firestore transaction: reads (`ref.get(transaction=...)`) and the
+        writes buffered on `transaction` happen under one write lock, so no other writer interleaves."""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            transaction = SQLiteBatch(self)
+            result = fn(transaction)
+            transaction._apply()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def get_all(self, refs: Iterable["SQLiteDocument"]) -> Iterator["SQLiteSnapshot"]:
+        refs = list(refs)
+        by_collection: Dict[str, List[str]] = {}
+        for ref in refs:
+            by_collection.setdefault(ref.collection, []).append(ref.id)
+        found: Dict[Tuple[str, str], str] = {}
+        for collection, ids in by_collection.items():
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = self.connection().execute(
+                    f"SELECT id, data FROM documents WHERE collection = ? AND id IN ({','.join('?' * len(chunk))})",
+                    (collection, *chunk),
+                )
+                found.update({(collection, row[0]): row[1] for row in rows})
+        for ref in refs:
+            yield SQLiteSnapshot(ref.id, found.get((ref.collection, ref.id)))
+
+
+class SQLiteSnapshot:
+    def __init__(self, doc_id: str, raw: Optional[str]):
+        self.id = doc_id
+        self._raw = raw
+        self.exists = raw is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return json.loads(self._raw) if self._raw is not None else None
+
+
+class SQLiteDocument:
+    def __init__(self, store: SQLiteDocumentStore, collection: str, doc_id: str):
+        self.store = store
+        self.collection = collection
+        self.id = doc_id
+
+    def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        if merge:
+            current = self.get().to_dict() or {}
+            data = {**current, **data}
+        self.store.connection().execute(
+            "INSERT INTO documents (collection, id, data) VALUES (?, ?, ?) ON CONFLICT (collection, id) DO UPDATE SET data = excluded.data",
+            (self.collection, self.id, _encode(data)),
+        )
+
+    def get(self, transaction: Optional["SQLiteBatch"] = None) -> SQLiteSnapshot:
+        # Inside run_transaction the read already happens under its lock
+        row = self.store.connection().execute(
+            "SELECT data FROM documents WHERE collection = ? AND id = ?", (self.collection, self.id)
+        ).fetchone()
+        return SQLiteSnapshot(self.id, row[0] if row else None)
+
+    def update(self, data: Dict[str, Any]) -> None:
+        conn = self.store.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM documents WHERE collection = ? AND id = ?", (self.collection, self.id)).fetchone()
+            if row is None:
+                # Same contract as Firestore: update() needs an existing document
+                raise KeyError(f"No document to update: {self.collection}/{self.id}")
+            current = _apply_update(json.loads(row[0]), data)
+            conn.execute("UPDATE documents SET data = ? WHERE collection = ? AND id = ?", (_encode(current), self.collection, self.id))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self) -> None:
+        self.store.connection().execute("DELETE FROM documents WHERE collection = ? AND id = ?", (self.collection, self.id))
+
+
+class SQLiteQuery:
+    def __init__(self, store: SQLiteDocumentStore, collection: str, filters=(), order=None, limit: Optional[int] = None):
+        self.store = store
+        self.collection = collection
+        self.filters = list(filters)
+        self.order = order
+        self._limit = limit
+
+    def where(self, field: str, op: str, value: Any) -> "SQLiteQuery":
+        return SQLiteQuery(self.store, self.collection, [*self.filters, (field, op, value)], self.order, self._limit)
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "SQLiteQuery":
+        return SQLiteQuery(self.store, self.collection, self.filters, (field, direction), self._limit)
+
+    def limit(self, count: int) -> "SQLiteQuery":
+        return SQLiteQuery(self.store, self.collection, self.filters, self.order, count)
+
+    def stream(self) -> Iterator[SQLiteSnapshot]:
+        sql = "SELECT id, data FROM documents WHERE collection = ?"
+        params: List[Any] = [self.collection]
+        for field, op, value in self.filters:
+            if op == "in":
+                sql += f" AND {_field_expr(field)} IN ({','.join('?' * len(value))})"
+                params.extend(value)
+            elif op in _OPERATORS:
+                sql += f" AND {_field_expr(field)} {_OPERATORS[op]} ?"
+                params.append(value)
+            else:
+                raise ValueError(f"Unsupported query operator: {op}")
+        if self.order:
+            field, direction = self.order
+            sql += f" ORDER BY {_field_expr(field)} {'DESC' if str(direction).upper() == 'DESCENDING' else 'ASC'}"
+        else:
+            # Insertion order, so "last" means most recently created
+            sql += " ORDER BY rowid"
+        if self._limit is not None:
+            sql += " LIMIT ?"
+            params.append(self._limit)
+        for doc_id, raw in self.store.connection().execute(sql, params).fetchall():
+            yield SQLiteSnapshot(doc_id, raw)
+
+    def get(self) -> List[SQLiteSnapshot]:
+        return list(self.stream())
+
+
+class SQLiteCollection(SQLiteQuery):
+    def __init__(self, store: SQLiteDocumentStore, name: str):
+        super().__init__(store, name)
+
+    def document(self, doc_id: str) -> SQLiteDocument:
+        return SQLiteDocument(self.store, self.collection, doc_id)
+
+
+class SQLiteBatch:
+    """Buffered writes applied in one transaction on commit(); also the transaction object of run_transaction."""
+
+    def __init__(self, store: SQLiteDocumentStore):
+        self.store = store
+        self._ops: List[Tuple[str, SQLiteDocument, Optional[Dict[str, Any]], bool]] = []
+
+    def set(self, ref: SQLiteDocument, data: Dict[str, Any], merge: bool = False) -> None:
+        self._ops.append(("set", ref, data, merge))
+
+    def update(self, ref: SQLiteDocument, data: Dict[str, Any]) -> None:
+        self._ops.append(("update", ref, data, False))
+
+    def delete(self, ref: SQLiteDocument) -> None:
+        self._ops.append(("delete", ref, None, False))
+
+    def commit(self) -> None:
+        conn = self.store.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._apply()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _apply(self) -> None:
+        for op, ref, data, merge in self._ops:
+            if op == "set":
+                ref.set(data, merge=merge)
+            elif op == "update":
+                self._update(ref, data)
+            else:
+                ref.delete()
+        self._ops = []
+
+    @staticmethod
+    def _update(ref: SQLiteDocument, data: Dict[str, Any]) -> None:
+        current = ref.get().to_dict()
+        if current is None:
+            raise KeyError(f"No document to update: {ref.collection}/{ref.id}")
+        ref.set(_apply_update(current, data))
@@ -0,0 +1,101 @@
+from ..config.settings import UPLOAD_CACHE_DIR
+from typing import Iterable, Iterator, List, Optional
+import pyarrow as pa
+import pandas as pd
+import pickle
+import shutil
+import json
+import os
+
+# Arrow schema metadata key listing the columns stored as pickled values
+_PICKLED_KEY = b"pickled_columns"
+
+
+class UploadCache:
+    """Columnar copies of uploaded sheets, keyed by file hash.
+
+    A cached upload is a directory ``UPLOAD_CACHE_DIR/<sha256>.<kind>/`` with
+    one Arrow IPC file per chunk, so readers get back the exact chunks the
+    spreadsheet reader produced. Object columns that Arrow cannot represent
+    losslessly (mixed text, numbers and dates, as spreadsheets often have) are
+    stored as pickled values and restored on read; the normalizer sees the
+    same values it would have got from the original file.
+
+    Normalized frames are cached next to it as ``<sha256>.<kind>.v<version>.pkl``,
+    so an unchanged file is not even normalized again until the normalizer
+    version changes.
+    """
+
+    def __init__(self, base_dir: str = UPLOAD_CACHE_DIR):
+        self.base_dir = base_dir
+
+    def path(self, file_hash: str, kind: str) -> str:
+        return os.path.join(self.base_dir, f"{file_hash}.{kind}")
+
+    def has(self, file_hash: str, kind: str) -> bool:
+        return os.path.isdir(self.path(file_hash, kind))
+
+    def write(self, file_hash: str, kind: str, chunks: Iterable[pd.DataFrame]) -> str:
+        path = self.path(file_hash, kind)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        try:
+            for idx, chunk in enumerate(chunks):
+                self._write_chunk(os.path.join(tmp_path, f"{idx:05d}.arrow"), chunk)
+            # The directory only appears once every chunk is written
+            if os.path.isdir(path):
+                shutil.rmtree(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        return path
+
+    def iter_chunks(self, file_hash: str, kind: str) -> Iterator[pd.DataFrame]:
+        path = self.path(file_hash, kind)
+        for filename in sorted(os.listdir(path)):
+            yield self._read_chunk(os.path.join(path, filename))
+
+    def normalized_path(self, file_hash: str, kind: str, version: int) -> str:
+        return os.path.join(self.base_dir, f"{file_hash}.{kind}.v{version}.pkl")
+
+    def read_normalized(self, file_hash: str, kind: str, version: int) -> Optional[pd.DataFrame]:
+        path = self.normalized_path(file_hash, kind, version)
+        if not os.path.exists(path):
+            return None
+        return pd.read_pickle(path)
+
+    def write_normalized(self, file_hash: str, kind: str, version: int, df: pd.DataFrame) -> None:
+        path = self.normalized_path(file_hash, kind, version)
+        os.makedirs(self.base_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _write_chunk(path: str, df: pd.DataFrame) -> None:
+        df = df.copy(deep=False)
+        pickled: List[str] = []
+        for col in df.columns[df.dtypes == object]:
+            if pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty"):
+                df[col] = [pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) for value in df[col]]
+                pickled.append(col)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _PICKLED_KEY: json.dumps(pickled)})
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    @staticmethod
+    def _read_chunk(path: str) -> pd.DataFrame:
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        pickled = json.loads(table.schema.metadata[_PICKLED_KEY])
+        df = table.to_pandas()
+        for col in pickled:
+            df[col] = pd.Series([pickle.loads(value) for value in df[col]], index=df.index, dtype=object)
+        return df
+
+
+upload_cache = UploadCache()
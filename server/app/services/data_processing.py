@@ -1,30 +1,94 @@
 from ..utils.data_normalizer import DataNormalizer
 from ..services.sla_engine import SLAEngine
-from typing import Dict, Any, List
+from ..utils.excel_reader import iter_excel_chunks
+from ..utils.csv_reader import read_csv_columns
+from ..utils.file_format import detect_format
+from ..repositories.upload_cache import upload_cache
+from typing import Dict, Any, List, Callable, Iterator, Optional
 import pandas as pd
 
 class DataProcessingService:
     def __init__(self):
         self.normalizer = DataNormalizer()
         self.sla_engine = SLAEngine()
+        self.upload_cache = upload_cache
 
-    async def process_files(self, mother_path: str, loose_path: str) -> List[Dict[str, Any]]:
-        try:
-            mother_df = pd.read_excel(mother_path, sheet_name=0)
-        except Exception as e:
-            raise ValueError(f"Erro ao ler arquivo mother: {str(e)}")
-        
-        try:
-            loose_df = pd.read_excel(loose_path, sheet_name=0)
-        except Exception as e:
-            raise ValueError(f"Erro ao ler arquivo loose: {str(e)}")
-        
-        mother_df = self.normalizer.normalize_mother_data(mother_df)
-        loose_df = self.normalizer.normalize_loose_data(loose_df)
+    def process_files(self, mother_path: str, loose_path: str, mother_hash: Optional[str] = None, loose_hash: Optional[str] = None) -> pd.DataFrame:
+        mother_df = self.load_mother(mother_path, mother_hash)
+        loose_df = self.load_loose(loose_path, loose_hash)
         
         merged_df = self.normalizer.merge_data(mother_df, loose_df)
         
-        return merged_df.to_dict('records')
+        return merged_df
+
+    def load_mother(self, path: str, file_hash: Optional[str] = None) -> pd.DataFrame:
+        return self._load("mother", path, file_hash, self.normalizer.normalize_mother_data)
+
+    def load_loose(self, path: str, file_hash: Optional[str] = None) -> pd.DataFrame:
+        return self._load("loose", path, file_hash, self.normalizer.normalize_loose_data)
+
+    def _load(self, kind: str, path: str, file_hash: Optional[str], normalize: Callable[[pd.DataFrame], pd.DataFrame]) -> pd.DataFrame:
+        # Normalized frames are cached per file content and normalizer version
+        if file_hash:
+            cached = self.upload_cache.read_normalized(file_hash, kind, DataNormalizer.VERSION)
+            if cached is not None:
+                return cached
+        df = self._read_normalized(self._source_chunks(kind, path, file_hash), normalize, kind)
+        if file_hash:
+            self.upload_cache.write_normalized(file_hash, kind, DataNormalizer.VERSION, df)
+        return df
+
+    def transcode(self, kind: str, path: str, file_hash: str) -> str:
+        """Write the columnar cache of an upload so later jobs skip parsing the spreadsheet."""
+        return self.upload_cache.write(file_hash, kind, self._iter_chunks(path, self._columns(kind)))
+
+    @staticmethod
+    def _columns(kind: str) -> List[str]:
+        if kind == "mother":
+            return DataNormalizer.MOTHER_REQUIRED_COLUMNS + DataNormalizer.MOTHER_OPTIONAL_COLUMNS
+        return DataNormalizer.LOOSE_REQUIRED_COLUMNS + DataNormalizer.LOOSE_OPTIONAL_COLUMNS
+
+    def _source_chunks(self, kind: str, path: str, file_hash: Optional[str]) -> Iterator[pd.DataFrame]:
+        if file_hash and self.upload_cache.has(file_hash, kind):
+            return self.upload_cache.iter_chunks(file_hash, kind)
+        return self._iter_chunks(path, self._columns(kind))
+
+    def _read_normalized(
+        self,
+        chunks: Iterator[pd.DataFrame],
+        normalize: Callable[[pd.DataFrame], pd.DataFrame],
+        label: str,
+    ) -> pd.DataFrame:
+        """Normalize each chunk as soon as it is parsed."""
+        normalized: List[pd.DataFrame] = []
+        while True:
+            try:
+                chunk = next(chunks, None)
+            except Exception as e:
+                raise ValueError(f"Erro ao ler arquivo {label}: {str(e)}")
+            if chunk is None:
+                break
+            normalized.append(normalize(chunk))
+        
+        if not normalized:
+            # Lets the normalizer report the empty file
+            return normalize(pd.DataFrame())
+        return self.normalizer.concat(normalized)
+
+    @staticmethod
+    def _iter_chunks(path: str, columns: List[str]) -> Iterator[pd.DataFrame]:
+        file_format = detect_format(path)
+        if file_format == "csv":
+            # CSV is read in one multithreaded pass, limited to the columns we use
+            yield read_csv_columns(path, columns)
+        elif file_format == "xlsx":
+            yield from iter_excel_chunks(path)
+        else:
+            # Legacy .xls workbooks cannot be streamed by openpyxl
+            yield pd.read_excel(path, sheet_name=0)
 
     def calculate_sla(self, record: Dict[str, Any]) -> str:
-        return self.sla_engine.calculate_sla(record)
\ No newline at end of file
+        return self.sla_engine.calculate_sla(record)
+
+    def classify_sla(self, df: pd.DataFrame) -> pd.Series:
+        return self.sla_engine.classify_frame(df)
\ No newline at end of file
@@ -1,5 +1,13 @@
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+# Every class calculate_sla can return; classify_frame's categories
+SLA_CLASSES = ["Dentro do prazo", "Entregue com atraso", "Fora do prazo", "Não entregue", "Dados inválidos"]
+
+# Strings the vectorized parser reads exactly as datetime.fromisoformat does; other strings are parsed one by one
+_PLAIN_ISO = r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}:\d{2})?"
 
 class SLAEngine:
     @staticmethod
@@ -15,7 +23,7 @@ class SLAEngine:
             previsao_date = datetime.fromisoformat(previsao)
             entrega_date = datetime.fromisoformat(entrega)
             prazo_days = int(prazo) if prazo else 0
-        except:
+        except (TypeError, ValueError, OverflowError):
             return "Dados inválidos"
         
         if entrega_date <= previsao_date:
@@ -23,4 +31,96 @@ class SLAEngine:
         elif entrega_date > previsao_date:
             return "Entregue com atraso"
         else:
-            return "Fora do prazo"
\ No newline at end of file
+            return "Fora do prazo"
+
+    @staticmethod
+    def classify_frame(df: pd.DataFrame) -> pd.Series:
+        """Vectorized calculate_sla: one SLA class per row (categorical over SLA_CLASSES), using column-wise masks.
+
+        Dates may also be normalized datetime columns, whose NaT is invalid like NaN.
+        A row comparing a timezone-aware date with a naive one, which makes
+        calculate_sla raise TypeError, is "Dados inválidos".
+        """
+        empty = pd.Series([None] * len(df), index=df.index, dtype=object)
+        previsao = df["PREVISÃO DE ENTREGA"] if "PREVISÃO DE ENTREGA" in df.columns else empty
+        entrega = df["ENTREGA"] if "ENTREGA" in df.columns else empty
+        prazo = df["Prazo"] if "Prazo" in df.columns else empty
+
+        missing = SLAEngine._falsy(previsao) | SLAEngine._falsy(entrega)
+        previsao_date, previsao_aware = SLAEngine._parse_isoformat(previsao)
+        entrega_date, entrega_aware = SLAEngine._parse_isoformat(entrega)
+        invalid = (
+            previsao_date.isna() | entrega_date.isna() | SLAEngine._invalid_int(prazo)
+            | (previsao_aware != entrega_aware)
+        )
+
+        classes = np.select(
+            [missing, invalid, entrega_date <= previsao_date, entrega_date > previsao_date],
+            ["Não entregue", "Dados inválidos", "Dentro do prazo", "Entregue com atraso"],
+            default="Fora do prazo",
+        )
+        return pd.Series(pd.Categorical(classes, categories=SLA_CLASSES), index=df.index)
+
+    @staticmethod
+    def _falsy(values: pd.Series) -> np.ndarray:
+        # Mirrors `not value`: None, "", 0 and False are falsy; NaN and NaT are not
+        arr = values.to_numpy(dtype=object)
+        return np.equal(arr, None) | np.equal(arr, "") | np.equal(arr, 0)
+
+    @staticmethod
+    def _is_str(values: pd.Series) -> pd.Series:
+        if isinstance(values.dtype, pd.StringDtype):
+            return values.notna()
+        if values.dtype != object:
+            return pd.Series(False, index=values.index)
+        kind = pd.api.types.infer_dtype(values, skipna=True)
+        if kind == "string":
+            return values.notna()
+        if kind == "empty":
+            return pd.Series(False, index=values.index)
+        return values.map(lambda v: isinstance(v, str)).astype(bool)
+
+    @staticmethod
+    def _parse_isoformat(values: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+        """datetime.fromisoformat over a column: naive datetime64[us] dates (aware ones in UTC) and a timezone-aware mask."""
+        if pd.api.types.is_datetime64_any_dtype(values):
+            aware = values.dt.tz is not None
+            if aware:
+                values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+            return values.astype("datetime64[us]"), np.full(len(values), aware)
+
+        # datetime.fromisoformat only accepts strings; everything else is invalid
+        is_str = SLAEngine._is_str(values)
+        text = values.where(is_str).astype(object)
+        plain = is_str & text.str.fullmatch(_PLAIN_ISO).fillna(False).astype(bool)
+        dates = pd.to_datetime(text.where(plain), format="ISO8601", errors="coerce").astype("datetime64[us]")
+        aware = np.zeros(len(values), dtype=bool)
+
+        # Other ISO forms (week dates, offsets, ...) and dates out of the datetime64[ns] range
+        rest = np.flatnonzero(is_str.to_numpy() & dates.isna().to_numpy())
+        if len(rest):
+            parsed = [SLAEngine._fromisoformat(value) for value in text.iloc[rest]]
+            dates.iloc[rest] = [np.datetime64("NaT") if date is None else np.datetime64(date, "us") for date, _ in parsed]
+            aware[rest] = [tz for _, tz in parsed]
+        return dates, aware
+
+    @staticmethod
+    def _fromisoformat(value: str) -> Tuple[Optional[datetime], bool]:
+        try:
+            date = datetime.fromisoformat(value)
+            if date.tzinfo is None:
+                return date, False
+            return date.astimezone(timezone.utc).replace(tzinfo=None), True
+        except (ValueError, OverflowError):
+            return None, False
+
+    @staticmethod
+    def _invalid_int(values: pd.Series) -> np.ndarray:
+        # Mirrors `int(prazo) if prazo else 0` raising for a truthy value
+        is_str = SLAEngine._is_str(values).to_numpy()
+        numbers = pd.to_numeric(values.where(~is_str), errors="coerce").to_numpy(dtype=float)
+        valid = np.isfinite(numbers)
+        if is_str.any():
+            int_text = values.where(is_str).str.fullmatch(r"\s*[+-]?\d+(?:_\d+)*\s*")
+            valid = np.where(is_str, int_text.fillna(False).to_numpy(dtype=bool), valid)
+        return ~SLAEngine._falsy(values) & ~valid
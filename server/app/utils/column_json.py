@@ -0,0 +1,76 @@
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+from typing import Any, Dict, List, Mapping, Type
+import pandas as pd
+import numpy as np
+import itertools
+import typing
+
+# Dataset dates are day-precision datetimes; on the wire they are plain dates
+DATE_FORMAT = "%Y-%m-%d"
+
+# Field annotations converted a whole column at a time; other fields are passed through as given
+_COLUMN_TYPES = {int: np.int64, float: np.float64}
+
+
+def column_records(model: Type[BaseModel], columns: Mapping[str, Any], length: int) -> List[Dict[str, Any]]:
+    """Rows of `model` as plain dicts, built from column arrays instead of one model instance per row.
+
+    Keys follow the model's field order; fields without a column take their default and
+    scalar values repeat on every row. int/float/str fields are converted column-wise, and
+    pandas columns of other fields go through json_values; anything else must already be
+    JSON-ready, since rows are not validated. Optional[int/float/str] fields
+    convert their non-null values the same way and keep nulls as None.
+    """
+    fields = model.model_fields
+    unknown = set(columns) - set(fields)
+    if unknown:
+        raise ValueError(f"{model.__name__} has no fields {sorted(unknown)}")
+
+    values = []
+    for name, field in fields.items():
+        value = columns.get(name, field.default)
+        if value is PydanticUndefined:
+            raise ValueError(f"{model.__name__}.{name} is required")
+        if isinstance(value, (list, tuple, np.ndarray)) or hasattr(value, "to_numpy"):
+            values.append(_convert(value, field.annotation))
+        else:
+            values.append(itertools.repeat(value, length))
+    names = list(fields)
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def json_values(values: pd.Series) -> List[Any]:
+    """Column values ready for JSON: dates as DATE_FORMAT text and missing values (NaN, NaT, also in categoricals) as None."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        values = values.dt.strftime(DATE_FORMAT)
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def _convert(column: Any, annotation: Any) -> List[Any]:
+    inner = _optional(annotation)
+    if inner in _COLUMN_TYPES or inner is str:
+        values = column if isinstance(column, pd.Series) else pd.Series(list(column), dtype=object)
+        present = values.notna().to_numpy()
+        result: List[Any] = [None] * len(values)
+        for position, value in zip(np.flatnonzero(present), _convert(values[present], inner)):
+            result[position] = value
+        return result
+    if annotation in _COLUMN_TYPES:
+        return np.asarray(column, dtype=_COLUMN_TYPES[annotation]).tolist()
+    if annotation is str:
+        if isinstance(column, pd.Series) and pd.api.types.is_datetime64_any_dtype(column):
+            column = column.dt.strftime(DATE_FORMAT)
+        return np.asarray(column).astype(str).tolist()
+    if isinstance(column, pd.Series):
+        return json_values(column)
+    return list(column)
+
+
+def _optional(annotation: Any) -> Any:
+    # Optional[X] -> X; None for any other annotation
+    if typing.get_origin(annotation) is not typing.Union:
+        return None
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    return args[0] if len(args) == 1 else None
+
@@ -0,0 +1,62 @@
+from ..config.settings import CSV_BLOCK_SIZE
+from pyarrow import csv as pa_csv
+from typing import List, Tuple
+import pyarrow as pa
+import pandas as pd
+import csv
+
+CANDIDATE_DELIMITERS = [",", ";", "\t"]
+# Encoding tried when a file is not valid UTF-8, as the pandas reader did
+FALLBACK_ENCODING = "latin-1"
+
+
+def read_csv_columns(path: str, columns: List[str]) -> pd.DataFrame:
+    """Read only `columns` from a CSV with the multithreaded pyarrow reader.
+
+    Every selected column is read as text, so values such as order numbers and
+    CEPs keep their exact spelling; the normalizer does the typed conversions.
+    Columns absent from the file are skipped and left for the normalizer to report.
+    Quoted cells may span lines; files that are not valid UTF-8 are read as Latin-1.
+    """
+    header, delimiter, encoding = _read_header(path)
+    selected = [col for col in columns if col in header]
+    try:
+        table = _read_table(path, delimiter, selected, encoding)
+    except pa.ArrowInvalid as e:
+        # The header decoded, but a later row is not UTF-8 (e.g. an Excel "CSV" export)
+        if encoding == FALLBACK_ENCODING or "UTF8" not in str(e):
+            raise
+        table = _read_table(path, delimiter, selected, FALLBACK_ENCODING)
+    return table.to_pandas()
+
+
+def read_csv_header(path: str) -> List[str]:
+    return _read_header(path)[0]
+
+
+def _read_table(path: str, delimiter: str, columns: List[str], encoding: str) -> pa.Table:
+    return pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE, encoding=encoding),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter, newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={col: pa.string() for col in columns},
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def _read_header(path: str) -> Tuple[List[str], str, str]:
+    try:
+        encoding = "utf-8"
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            first_line = f.readline()
+    except UnicodeDecodeError:
+        encoding = FALLBACK_ENCODING
+        with open(path, encoding=FALLBACK_ENCODING, newline="") as f:
+            first_line = f.readline()
+    # Brazilian spreadsheet exports commonly use ";" instead of ","
+    delimiter = max(CANDIDATE_DELIMITERS, key=first_line.count)
+    header = next(csv.reader([first_line], delimiter=delimiter), [])
+    return header, delimiter, encoding
@@ -4,24 +4,36 @@ import re
 from datetime import datetime
 
 class DataNormalizer:
+    # Bump whenever normalized output changes; normalized frames cached under an older version are ignored
+    VERSION = 3
+    MOTHER_REQUIRED_COLUMNS = ["Data Pedido", "Pedido", "Status do Dia", "Beep do Dia", "Cliente", "Conta", "Zona", "Responsabilidade"]
+    LOOSE_REQUIRED_COLUMNS = ["Bipagem", "criacao", "deveria_ser_entregue", "pacote", "etiqueta", "pedido_marketplace", "Frete", "Vendedor", "Centro de custo", "status_dia", "Nome Comprador", "CEP", "Logradouro", "Número", "Bairro", "Cidade", "Complemento", "data_status_dia", "PREVISÃO DE ENTREGA", "ENTREGA", "SLA", "Prazo", "Atraso"]
+    # Optional columns read downstream (the dashboard groups by data_pedido when the export has it)
+    MOTHER_OPTIONAL_COLUMNS = ["data_pedido"]
+    LOOSE_OPTIONAL_COLUMNS: List[str] = []
+    # Day-precision datetime64 columns; unparseable dates are NaT
+    MOTHER_DATE_COLUMNS = ["Data Pedido", "data_pedido"]
+    LOOSE_DATE_COLUMNS = ["criacao", "deveria_ser_entregue", "data_status_dia", "PREVISÃO DE ENTREGA", "ENTREGA"]
+    DATE_COLUMNS = MOTHER_DATE_COLUMNS + LOOSE_DATE_COLUMNS
+    # Columns read as text: .xlsx chunks infer dtypes on their own, so a chunk of all-numeric cells comes in as numbers
+    MOTHER_TEXT_COLUMNS = ["Pedido"]
+    LOOSE_TEXT_COLUMNS = ["Vendedor", "pedido_marketplace", "CEP", "status_dia"]
+    # Low-cardinality text kept dictionary-encoded (pandas categorical, Arrow dictionary) through merge, storage and analytics
+    CATEGORICAL_COLUMNS = ["Vendedor", "Zona", "CEP", "Cidade", "Bairro", "status_dia", "Centro de custo", "sla_calculated"]
+
     @staticmethod
     def normalize_mother_data(df: pd.DataFrame) -> pd.DataFrame:
         if df.empty:
             raise ValueError("Arquivo mother está vazio")
         
         # Required columns
-        required_cols = ["Data Pedido", "Pedido", "Status do Dia", "Beep do Dia", "Cliente", "Conta", "Zona", "Responsabilidade"]
+        required_cols = DataNormalizer.MOTHER_REQUIRED_COLUMNS
         missing_cols = [col for col in required_cols if col not in df.columns]
         if missing_cols:
             raise ValueError(f"Colunas obrigatórias faltantes no arquivo mother: {', '.join(missing_cols)}")
         
-        # Normalize dates
-        df["Data Pedido"] = pd.to_datetime(df["Data Pedido"], errors='coerce').dt.strftime('%Y-%m-%d')
-        
-        # Fill nulls
-        df = df.fillna("N/A")
-        
-        return df
+        df = DataNormalizer._as_text(df, DataNormalizer.MOTHER_TEXT_COLUMNS)
+        return DataNormalizer._finish(df)
 
     @staticmethod
     def normalize_loose_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -29,20 +41,17 @@ class DataNormalizer:
             raise ValueError("Arquivo loose está vazio")
         
         # Required columns
-        required_cols = ["Bipagem", "criacao", "deveria_ser_entregue", "pacote", "etiqueta", "pedido_marketplace", "Frete", "Vendedor", "Centro de custo", "status_dia", "Nome Comprador", "CEP", "Logradouro", "Número", "Bairro", "Cidade", "Complemento", "data_status_dia", "PREVISÃO DE ENTREGA", "ENTREGA", "SLA", "Prazo", "Atraso"]
+        required_cols = DataNormalizer.LOOSE_REQUIRED_COLUMNS
         missing_cols = [col for col in required_cols if col not in df.columns]
         if missing_cols:
             raise ValueError(f"Colunas obrigatórias faltantes no arquivo loose: {', '.join(missing_cols)}")
         
+        df = DataNormalizer._as_text(df, DataNormalizer.LOOSE_TEXT_COLUMNS)
+
         # Filter MELI
         df = df[df["Vendedor"].str.contains("meli", case=False, na=False)]
         df = df[df["pedido_marketplace"].str.match(r'^\d+$', na=False)]
         
-        # Normalize dates
-        date_cols = ["criacao", "deveria_ser_entregue", "data_status_dia", "PREVISÃO DE ENTREGA", "ENTREGA"]
-        for col in date_cols:
-            df[col] = pd.to_datetime(df[col], errors='coerce').dt.strftime('%Y-%m-%d')
-        
         # Normalize CEP
         df["CEP"] = df["CEP"].str.replace(r'\D', '', regex=True)
         
@@ -52,11 +61,52 @@ class DataNormalizer:
         # Normalize Vendedor
         df["Vendedor"] = df["Vendedor"].str.strip().str.title()
         
-        # Fill nulls
-        df = df.fillna("N/A")
-        
+        return DataNormalizer._finish(df)
+
+    @staticmethod
+    def _as_text(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """Cast `columns` to text as the CSV reader reads them: non-null cells become str, whole numbers without ".0"."""
+        df = df.copy(deep=False)
+        for col in columns:
+            values = df[col]
+            if pd.api.types.is_string_dtype(values) and pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+                continue
+            df[col] = values.map(DataNormalizer._cell_text, na_action="ignore").astype(object)
         return df
 
+    @staticmethod
+    def _cell_text(value: Any) -> str:
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    @staticmethod
+    def _finish(df: pd.DataFrame) -> pd.DataFrame:
+        # Fill nulls; dates are parsed next and keep NaT
+        df = df.fillna({col: "N/A" for col in df.columns if col not in DataNormalizer.DATE_COLUMNS})
+        return DataNormalizer.encode(df)
+
+    @staticmethod
+    def encode(df: pd.DataFrame) -> pd.DataFrame:
+        """Give DATE_COLUMNS and CATEGORICAL_COLUMNS their normalized types; columns that already have them are left alone.
+
+        Also upgrades frames stored before the typing (text dates, object columns).
+        """
+        df = df.copy(deep=False)
+        for col in DataNormalizer.DATE_COLUMNS:
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], errors='coerce').dt.normalize()
+        for col in DataNormalizer.CATEGORICAL_COLUMNS:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+        return df
+
+    @staticmethod
+    def concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """pd.concat that keeps categorical columns categorical (plain concat falls back to object when categories differ)."""
+        combined = pd.concat(frames, ignore_index=True)
+        return DataNormalizer.encode(combined)
+
     @staticmethod
     def merge_data(mother_df: pd.DataFrame, loose_df: pd.DataFrame) -> pd.DataFrame:
         # Left join on Pedido = pedido_marketplace
@@ -0,0 +1,168 @@
+from ..config.settings import EXCEL_CHUNK_ROWS
+from openpyxl import load_workbook
+from openpyxl.utils.cell import column_index_from_string, range_boundaries
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+import posixpath
+import zipfile
+import re
+import pandas as pd
+
+# Strings pandas.read_excel treats as missing by default
+NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+}
+
+
+def iter_excel_chunks(path: str, chunk_size: int = EXCEL_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Stream the first sheet of a workbook as DataFrames of at most `chunk_size` rows.
+
+    The workbook is opened read-only, so openpyxl parses rows lazily from the
+    zip instead of building the whole object model; memory stays proportional
+    to the chunk size. Cells keep their workbook types (text stays text, dates
+    become datetimes) and blank rows are skipped, like pandas.read_excel, but
+    column dtypes are inferred per chunk: a column that is object for the whole
+    sheet can be numeric in a chunk whose cells are all numbers. Callers cast
+    the columns they treat as text (see DataNormalizer._as_text).
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _header_names(header)
+
+        batch: List[tuple] = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield _to_frame(batch, columns)
+                batch = []
+        if batch:
+            yield _to_frame(batch, columns)
+    finally:
+        workbook.close()
+
+
+def read_excel_header(path: str) -> Tuple[List[str], Optional[int]]:
+    """Return the header names and data row count of a workbook's first sheet.
+
+    Only the sheet's <dimension> element and first row are parsed from the
+    zip stream (plus as much of the shared strings table as the header
+    needs), so the cost does not grow with the size of the sheet. The row
+    count comes from the dimension and is None when the file does not record it.
+    """
+    with zipfile.ZipFile(path) as archive:
+        sheet_path = _first_sheet_path(archive)
+        dimension, cells = None, {}
+        with archive.open(sheet_path) as sheet:
+            for event, elem in iterparse(sheet, events=("start", "end")):
+                tag = _local(elem.tag)
+                if event == "start" and tag == "dimension":
+                    dimension = elem.get("ref")
+                elif event == "end" and tag == "c":
+                    cells[_column_index(elem.get("r"), len(cells))] = (elem.get("t"), _cell_text(elem))
+                elif event == "end" and tag == "row":
+                    break
+
+        shared_ids = [int(text) for kind, text in cells.values() if kind == "s" and text is not None]
+        shared = _read_shared_strings(archive, max(shared_ids)) if shared_ids else []
+
+    header = [None] * (max(cells) + 1 if cells else 0)
+    for idx, (kind, text) in cells.items():
+        header[idx] = shared[int(text)] if kind == "s" and text is not None else text
+
+    total_rows = None
+    if dimension:
+        _, min_row, _, max_row = range_boundaries(dimension if ":" in dimension else f"{dimension}:{dimension}")
+        total_rows = max_row - min_row
+    return _header_names(tuple(header)), total_rows
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _column_index(ref: Optional[str], default: int) -> int:
+    # Cell references look like "AB1"; the "r" attribute is optional in the format
+    match = re.match(r"[A-Z]+", ref or "")
+    return column_index_from_string(match.group(0)) - 1 if match else default
+
+
+def _cell_text(cell) -> Optional[str]:
+    for child in cell:
+        tag = _local(child.tag)
+        if tag == "v":
+            return child.text
+        if tag == "is":
+            return _rich_text(child)
+    return None
+
+
+def _rich_text(elem) -> str:
+    # Plain <t> or formatted <r><t> runs; phonetic <rPh> runs are annotations, not text
+    parts = []
+    for child in elem:
+        tag = _local(child.tag)
+        if tag == "t":
+            parts.append(child.text or "")
+        elif tag == "r":
+            parts.extend(t.text or "" for t in child if _local(t.tag) == "t")
+    return "".join(parts)
+
+
+def _first_sheet_path(archive: zipfile.ZipFile) -> str:
+    rel_id = None
+    with archive.open("xl/workbook.xml") as workbook:
+        for _, elem in iterparse(workbook):
+            if _local(elem.tag) == "sheet":
+                rel_id = next((v for k, v in elem.attrib.items() if _local(k) == "id"), None)
+                break
+    targets: Dict[str, str] = {}
+    with archive.open("xl/_rels/workbook.xml.rels") as rels:
+        for _, elem in iterparse(rels):
+            if _local(elem.tag) == "Relationship":
+                targets[elem.get("Id")] = elem.get("Target")
+    target = targets.get(rel_id, "worksheets/sheet1.xml")
+    return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+
+
+def _read_shared_strings(archive: zipfile.ZipFile, last_index: int) -> List[str]:
+    strings: List[str] = []
+    with archive.open("xl/sharedStrings.xml") as shared:
+        for _, elem in iterparse(shared):
+            if _local(elem.tag) != "si":
+                continue
+            strings.append(_rich_text(elem))
+            elem.clear()
+            if len(strings) > last_index:
+                break
+    return strings
+
+
+def _header_names(header: tuple) -> List[str]:
+    names: List[str] = []
+    for idx, value in enumerate(header):
+        name = f"Unnamed: {idx}" if value is None else str(value)
+        # Mangle duplicates the same way pandas does ("col", "col.1", ...)
+        base, n = name, 0
+        while name in names:
+            n += 1
+            name = f"{base}.{n}"
+        names.append(name)
+    return names
+
+
+def _to_frame(batch: List[tuple], columns: List[str]) -> pd.DataFrame:
+    width = len(columns)
+    records = [row[:width] if len(row) >= width else row + (None,) * (width - len(row)) for row in batch]
+    df = pd.DataFrame.from_records(records, columns=columns)
+    for col in df.columns[df.dtypes == object]:
+        na = df[col].isin(NA_STRINGS)
+        if na.any():
+            df[col] = df[col].mask(na)
+    return df
@@ -0,0 +1,115 @@
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from pyarrow import csv as pa_csv
+from pyarrow import parquet as pq
+from typing import Iterable, Iterator, List
+import pyarrow as pa
+import tempfile
+import io
+
+# Data rows per sheet; Excel caps a sheet at 1,048,576 rows including the header
+XLSX_MAX_ROWS = 1_048_575
+XLSX_READ_SIZE = 1024 * 1024
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are taken out as they are produced."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Writers record offsets (e.g. the Parquet footer), so report the total written, not what is buffered
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def write_export(fmt: str, tables: Iterable[pa.Table], columns: List[str]) -> Iterator[bytes]:
+    """Encode Arrow table chunks as `fmt`, yielding bytes as each chunk is written."""
+    if fmt == "csv":
+        return _csv(tables, columns)
+    if fmt == "parquet":
+        return _parquet(tables, columns)
+    if fmt == "xlsx":
+        return _xlsx(tables, columns)
+    raise ValueError(f"Formato de exportação não suportado: {fmt}")
+
+
+def _csv(tables: Iterable[pa.Table], columns: List[str]) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    header = True
+    for table in tables:
+        pa_csv.write_csv(_as_dates(table), sink, pa_csv.WriteOptions(include_header=header))
+        header = False
+        yield sink.drain()
+    if header:
+        # No rows: still send the header
+        pa_csv.write_csv(_empty_table(columns), sink)
+        yield sink.drain()
+
+
+def _parquet(tables: Iterable[pa.Table], columns: List[str]) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    writer = None
+    for table in tables:
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema)
+        writer.write_table(table)
+        yield sink.drain()
+    if writer is None:
+        writer = pq.ParquetWriter(sink, _empty_table(columns).schema)
+    writer.close()
+    yield sink.drain()
+
+
+def _as_dates(table: pa.Table) -> pa.Table:
+    # Dataset dates are day-precision timestamps; write them as dates, not as midnight datetimes
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.date32()))
+    return table
+
+
+def _empty_table(columns: List[str]) -> pa.Table:
+    return pa.table({column: pa.array([], pa.string()) for column in columns})
+
+
+def _xlsx(tables: Iterable[pa.Table], columns: List[str]) -> Iterator[bytes]:
+    # write_only streams rows to a temporary file instead of keeping cells in memory;
+    # the zip can only be read back once it is complete
+    workbook = Workbook(write_only=True)
+    sheet, rows = None, XLSX_MAX_ROWS
+    for table in tables:
+        for row in zip(*(column.to_pylist() for column in _as_dates(table).columns)):
+            if rows == XLSX_MAX_ROWS:
+                sheet = workbook.create_sheet(f"Consolidado {len(workbook.worksheets) + 1}" if workbook.worksheets else "Consolidado")
+                sheet.append(columns)
+                rows = 0
+            sheet.append([ILLEGAL_CHARACTERS_RE.sub("", v) if isinstance(v, str) else v for v in row])
+            rows += 1
+    if sheet is None:
+        workbook.create_sheet("Consolidado").append(columns)
+    with tempfile.TemporaryFile(suffix=".xlsx") as tmp:
+        workbook.save(tmp)
+        tmp.seek(0)
+        while chunk := tmp.read(XLSX_READ_SIZE):
+            yield chunk
@@ -0,0 +1,13 @@
+XLSX_MAGIC = b"PK\x03\x04"  # .xlsx/.xlsm are zip containers
+XLS_MAGIC = b"\xd0\xcf\x11\xe0"  # legacy .xls is an OLE2 compound file
+
+
+def detect_format(path: str) -> str:
+    """Detect an upload's format from its leading bytes: "xlsx", "xls" or "csv"."""
+    with open(path, "rb") as f:
+        head = f.read(8)
+    if head.startswith(XLSX_MAGIC):
+        return "xlsx"
+    if head.startswith(XLS_MAGIC):
+        return "xls"
+    return "csv"
@@ -0,0 +1,43 @@
+from ..utils.data_normalizer import DataNormalizer
+from ..utils.excel_reader import read_excel_header
+from ..utils.csv_reader import read_csv_header
+from ..utils.file_format import detect_format
+from typing import Dict, Any, List, Optional, Tuple
+import pandas as pd
+
+
+def validate_upload(path: str, kind: str) -> Dict[str, Any]:
+    """Check an upload's header against the columns the normalizer needs for `kind` ("mother" or "loose").
+
+    Only the header (and, for .xlsx, the sheet dimension) is read, so this is
+    cheap for any file size. Raises ValueError when the file cannot be parsed.
+    """
+    header, total_rows = _read_header(path)
+    if not any(header):
+        raise ValueError("cabeçalho não encontrado")
+
+    if kind == "mother":
+        required = DataNormalizer.MOTHER_REQUIRED_COLUMNS
+        known = required + DataNormalizer.MOTHER_OPTIONAL_COLUMNS
+    else:
+        required = DataNormalizer.LOOSE_REQUIRED_COLUMNS
+        known = required + DataNormalizer.LOOSE_OPTIONAL_COLUMNS
+    missing = [col for col in required if col not in header]
+    return {
+        "totalRows": total_rows,
+        "columnValidation": {
+            "valid": not missing,
+            "missingColumns": missing,
+            "extraColumns": [col for col in header if col not in known],
+        },
+    }
+
+
+def _read_header(path: str) -> Tuple[List[str], Optional[int]]:
+    file_format = detect_format(path)
+    if file_format == "xlsx":
+        return read_excel_header(path)
+    if file_format == "csv":
+        return read_csv_header(path), None
+    # Legacy .xls cannot be read partially; pandas parses it but skips the rows
+    return [str(col) for col in pd.read_excel(path, sheet_name=0, nrows=0).columns], None
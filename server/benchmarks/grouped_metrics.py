@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Time AnalyticsEngine.grouped_metrics against the per-group apply passes it replaces.
+
+Run from the server directory:
+
+    python -m benchmarks.grouped_metrics [--rows 300000] [--ceps 20000] [--repeat 3]
+
+Parity between the two is checked by tests/test_analytics.py.
+"""
+import argparse
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+from app.analytics import AnalyticsEngine
+from app.analytics.cube import DELAY_CLASSES, SLA_CLASS_MEASURES
+
+DIMENSIONS = ["Vendedor", "Zona", "CEP"]
+
+
+def synthetic_rows(rows: int, ceps: int, sellers: int = 3_000, zones: int = 40, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    atraso = rng.integers(0, 15, rows).astype(object)
+    # Text and missing delays, as they come out of the spreadsheets
+    atraso[rng.random(rows) < 0.05] = "n/a"
+    atraso[rng.random(rows) < 0.05] = None
+    return pd.DataFrame({
+        "Vendedor": [f"SELLER {i}" for i in rng.integers(0, sellers, rows)],
+        "Zona": [f"ZONA_{i}" for i in rng.integers(0, zones, rows)],
+        "CEP": [f"{i:08d}" for i in rng.integers(0, ceps, rows)],
+        "sla_calculated": rng.choice(list(SLA_CLASS_MEASURES.values()), rows),
+        "Atraso": atraso,
+    })
+
+
+def legacy_metrics(df: pd.DataFrame, group_by: str) -> pd.DataFrame:
+    """One apply pass per metric over the rows of each group, as the dashboard used to do."""
+    groups = df.groupby(group_by)
+    result = pd.DataFrame({
+        "total": groups.size(),
+        "on_time": groups.apply(lambda g: (g["sla_calculated"] == "Dentro do prazo").sum()),
+        "delays": groups.apply(lambda g: g["sla_calculated"].isin(DELAY_CLASSES).sum()),
+        "average_delay": groups.apply(lambda g: pd.to_numeric(g["Atraso"], errors="coerce").fillna(0).mean()),
+    })
+    result["outside_sla"] = result["total"] - result["on_time"]
+    result["sla_percentage"] = result["on_time"] / result["total"] * 100
+    return result.reset_index()
+
+
+def best_of(run: Callable[[], object], repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--ceps", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = synthetic_rows(args.rows, args.ceps)
+    for key in DIMENSIONS:
+        groups = df[key].nunique()
+        before = best_of(lambda: legacy_metrics(df, key), args.repeat)
+        after = best_of(lambda: AnalyticsEngine.grouped_metrics(df, key), args.repeat)
+        print(f"{key:9} {groups:6} groups   apply {before * 1000:9.1f} ms   kernel {after * 1000:7.1f} ms   {before / after:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Compare the model-per-row response path with the column/orjson one for /dashboard/zones and /dashboard/sellers.
+
+Run from the server directory:
+
+    python -m benchmarks.serialization [--rows 500000] [--ceps 50000] [--sellers 5000] [--repeat 3]
+
+The model path is the previous implementation: one Pydantic model per row, then
+FastAPI's response_model validation/serialization and JSONResponse. Both bodies
+are decoded and compared before any timing is reported.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.analytics import AggregateCube
+from app.analytics.cube import SLA_CLASS_MEASURES
+from app.api.dashboard import _sellers_payload, _zones_payload
+from app.models import BarChartData, CepMetrics, SellerMetrics, SellersData, ZoneMetrics, ZonesData
+
+
+def synthetic_cube(rows: int, ceps: int, sellers: int, zones: int = 40, seed: int = 7) -> Dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Vendedor": [f"SELLER {i}" for i in rng.integers(0, sellers, rows)],
+        "Zona": [f"ZONA_{i}" for i in rng.integers(0, zones, rows)],
+        "CEP": [f"{i:08d}" for i in rng.integers(0, ceps, rows)],
+        "sla_calculated": rng.choice(list(SLA_CLASS_MEASURES.values()), rows),
+        "Atraso": rng.integers(0, 10, rows),
+    })
+    return AggregateCube.build(df, ["Vendedor", "Zona", "CEP"])
+
+
+def zones_models(cube: Dict[str, pd.DataFrame]) -> ZonesData:
+    zone_df = AggregateCube.frame(cube, "Zona").rename(columns={"Zona": "zone"})
+    zone_df["average_delay"] = zone_df["delay_sum"] / zone_df["total"]
+    zone_df["sla_percentage"] = (zone_df["on_time"] / zone_df["total"] * 100).fillna(0)
+    cep_df = AggregateCube.frame(cube, "CEP").rename(columns={"CEP": "cep"})
+    cep_df["average_delay"] = cep_df["delay_sum"] / cep_df["total"]
+    cep_df["sla_percentage"] = (cep_df["on_time"] / cep_df["total"] * 100).fillna(0)
+
+    def metrics(model, key, df):
+        return [
+            model(**{
+                "id": str(row[key]),
+                key: str(row[key]),
+                "totalPackages": int(row["total"]),
+                "totalDelays": int(row["delays"]),
+                "withinSla": int(row["on_time"]),
+                "outsideSla": int(row["total"] - row["on_time"]),
+                "slaPercentage": float(row["sla_percentage"]),
+                "averageDelay": float(row["average_delay"] or 0),
+            })
+            for _, row in df.iterrows()
+        ]
+
+    def chart(key, df):
+        return [
+            BarChartData(label=str(row[key]), value=int(row["delays"]))
+            for _, row in df.sort_values("delays", ascending=False).iterrows()
+        ]
+
+    return ZonesData(
+        zones=metrics(ZoneMetrics, "zone", zone_df),
+        ceps=metrics(CepMetrics, "cep", cep_df),
+        zoneDelaysChart=chart("zone", zone_df),
+        cepDelaysChart=chart("cep", cep_df),
+    )
+
+
+def sellers_models(cube: Dict[str, pd.DataFrame]) -> SellersData:
+    df = AggregateCube.frame(cube, "Vendedor")
+    df["average_delay"] = df["delay_sum"] / df["total"]
+    df["sla_percentage"] = (df["on_time"] / df["total"] * 100).fillna(0)
+    df = df.sort_values("sla_percentage", ascending=False)
+    df["rank"] = range(1, len(df) + 1)
+    sellers = [
+        SellerMetrics(
+            id=str(row["Vendedor"]),
+            name=str(row["Vendedor"]),
+            totalPackages=int(row["total"]),
+            totalDelays=int(row["delays"]),
+            withinSla=int(row["on_time"]),
+            outsideSla=int(row["total"] - row["on_time"]),
+            slaPercentage=float(row["sla_percentage"]),
+            averageDelay=float(row["average_delay"] or 0),
+            rank=int(row["rank"]),
+        )
+        for _, row in df.iterrows()
+    ]
+    top = df.head(20)
+
+    def chart(column, cast):
+        return [BarChartData(label=str(row["Vendedor"]), value=cast(row[column])) for _, row in top.iterrows()]
+
+    return SellersData(sellers=sellers, volumeChart=chart("total", int), delaysChart=chart("delays", int), slaChart=chart("sla_percentage", float))
+
+
+def model_path(build: Callable[[Dict[str, pd.DataFrame]], Any], response_model: Any) -> Callable[[Dict[str, pd.DataFrame]], bytes]:
+    field = create_response_field(name=f"Response_{response_model.__name__}", type_=response_model)
+
+    def run(cube: Dict[str, pd.DataFrame]) -> bytes:
+        content = asyncio.run(serialize_response(field=field, response_content=build(cube)))
+        return JSONResponse(content).body
+    return run
+
+
+def column_path(build: Callable[[Dict[str, pd.DataFrame]], Dict[str, Any]]) -> Callable[[Dict[str, pd.DataFrame]], bytes]:
+    return lambda cube: ORJSONResponse(build(cube)).body
+
+
+def best_of(run: Callable[[], bytes], repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--ceps", type=int, default=50_000)
+    parser.add_argument("--sellers", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cube = synthetic_cube(args.rows, args.ceps, args.sellers)
+    cases = {
+        "zones": (model_path(zones_models, ZonesData), column_path(_zones_payload)),
+        "sellers": (model_path(sellers_models, SellersData), column_path(_sellers_payload)),
+    }
+    print(f"{args.rows} rows, {len(AggregateCube.frame(cube, 'CEP'))} CEPs, {len(AggregateCube.frame(cube, 'Vendedor'))} sellers")
+    for name, (models, columns) in cases.items():
+        if json.loads(models(cube)) != json.loads(columns(cube)):
+            raise SystemExit(f"{name}: the two paths produce different payloads")
+        before = best_of(lambda: models(cube), args.repeat)
+        after = best_of(lambda: columns(cube), args.repeat)
+        print(f"{name:8} models {before * 1000:9.1f} ms   columns {after * 1000:8.1f} ms   {before / after:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
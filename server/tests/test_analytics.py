@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.analytics import AggregateCube, AnalyticsEngine
+from app.analytics.cube import DELAY_CLASSES, SLA_CLASS_MEASURES
+
+METRICS = ["total", "on_time", "outside_sla", "delays", "average_delay", "sla_percentage"]
+DIMENSIONS = ["Vendedor", "Zona", "CEP"]
+
+
+def rows(count: int = 3_000, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    atraso = rng.integers(0, 15, count).astype(object)
+    # Text and missing delays, as they come out of the spreadsheets
+    atraso[rng.random(count) < 0.05] = "n/a"
+    atraso[rng.random(count) < 0.05] = None
+    return pd.DataFrame({
+        "Vendedor": [f"SELLER {i}" for i in rng.integers(0, 60, count)],
+        "Zona": [f"ZONA_{i}" for i in rng.integers(0, 8, count)],
+        "CEP": [f"{i:08d}" for i in rng.integers(0, 400, count)],
+        "sla_calculated": rng.choice(list(SLA_CLASS_MEASURES.values()), count),
+        "Atraso": atraso,
+    })
+
+
+def legacy_metrics(df: pd.DataFrame, group_by: str) -> pd.DataFrame:
+    """One apply pass per metric over the rows of each group, as the dashboard used to do."""
+    groups = df.groupby(group_by)
+    result = pd.DataFrame({
+        "total": groups.size(),
+        "on_time": groups.apply(lambda g: (g["sla_calculated"] == "Dentro do prazo").sum()),
+        "delays": groups.apply(lambda g: g["sla_calculated"].isin(DELAY_CLASSES).sum()),
+        "average_delay": groups.apply(lambda g: pd.to_numeric(g["Atraso"], errors="coerce").fillna(0).mean()),
+    })
+    result["outside_sla"] = result["total"] - result["on_time"]
+    result["sla_percentage"] = result["on_time"] / result["total"] * 100
+    return result.reset_index()
+
+
+def assert_metrics_equal(expected: pd.DataFrame, actual: pd.DataFrame, key: str) -> None:
+    expected = expected.set_index(key).sort_index()[METRICS]
+    actual = actual.astype({key: object}).set_index(key).sort_index()[METRICS]
+    pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_exact=False, rtol=1e-12)
+
+
+@pytest.fixture(params=["object", "category"])
+def df(request):
+    # The normalizer hands over categorical columns (sorted categories); unused categories must not become groups
+    data = rows()
+    if request.param == "category":
+        data = data.astype({key: pd.CategoricalDtype(sorted([*data[key].unique(), "UNUSED"])) for key in DIMENSIONS})
+        data["sla_calculated"] = data["sla_calculated"].astype("category")
+    return data
+
+
+@pytest.mark.parametrize("key", DIMENSIONS)
+def test_grouped_metrics_match_legacy(df, key):
+    assert_metrics_equal(legacy_metrics(df.astype(object), key), AnalyticsEngine.grouped_metrics(df, key), key)
+
+
+@pytest.mark.parametrize("key", DIMENSIONS)
+def test_metrics_from_cube_counts_match_legacy(df, key):
+    cube = AggregateCube.build(df, DIMENSIONS)
+    counts = AggregateCube.frame(cube, key)
+    assert_metrics_equal(legacy_metrics(df.astype(object), key), AnalyticsEngine.metrics_from_counts(counts), key)
+
+
+def test_calculate_sla_by_group_matches_legacy():
+    data = rows()
+    legacy = data.groupby("Zona").agg(
+        total=("sla_calculated", "count"),
+        on_time=("sla_calculated", lambda x: (x == "Dentro do prazo").sum()),
+    ).reset_index()
+    legacy["sla_percentage"] = (legacy["on_time"] / legacy["total"] * 100).round(2)
+    assert AnalyticsEngine.calculate_sla_by_group(data.to_dict("records"), "Zona") == legacy.to_dict("records")
+
+
+def test_rankings_from_rows_and_cube_match_nlargest(df):
+    top_n = 5
+    rankings = AnalyticsEngine.generate_rankings(df, top_n=top_n)
+    cube = AggregateCube.build(df, DIMENSIONS)
+    counts = {dimension: AggregateCube.frame(cube, dimension) for dimension in AnalyticsEngine.ranking_dimensions()}
+    assert AnalyticsEngine.rankings_from_counts(counts, top_n) == rankings
+
+    data = df.astype(object)
+    for name, key, metric in [("sellers_most_delays", "Vendedor", "delays"), ("zones_most_delays", "Zona", "delays"), ("sellers_highest_volume", "Vendedor", "volume")]:
+        metrics = legacy_metrics(data, key).rename(columns={"total": "volume"})
+        expected = metrics[metrics[metric] != 0].nlargest(top_n, metric)
+        assert [entry[key] for entry in rankings[name]] == expected[key].tolist()
+        assert [entry[metric] for entry in rankings[name]] == expected[metric].tolist()
+    # Dimensions missing from the data give empty rankings
+    assert rankings["cost_centers_most_delays"] == []
+
+
+@pytest.mark.parametrize("largest", [True, False])
+def test_top_k_matches_a_stable_sort(largest):
+    values = np.random.default_rng(3).integers(0, 20, 500)
+    order = np.argsort(-values if largest else values, kind="stable")
+    for k in (0, 1, 7, 500, 600):
+        assert AnalyticsEngine.top_k(values, k, largest).tolist() == order[:k].tolist()
+
+
+def test_global_kpis_of_a_frame_and_of_records(df):
+    kpis = AnalyticsEngine.calculate_global_kpis(df)
+    on_time = int((df["sla_calculated"] == "Dentro do prazo").sum())
+    assert kpis == {"total_orders": len(df), "on_time": on_time, "late": len(df) - on_time, "sla_percentage": on_time / len(df) * 100}
+    assert AnalyticsEngine.calculate_global_kpis(df.astype(object).to_dict("records")) == kpis
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models import BarChartData, PackageRecord
+from app.utils.column_json import column_records, json_values
+
+
+def test_records_follow_the_model_schema():
+    columns = {
+        "id": ["1", "2", "3"],
+        "pedido": pd.Series([10, 20, 30]),
+        "cep": pd.Series([1310100, None, "04538-133"], dtype=object),
+        "numero": pd.Series([12.0, np.nan, 7.5]),
+        "zona": pd.Series(["ZONA_1", None, "ZONA_2"], dtype="category"),
+        "dataPedido": pd.to_datetime(pd.Series(["2024-01-01", None, "2024-01-03"])),
+        "source": "merged",
+    }
+    records = column_records(PackageRecord, columns, 3)
+
+    assert list(records[0]) == list(PackageRecord.model_fields)
+    assert [(r["pedido"], r["cep"], r["numero"], r["zona"], r["dataPedido"]) for r in records] == [
+        ("10", "1310100", "12.0", "ZONA_1", "2024-01-01"),
+        ("20", None, None, None, None),
+        ("30", "04538-133", "7.5", "ZONA_2", "2024-01-03"),
+    ]
+    # Every row is what the model would serialize
+    assert records == [PackageRecord.model_validate(r).model_dump() for r in records]
+
+
+def test_column_types_and_errors():
+    assert column_records(BarChartData, {"label": np.array([1, 2]), "value": pd.Series([1, 2])}, 2) == [
+        {"label": "1", "value": 1.0, "color": None}, {"label": "2", "value": 2.0, "color": None},
+    ]
+    with pytest.raises(ValueError):
+        column_records(BarChartData, {"label": ["a"]}, 1)
+    with pytest.raises(ValueError):
+        column_records(BarChartData, {"label": ["a"], "value": [1], "other": [1]}, 1)
+
+
+def test_json_values():
+    assert json_values(pd.Series([1.5, np.nan])) == [1.5, None]
+    assert json_values(pd.to_datetime(pd.Series(["2024-01-02 10:00", None]))) == ["2024-01-02", None]
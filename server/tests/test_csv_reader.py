@@ -0,0 +1,38 @@
+import pytest
+
+from app.utils import csv_reader
+from app.utils.csv_reader import read_csv_columns, read_csv_header
+
+
+def write(tmp_path, text, encoding="utf-8"):
+    path = tmp_path / "loose.csv"
+    path.write_bytes(text.encode(encoding))
+    return str(path)
+
+
+def test_reads_selected_columns_as_text(tmp_path):
+    path = write(tmp_path, "﻿Pedido;CEP;Cidade\n00123;01310-100;São Paulo\n456;;Osasco\n")
+    assert read_csv_header(path) == ["Pedido", "CEP", "Cidade"]
+    df = read_csv_columns(path, ["Pedido", "CEP", "Missing"])
+    assert list(df.columns) == ["Pedido", "CEP"]
+    assert df.to_dict("records") == [{"Pedido": "00123", "CEP": "01310-100"}, {"Pedido": "456", "CEP": None}]
+
+
+def test_quoted_cells_may_span_lines(tmp_path, monkeypatch):
+    # Small blocks, so a multi-line cell crosses a block boundary
+    monkeypatch.setattr(csv_reader, "CSV_BLOCK_SIZE", 64)
+    rows = [(str(i), f"Bloco {i}\nApto {i}") for i in range(20)]
+    path = write(tmp_path, "Pedido,Complemento\n" + "".join(f'{pedido},"{complemento}"\n' for pedido, complemento in rows))
+    df = read_csv_columns(path, ["Pedido", "Complemento"])
+    assert list(df.itertuples(index=False, name=None)) == rows
+
+
+@pytest.mark.parametrize("prefix", ["Número", "Pedido"])
+def test_latin1_files(tmp_path, monkeypatch, prefix):
+    # The invalid byte is in the header ("Número") or only in a later block
+    monkeypatch.setattr(csv_reader, "CSV_BLOCK_SIZE", 64)
+    rows = "".join(f"{i};Rua {i}\n" for i in range(20))
+    path = write(tmp_path, f"{prefix};Logradouro\n{rows}1;Praça da Sé\n", "latin-1")
+    assert read_csv_header(path) == [prefix, "Logradouro"]
+    df = read_csv_columns(path, [prefix, "Logradouro"])
+    assert len(df) == 21 and df["Logradouro"].iloc[-1] == "Praça da Sé"
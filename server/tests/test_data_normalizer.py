@@ -0,0 +1,35 @@
+import pandas as pd
+
+from app.utils.data_normalizer import DataNormalizer
+
+
+def loose_frame(**columns):
+    rows = len(next(iter(columns.values())))
+    df = pd.DataFrame({col: [None] * rows for col in DataNormalizer.LOOSE_REQUIRED_COLUMNS})
+    for col, values in columns.items():
+        df[col] = values
+    return df
+
+
+def test_numeric_chunk_normalizes_like_text():
+    # An .xlsx chunk whose cells are all numbers comes in as numeric columns; the CSV reader gives strings
+    numeric = loose_frame(Vendedor=["Meli Store", "MELI"], pedido_marketplace=[2000012345, 2000012346.0], CEP=[1310100, 4538133.0], status_dia=["Entregue ", 1])
+    text = loose_frame(Vendedor=["Meli Store", "MELI"], pedido_marketplace=["2000012345", "2000012346"], CEP=["1310100", "4538133"], status_dia=["Entregue ", "1"])
+
+    expected = DataNormalizer.normalize_loose_data(text)
+    actual = DataNormalizer.normalize_loose_data(numeric)
+    pd.testing.assert_frame_equal(actual, expected)
+    assert actual["pedido_marketplace"].tolist() == ["2000012345", "2000012346"]
+
+
+def test_missing_text_cells_stay_missing():
+    df = loose_frame(Vendedor=["meli", "meli"], pedido_marketplace=["1", "2"], CEP=[None, 1310100.0], status_dia=[None, None])
+    normalized = DataNormalizer.normalize_loose_data(df)
+    assert normalized["CEP"].astype(object).tolist() == ["N/A", "1310100"]
+
+
+def test_mother_pedido_is_text():
+    df = pd.DataFrame({col: ["x", "y"] for col in DataNormalizer.MOTHER_REQUIRED_COLUMNS})
+    df["Data Pedido"] = ["2024-01-01", "2024-01-02"]
+    df["Pedido"] = [2000012345, 2000012346]
+    assert DataNormalizer.normalize_mother_data(df)["Pedido"].tolist() == ["2000012345", "2000012346"]
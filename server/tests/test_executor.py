@@ -0,0 +1,27 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.pipelines.executor import JobExecutor
+from app.pipelines.job_queue import JobQueue
+
+
+def test_run_cpu_replaces_a_broken_pool(tmp_path):
+    executor = JobExecutor(queue=JobQueue(str(tmp_path / "queue.sqlite3")), max_workers=1)
+
+    async def scenario():
+        try:
+            assert await executor.run_cpu(pow, 2, 10) == 1024
+            broken = executor._pool
+            # A worker killed mid-task, as the OOM killer would
+            with pytest.raises(BrokenProcessPool):
+                await executor.run_cpu(os._exit, 1)
+            assert executor._pool is None
+            assert await executor.run_cpu(pow, 3, 3) == 27
+            assert executor._pool is not broken
+        finally:
+            await executor.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from app.repositories import FirestoreRepository, FrameCache, JobStore, ShardedRecords
+from app.repositories.sqlite_backend import SQLiteDocumentStore
+
+
+@pytest.fixture
+def manifests(tmp_path):
+    return FirestoreRepository("data", db=SQLiteDocumentStore(str(tmp_path / "metadata.sqlite3")))
+
+
+@pytest.fixture
+def store(tmp_path, manifests):
+    return JobStore(str(tmp_path / "jobs"), manifests, FrameCache())
+
+
+RECORDS = [{"Pedido": str(i), "Zona": f"ZONA_{i % 3}"} for i in range(7)]
+
+
+def test_load_sharded_job_data(store, manifests):
+    asyncio.run(ShardedRecords(manifests, shard_size=3).write("job1_data", RECORDS))
+    assert asyncio.run(store.load("job1")).to_dict("records") == RECORDS
+    assert asyncio.run(store.columns("job1")) == ["Pedido", "Zona"]
+
+
+def test_load_legacy_sharded_job_data(store, manifests):
+    # Written before shard generations existed: <doc_id>__shard_<n> ids and no "generation" on the head
+    for index, start in enumerate(range(0, len(RECORDS), 3)):
+        asyncio.run(manifests.create(ShardedRecords.shard_id("job1_data", index), {"index": index, "records": RECORDS[start:start + 3]}))
+    asyncio.run(manifests.create("job1_data", {"sharded": True, "shards": 3, "count": len(RECORDS)}))
+    assert asyncio.run(store.load("job1")).to_dict("records") == RECORDS
+
+
+def test_load_inline_job_data(store, manifests):
+    asyncio.run(manifests.create("job1_data", {"data": RECORDS}))
+    assert asyncio.run(store.load("job1", ["Zona"])).to_dict("records") == [{"Zona": r["Zona"]} for r in RECORDS]
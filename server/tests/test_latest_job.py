@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from app.repositories import FirestoreRepository, LatestJobPointer
+from app.repositories.latest_job import POINTER_ID
+from app.repositories.sqlite_backend import SQLiteDocumentStore
+
+
+@pytest.fixture
+def db(tmp_path):
+    return SQLiteDocumentStore(str(tmp_path / "metadata.sqlite3"))
+
+
+def processes(db):
+    return FirestoreRepository("processes", db)
+
+
+def add_jobs(db, *jobs):
+    for job_id, status, updated in jobs:
+        asyncio.run(processes(db).create(job_id, {"status": status, "lastUpdated": updated}))
+
+
+def test_publish_moves_the_pointer(db):
+    add_jobs(db, ("a", "processing", "2024-01-01"), ("b", "processing", "2024-01-01"))
+    pointer = LatestJobPointer(ttl=60, db=db)
+
+    asyncio.run(pointer.publish("a", {"status": "completed"}))
+    asyncio.run(pointer.publish("b", {"status": "completed"}))
+
+    stored = asyncio.run(pointer.get(POINTER_ID))
+    assert (stored["job_id"], stored["previous_job_id"]) == ("b", "a")
+    assert asyncio.run(pointer.current()) == stored
+    job = asyncio.run(processes(db).get("b"))
+    assert job["status"] == "completed" and job["lastUpdated"] == stored["lastUpdated"]
+
+
+def test_publish_never_moves_the_pointer_back(db):
+    add_jobs(db, ("old", "processing", "2024-01-01"))
+    asyncio.run(FirestoreRepository("system", db).create(POINTER_ID, {"job_id": "new", "previous_job_id": None, "lastUpdated": "9999-01-01T00:00:00"}))
+    pointer = LatestJobPointer(ttl=60, db=db)
+
+    asyncio.run(pointer.publish("old", {"status": "completed"}))
+
+    # The job is still completed; the pointer keeps naming the newer job
+    assert asyncio.run(processes(db).get("old"))["status"] == "completed"
+    assert asyncio.run(pointer.get(POINTER_ID))["job_id"] == "new"
+    assert asyncio.run(pointer.current())["job_id"] == "new"
+
+
+def test_concurrent_publishes_keep_a_consistent_chain(db):
+    jobs = [f"j{i}" for i in range(8)]
+    add_jobs(db, *((job_id, "processing", "2024-01-01") for job_id in jobs))
+    pointer = LatestJobPointer(ttl=60, db=db)
+
+    async def publish_all():
+        await asyncio.gather(*(pointer.publish(job_id, {"status": "completed"}) for job_id in jobs))
+    asyncio.run(publish_all())
+
+    stored = asyncio.run(pointer.get(POINTER_ID))
+    completed = {job_id: asyncio.run(processes(db).get(job_id))["lastUpdated"] for job_id in jobs}
+    ordered = sorted(jobs, key=lambda job_id: completed[job_id])
+    # The pointer names the job completed last; its previous job completed before it
+    assert stored["lastUpdated"] == completed[stored["job_id"]] == max(completed.values())
+    assert stored["previous_job_id"] in ordered[:-1] and stored["previous_job_id"] != stored["job_id"]
+
+
+def test_backfill_from_history_and_cached_miss(db, monkeypatch):
+    scans = []
+    list_all = FirestoreRepository.list_all
+
+    async def counting_list_all(self):
+        scans.append(self.collection)
+        return await list_all(self)
+    monkeypatch.setattr(FirestoreRepository, "list_all", counting_list_all)
+
+    pointer = LatestJobPointer(ttl=60, db=db)
+    add_jobs(db, ("running", "processing", "2024-01-03"))
+    assert asyncio.run(pointer.current()) is None
+    assert asyncio.run(pointer.current()) is None
+    # No completed job: the scan's miss is cached for the TTL
+    assert scans == ["processes"]
+
+    add_jobs(db, ("a", "completed", "2024-01-01"), ("b", "completed", "2024-01-02"))
+    pointer.invalidate()
+    assert asyncio.run(pointer.current()) == {"job_id": "b", "previous_job_id": "a", "lastUpdated": "2024-01-02"}
+    assert asyncio.run(pointer.get(POINTER_ID))["job_id"] == "b"
+    assert len(scans) == 2
@@ -0,0 +1,142 @@
+import asyncio
+import copy
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from app.repositories.sharded import ShardedRecords
+
+
+class FakeRepository:
+    """In-memory stand-in for FirestoreRepository: the calls ShardedRecords makes, on a dict."""
+
+    def __init__(self):
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        # Awaited before every create, so a test can act between the writes (or fail one)
+        self.before_create = None
+
+    async def create(self, doc_id: str, data: Dict[str, Any], strict: bool = False) -> None:
+        try:
+            if self.before_create:
+                await self.before_create(doc_id)
+        except Exception:
+            # FirestoreRepository only warns unless strict
+            if strict:
+                raise
+            return
+        self.docs[doc_id] = copy.deepcopy(data)
+
+    async def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self.docs.get(doc_id))
+
+    async def get_many(self, doc_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        return [copy.deepcopy(self.docs.get(doc_id)) for doc_id in doc_ids]
+
+    async def delete(self, doc_id: str) -> None:
+        self.docs.pop(doc_id, None)
+
+    async def delete_many(self, doc_ids: List[str]) -> None:
+        for doc_id in doc_ids:
+            self.docs.pop(doc_id, None)
+
+
+def records(count: int, tag: str = "a") -> List[Dict[str, Any]]:
+    return [{"n": i, "tag": tag} for i in range(count)]
+
+
+def test_write_and_read():
+    repo = FakeRepository()
+    sharded = ShardedRecords(repo, shard_size=3, max_concurrency=2)
+    head = asyncio.run(sharded.write("list", records(10), job_id="j1"))
+
+    assert head["shards"] == 4 and head["count"] == 10 and head["job_id"] == "j1"
+    assert sorted(repo.docs) == ["list", *(ShardedRecords.shard_id("list", i, head["generation"]) for i in range(4))]
+    assert asyncio.run(sharded.read("list")) == records(10)
+
+
+def test_overwrite_with_fewer_shards_removes_the_old_ones():
+    repo = FakeRepository()
+    sharded = ShardedRecords(repo, shard_size=3)
+    asyncio.run(sharded.write("list", records(10)))
+    head = asyncio.run(sharded.write("list", records(4, "b")))
+
+    assert sorted(repo.docs) == ["list", *(ShardedRecords.shard_id("list", i, head["generation"]) for i in range(2))]
+    assert asyncio.run(sharded.read("list")) == records(4, "b")
+
+
+def test_readers_never_see_a_mix_of_two_writes():
+    repo = FakeRepository()
+    sharded = ShardedRecords(repo, shard_size=3)
+    asyncio.run(sharded.write("list", records(10)))
+    seen = []
+
+    async def read_between_writes(doc_id):
+        seen.append(await sharded.read("list"))
+
+    repo.before_create = read_between_writes
+    asyncio.run(sharded.write("list", records(7, "b")))
+    repo.before_create = None
+
+    # Every read before the head switch returns the complete old list
+    assert seen and all(result == records(10) for result in seen)
+    assert asyncio.run(sharded.read("list")) == records(7, "b")
+
+
+def test_read_follows_a_rewrite_that_deleted_its_shards():
+    repo = FakeRepository()
+    sharded = ShardedRecords(repo, shard_size=3)
+    asyncio.run(sharded.write("list", records(10)))
+    read_shards = sharded.read_shards
+    calls = []
+
+    async def rewritten_after_head(doc_id, shards, generation=None):
+        # The reader has the old head; a writer replaces the list before the shards are fetched
+        if not calls:
+            calls.append(generation)
+            await ShardedRecords(repo, shard_size=3).write("list", records(5, "b"))
+        return await read_shards(doc_id, shards, generation)
+
+    sharded.read_shards = rewritten_after_head
+    assert asyncio.run(sharded.read("list")) == records(5, "b")
+
+
+@pytest.mark.parametrize("failing", ["shard", "head"])
+def test_failed_write_keeps_the_previous_list(failing):
+    repo = FakeRepository()
+    sharded = ShardedRecords(repo, shard_size=3)
+    asyncio.run(sharded.write("list", records(10)))
+    before = dict(repo.docs)
+
+    async def fail(doc_id):
+        if (failing == "head") == (doc_id == "list") and not doc_id.endswith("__shard_0"):
+            raise RuntimeError("write failed")
+
+    repo.before_create = fail
+    with pytest.raises(RuntimeError):
+        asyncio.run(sharded.write("list", records(7, "b")))
+    repo.before_create = None
+
+    # The old head and shards are untouched and the new generation's shards are cleaned up
+    assert repo.docs == before
+    assert asyncio.run(sharded.read("list")) == records(10)
+
+
+def test_read_shards_of_a_legacy_list():
+    repo = FakeRepository()
+    repo.docs.update({ShardedRecords.shard_id("job_data", i): {"index": i, "records": [{"n": i}]} for i in range(3)})
+    sharded = ShardedRecords(repo)
+
+    assert ShardedRecords.shard_id("job_data", 0) == "job_data__shard_0"
+    assert asyncio.run(sharded.read_shards("job_data", 3)) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert asyncio.run(sharded.read_shards("job_data", 4)) is None
+
+
+def test_delete():
+    repo = FakeRepository()
+    sharded = ShardedRecords(repo, shard_size=3)
+    asyncio.run(sharded.write("list", records(10)))
+    repo.docs["other"] = {"x": 1}
+    asyncio.run(sharded.delete("list"))
+
+    assert repo.docs == {"other": {"x": 1}}
+    assert asyncio.run(sharded.read("list")) is None
@@ -0,0 +1,55 @@
+from datetime import datetime
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.sla_engine import SLAEngine
+
+DATES = [
+    None, np.nan, "", 0, 1.5, datetime(2024, 1, 1), "garbage",
+    "2024-01-01", "2024-01-02", "2024-01-01T10:00:00", "2024-01-01 23:59:59", "2024-02-30",
+    "2024-1-1", " 2024-01-01", "2024-W01-1", "20240102", "2024-01-01T10", "2024-01-01T24:00:00",
+    "2024-01-01T10:00:00.1234567", "2024-01-01T10:00:00Z", "2024-01-01T08:00:00-03:00",
+    "1500-01-01", "9999-12-31",
+]
+PRAZOS = [None, "", 0, 2, 3.0, np.nan, "3", " 3 ", "3.5", "x"]
+
+
+def scalar(record):
+    try:
+        return SLAEngine.calculate_sla(record)
+    except TypeError:
+        # Comparing an aware date with a naive one; classify_frame calls the row invalid
+        return "Dados inválidos"
+
+
+def test_classify_frame_matches_calculate_sla():
+    records = [
+        {"PREVISÃO DE ENTREGA": previsao, "ENTREGA": entrega, "Prazo": prazo}
+        for previsao, entrega, prazo in itertools.product(DATES, DATES, PRAZOS)
+    ]
+    expected = [scalar(record) for record in records]
+    actual = SLAEngine.classify_frame(pd.DataFrame(records)).astype(object).tolist()
+    mismatches = [(r, e, a) for r, e, a in zip(records, expected, actual) if e != a]
+    assert not mismatches, f"{len(mismatches)} of {len(records)} differ, e.g. {mismatches[:5]}"
+
+
+@pytest.mark.parametrize("dates", [
+    ["2024-01-01", "2024-01-03"],
+    ["2024-01-01T10:00:00+00:00", "2024-01-02T10:00:00"],
+])
+def test_classify_frame_on_plain_columns(dates):
+    df = pd.DataFrame({"PREVISÃO DE ENTREGA": ["2024-01-02"] * 2, "ENTREGA": dates, "Prazo": [1, 1]})
+    expected = [scalar(record) for record in df.to_dict("records")]
+    assert SLAEngine.classify_frame(df).astype(object).tolist() == expected
+
+
+def test_classify_frame_on_datetime_columns():
+    df = pd.DataFrame({
+        "PREVISÃO DE ENTREGA": pd.to_datetime(["2024-01-02", "2024-01-02", None]),
+        "ENTREGA": pd.to_datetime(["2024-01-01", "2024-01-03", "2024-01-01"]),
+        "Prazo": [1, 1, 1],
+    })
+    assert SLAEngine.classify_frame(df).tolist() == ["Dentro do prazo", "Entregue com atraso", "Dados inválidos"]
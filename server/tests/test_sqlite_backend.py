@@ -0,0 +1,144 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.repositories.sqlite_backend import SQLiteDocumentStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteDocumentStore(str(tmp_path / "metadata.sqlite3"))
+
+
+def test_set_get_and_merge(store):
+    doc = store.collection("processes").document("p1")
+    assert not doc.get().exists and doc.get().to_dict() is None
+
+    doc.set({"status": "processing", "progress": 10, "startedAt": datetime(2024, 1, 2, 3, 4, 5)})
+    doc.set({"progress": 50}, merge=True)
+    assert doc.get().to_dict() == {"status": "processing", "progress": 50, "startedAt": "2024-01-02T03:04:05"}
+
+    doc.set({"status": "completed"})
+    assert doc.get().to_dict() == {"status": "completed"}
+
+
+def test_non_finite_floats_are_stored_as_null(store):
+    # KPI and manifest documents built from pandas data can carry NaN; json_extract indexes reject bare NaN tokens
+    doc = store.collection("sla").document("kpis")
+    doc.set({"type": "kpis", "sla": float("nan"), "avg": np.float64("nan"), "max": float("inf"), "rows": [{"delay": np.nan}, 1.5], "count": np.int64(3)})
+
+    assert doc.get().to_dict() == {"type": "kpis", "sla": None, "avg": None, "max": None, "rows": [{"delay": None}, 1.5], "count": 3}
+    assert [d.id for d in store.collection("sla").where("type", "==", "kpis").stream()] == ["kpis"]
+
+    doc.update({"sla": float("nan")})
+    assert doc.get().to_dict()["sla"] is None
+
+
+def test_update_dotted_and_missing(store):
+    doc = store.collection("processes").document("p1")
+    doc.set({"status": "processing", "stages": {"merge": "done"}})
+    doc.update({"status": "completed", "stages.classify": "done", "result.rows": 3})
+    assert doc.get().to_dict() == {"status": "completed", "stages": {"merge": "done", "classify": "done"}, "result": {"rows": 3}}
+
+    with pytest.raises(KeyError):
+        store.collection("processes").document("missing").update({"status": "x"})
+    assert not store.collection("processes").document("missing").get().exists
+
+
+def test_query_operators(store):
+    jobs = store.collection("jobs")
+    for i, status in enumerate(["queued", "processing", "completed", "completed"]):
+        jobs.document(f"j{i}").set({"status": status, "n": i, "meta": {"size": i * 10}})
+
+    def ids(query):
+        return [doc.id for doc in query.stream()]
+
+    assert ids(jobs.where("status", "==", "completed")) == ["j2", "j3"]
+    assert ids(jobs.where("status", "!=", "completed")) == ["j0", "j1"]
+    assert ids(jobs.where("n", "<", 1)) == ["j0"]
+    assert ids(jobs.where("n", "<=", 1)) == ["j0", "j1"]
+    assert ids(jobs.where("n", ">", 2)) == ["j3"]
+    assert ids(jobs.where("n", ">=", 2)) == ["j2", "j3"]
+    assert ids(jobs.where("status", "in", ["queued", "processing"])) == ["j0", "j1"]
+    assert ids(jobs.where("meta.size", ">", 10).where("status", "==", "completed")) == ["j2", "j3"]
+    with pytest.raises(ValueError):
+        ids(jobs.where("status", "array-contains", "x"))
+    with pytest.raises(ValueError):
+        ids(jobs.where("status') OR 1=1 --", "==", "x"))
+
+
+def test_order_by_and_limit(store):
+    logs = store.collection("logs")
+    for doc_id, updated in [("b", "2024-01-02"), ("a", "2024-01-03"), ("c", "2024-01-01")]:
+        logs.document(doc_id).set({"lastUpdated": updated})
+
+    assert [d.id for d in logs.stream()] == ["b", "a", "c"]
+    assert [d.id for d in logs.order_by("lastUpdated").stream()] == ["c", "b", "a"]
+    assert [d.id for d in logs.order_by("lastUpdated", direction="DESCENDING").limit(2).stream()] == ["a", "b"]
+    assert [d.id for d in logs.limit(1).get()] == ["b"]
+
+
+def test_batch_commit(store):
+    col = store.collection("data")
+    col.document("keep").set({"status": "old", "stages": {"merge": "done"}})
+    col.document("drop").set({"x": 1})
+
+    batch = store.batch()
+    batch.set(col.document("new"), {"x": 2})
+    batch.set(col.document("keep"), {"extra": True}, merge=True)
+    batch.update(col.document("keep"), {"status": "new", "stages.classify": "done"})
+    batch.delete(col.document("drop"))
+    batch.commit()
+
+    assert col.document("new").get().to_dict() == {"x": 2}
+    # Same dotted-path semantics as SQLiteDocument.update
+    assert col.document("keep").get().to_dict() == {"status": "new", "stages": {"merge": "done", "classify": "done"}, "extra": True}
+    assert not col.document("drop").get().exists
+
+
+def test_batch_rollback(store):
+    col = store.collection("data")
+    col.document("a").set({"x": 1})
+
+    batch = store.batch()
+    batch.set(col.document("b"), {"x": 2})
+    batch.update(col.document("a"), {"x": 3})
+    batch.update(col.document("missing"), {"x": 4})
+    with pytest.raises(KeyError):
+        batch.commit()
+
+    assert col.document("a").get().to_dict() == {"x": 1}
+    assert not col.document("b").get().exists
+
+
+def test_get_all(store):
+    col = store.collection("data")
+    for i in range(1200):
+        col.document(f"d{i}").set({"n": i})
+    refs = [col.document("missing"), *(col.document(f"d{i}") for i in reversed(range(1200))), store.collection("other").document("d1")]
+
+    snapshots = list(store.get_all(refs))
+    assert [s.id for s in snapshots] == [ref.id for ref in refs]
+    assert [s.exists for s in snapshots] == [False, *[True] * 1200, False]
+    assert snapshots[1].to_dict() == {"n": 1199}
+
+
+def test_run_transaction(store):
+    col = store.collection("system")
+    ref = col.document("counter")
+    ref.set({"n": 1})
+
+    def increment(transaction):
+        n = ref.get(transaction=transaction).to_dict()["n"]
+        transaction.update(ref, {"n": n + 1})
+        return n + 1
+    assert store.run_transaction(increment) == 2
+    assert ref.get().to_dict() == {"n": 2}
+
+    def failing(transaction):
+        transaction.set(col.document("other"), {"x": 1})
+        raise RuntimeError("abort")
+    with pytest.raises(RuntimeError):
+        store.run_transaction(failing)
+    assert not col.document("other").get().exists
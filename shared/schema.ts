@@ -35,6 +35,7 @@ export const uploadedFileSchema = z.object({
 export type UploadedFile = z.infer<typeof uploadedFileSchema>;
 
 export const processingStatusSchema = z.object({
+  id: z.string().optional(),
   status: z.enum(["idle", "processing", "completed", "error"]),
   currentStep: z.string().optional(),
   progress: z.number().optional(),
@@ -236,11 +237,20 @@ export type OverviewData = z.infer<typeof overviewDataSchema>;
 export const slaPerformanceDataSchema = z.object({
   slaTrend: z.array(lineChartDataSchema),
   records: z.array(packageRecordSchema),
-  totalRecords: z.number()
+  totalRecords: z.number(),
+  nextCursor: z.string().nullable().optional()
 });
 
 export type SlaPerformanceData = z.infer<typeof slaPerformanceDataSchema>;
 
+export const slaRecordsPageSchema = z.object({
+  records: z.array(packageRecordSchema),
+  totalRecords: z.number(),
+  nextCursor: z.string().nullable().optional()
+});
+
+export type SlaRecordsPage = z.infer<typeof slaRecordsPageSchema>;
+
 export const delaysDataSchema = z.object({
   metrics: z.object({
     totalDelays: z.number(),